@@ -0,0 +1,270 @@
+import asyncio
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass
+
+import pydantic
+
+from app.ports.llm import LLm
+
+# Rough per-entry bookkeeping cost (key, tuple, OrderedDict node, model instance)
+# added on top of the serialized DTO size when enforcing the memory bound.
+_ENTRY_OVERHEAD_BYTES = 512
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    result: pydantic.BaseModel
+    size: int
+    expires_at: float | None
+
+
+@dataclass
+class _InFlight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@functools.lru_cache(maxsize=64)
+def _schema_fingerprint(dto: type[pydantic.BaseModel]) -> str:
+    return json.dumps(dto.model_json_schema(), sort_keys=True, separators=(",", ":"))
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+class CachedLLm(LLm):
+    """
+    Content-addressed LRU+TTL cache in front of another LLm.
+
+    The key hashes the model name, the DTO schema and the whitespace-normalized
+    prompts. The user prompt already embeds the transcript through
+    RAW_USER_PROMPT, so a change of prompt template, model, schema or transcript
+    all produce a different key. Concurrent async calls for the same key share
+    a single in-flight completion, which is cancelled once every caller waiting
+    on it has gone away.
+
+    A streamed call replays a cached completion as one chunk and stores what
+    it streams once the completion is whole; it waits for an in-flight
+    completion of the same key but is never shared itself.
+
+    ``lookup`` and ``store`` let a caller that answers several prompts with
+    one call of its own, such as the transcript packer, keep each answer
+    under the key of the prompt it stands for.
+    """
+
+    def __init__(
+        self,
+        llm: LLm,
+        model: str,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float | None = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._llm = llm
+        self._model = model
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._in_flight: dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        key = self._key(system_prompt, user_prompt, dto)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        self._stats.misses += 1
+        result = self._llm.run_completion(system_prompt, user_prompt, dto)
+        self._store(key, result)
+        return result.model_copy(deep=True)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        key = self._key(system_prompt, user_prompt, dto)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            self._stats.misses += 1
+            flight = _InFlight(
+                asyncio.create_task(
+                    self._llm.run_completion_async(system_prompt, user_prompt, dto)
+                )
+            )
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(functools.partial(self._on_done, key, flight))
+        else:
+            self._stats.coalesced += 1
+
+        result = await self._wait(key, flight)
+        return result.model_copy(deep=True)
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        key = self._key(system_prompt, user_prompt, dto)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached.model_dump_json()
+            return
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self._stats.coalesced += 1
+            result = await self._wait(key, flight)
+            yield result.model_dump_json()
+            return
+
+        self._stats.misses += 1
+        chunks: list[str] = []
+        async with aclosing(
+            self._llm.stream_completion(system_prompt, user_prompt, dto)
+        ) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        self._store(key, dto.model_validate_json("".join(chunks)))
+
+    @property
+    def llm(self) -> LLm:
+        """The LLm behind the cache."""
+        return self._llm
+
+    def lookup(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel | None:
+        """The cached completion for these prompts, if any; a miss is counted."""
+        cached = self._lookup(self._key(system_prompt, user_prompt, dto))
+        if cached is None:
+            self._stats.misses += 1
+        return cached
+
+    def store(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+        result: pydantic.BaseModel,
+    ) -> None:
+        """Caches a copy of ``result`` as the completion of these prompts."""
+        self._store(
+            self._key(system_prompt, user_prompt, dto), result.model_copy(deep=True)
+        )
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                coalesced=self._stats.coalesced,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._stats.bytes,
+            )
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await self._llm.warm_up(connections)
+
+    async def aclose(self) -> None:
+        await self._llm.aclose()
+
+    def _key(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (
+            self._model,
+            _schema_fingerprint(dto),
+            _normalize(system_prompt),
+            _normalize(user_prompt),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _lookup(self, key: str) -> pydantic.BaseModel | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.result.model_copy(deep=True)
+
+    def _store(self, key: str, result: pydantic.BaseModel) -> None:
+        size = len(result.model_dump_json()) + _ENTRY_OVERHEAD_BYTES
+        if size > self._max_bytes:
+            return
+        expires_at = (
+            None if self._ttl_seconds is None else self._clock() + self._ttl_seconds
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(result, size, expires_at)
+            self._stats.bytes += size
+            while (
+                len(self._entries) > self._max_entries
+                or self._stats.bytes > self._max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._stats.bytes -= entry.size
+
+    async def _wait(self, key: str, flight: _InFlight) -> pydantic.BaseModel:
+        # Shielded so that one caller going away does not cancel the completion
+        # the other waiters are counting on; the last one to leave cancels it,
+        # since nobody would read the result.
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                # A caller arriving meanwhile starts a fresh completion instead
+                # of joining the cancelled one.
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+
+    def _on_done(self, key: str, flight: _InFlight, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._store(key, task.result())
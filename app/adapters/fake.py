@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import random
+import re
+import time
+import typing
+from collections.abc import AsyncGenerator
+from typing import Literal, TypeVar
+
+import httpx
+import openai
+import pydantic
+
+from app.ports.llm import LLm
+from app.schemas.llm_responses import PackedSummariesLLMOutput, PackedSummaryLLMOutput
+
+LatencyDistribution = Literal["constant", "uniform", "exponential", "lognormal"]
+
+_FAKE_REQUEST = httpx.Request("POST", "https://fake-llm.local/v1/chat/completions")
+_PACKED_TRANSCRIPT = re.compile(r'<transcript id="(\d+)">\n(.*?)\n</transcript>', re.S)
+
+
+def rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    """Builds the exception the OpenAI client raises on an HTTP 429."""
+    headers = {} if retry_after is None else {"retry-after": retry_after}
+    response = httpx.Response(429, headers=headers, request=_FAKE_REQUEST)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def server_error() -> openai.InternalServerError:
+    """Builds the exception the OpenAI client raises on an HTTP 500."""
+    response = httpx.Response(500, request=_FAKE_REQUEST)
+    return openai.InternalServerError(
+        "Injected server error", response=response, body=None
+    )
+
+
+class FakeLLMAdapter(LLm):
+    """
+    Offline stand-in for OpenAIAdapter, used for load tests and benchmarks.
+
+    Responses are derived from a hash of the prompts, so the same input always
+    yields the same DTO. Latency is drawn from a configurable distribution
+    (``latency_ms`` is its median, ``latency_spread`` its width) plus
+    ``ms_per_prompt_char`` per prompt character. A share of calls fails with
+    the same exceptions the OpenAI client raises: ``rate_limit_rate`` of them
+    with a 429 carrying ``Retry-After``, ``error_rate`` of them with a 500.
+    Packed calls get one item per tagged transcript, except that each is left
+    out with probability ``packed_item_drop_rate``.
+
+    Streamed calls take the same total latency: the first chunk of
+    ``stream_chunk_chars`` characters arrives after ``stream_first_chunk_share``
+    of it and the rest of the JSON follows at an even pace.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        latency_distribution: LatencyDistribution = "constant",
+        latency_spread: float = 0.5,
+        ms_per_prompt_char: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: float = 1.0,
+        packed_item_drop_rate: float = 0.0,
+        stream_chunk_chars: int = 16,
+        stream_first_chunk_share: float = 0.2,
+        seed: int | None = 0,
+    ) -> None:
+        self._latency_ms = latency_ms
+        self._latency_distribution = latency_distribution
+        self._latency_spread = latency_spread
+        self._ms_per_prompt_char = ms_per_prompt_char
+        self._error_rate = error_rate
+        self._rate_limit_rate = rate_limit_rate
+        self._retry_after_seconds = retry_after_seconds
+        self._packed_item_drop_rate = packed_item_drop_rate
+        self._stream_chunk_chars = stream_chunk_chars
+        self._stream_first_chunk_share = stream_first_chunk_share
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        time.sleep(self._next_latency(system_prompt, user_prompt))
+        return self._respond(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        await asyncio.sleep(self._next_latency(system_prompt, user_prompt))
+        return self._respond(system_prompt, user_prompt, dto)
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        latency = self._next_latency(system_prompt, user_prompt)
+        first_chunk_after = latency * self._stream_first_chunk_share
+        await asyncio.sleep(first_chunk_after)
+        text = self._respond(system_prompt, user_prompt, dto).model_dump_json()
+        size = self._stream_chunk_chars
+        chunks = [text[start : start + size] for start in range(0, len(text), size)]
+        pause = (latency - first_chunk_after) / max(1, len(chunks) - 1)
+        for position, chunk in enumerate(chunks):
+            if position:
+                await asyncio.sleep(pause)
+            yield chunk
+
+    def _next_latency(self, system_prompt: str, user_prompt: str) -> float:
+        median = self._latency_ms
+        spread = self._latency_spread
+        if self._latency_distribution == "uniform":
+            latency = self._random.uniform(median * (1 - spread), median * (1 + spread))
+        elif self._latency_distribution == "exponential":
+            latency = self._random.expovariate(1 / median) if median else 0.0
+        elif self._latency_distribution == "lognormal":
+            latency = median * self._random.lognormvariate(0, spread)
+        else:
+            latency = median
+        prompt_chars = len(system_prompt) + len(user_prompt)
+        return max(0.0, latency + prompt_chars * self._ms_per_prompt_char) / 1000
+
+    def _respond(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        self.calls += 1
+        roll = self._random.random()
+        if roll < self._rate_limit_rate:
+            raise rate_limit_error(str(self._retry_after_seconds))
+        if roll < self._rate_limit_rate + self._error_rate:
+            raise server_error()
+
+        if issubclass(dto, PackedSummariesLLMOutput):
+            return self._respond_packed(system_prompt, user_prompt, dto)
+        digest = hashlib.blake2b(
+            f"{system_prompt}\x00{user_prompt}".encode("utf-8"), digest_size=4
+        ).hexdigest()
+        return build_fake_dto(dto, digest)
+
+    def _respond_packed(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[PackedSummariesLLMOutput],
+    ) -> PackedSummariesLLMOutput:
+        items = []
+        for transcript_id, transcript in _PACKED_TRANSCRIPT.findall(user_prompt):
+            if self._random.random() < self._packed_item_drop_rate:
+                continue
+            digest = hashlib.blake2b(
+                f"{system_prompt}\x00{transcript}".encode("utf-8"), digest_size=4
+            ).hexdigest()
+            item = build_fake_dto(PackedSummaryLLMOutput, digest)
+            items.append(item.model_copy(update={"transcript_id": int(transcript_id)}))
+        return dto(items=items)
+
+
+_Model = TypeVar("_Model", bound=pydantic.BaseModel)
+
+
+def build_fake_dto(dto: type[_Model], tag: str) -> _Model:
+    """Fills every field of ``dto`` with a placeholder value derived from ``tag``."""
+    return dto.model_validate(
+        {
+            name: _fake_value(field.annotation, f"{name} {tag}")
+            for name, field in dto.model_fields.items()
+        }
+    )
+
+
+def _fake_value(annotation: typing.Any, label: str) -> typing.Any:
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (str,)
+        return [_fake_value(item, f"{label} #{position}") for position in (1, 2, 3)]
+    if isinstance(annotation, type) and issubclass(annotation, pydantic.BaseModel):
+        return build_fake_dto(annotation, label)
+    if annotation is int:
+        return 0
+    if annotation is float:
+        return 0.0
+    if annotation is bool:
+        return False
+    return f"Fake {label}"
@@ -0,0 +1,339 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+
+import httpx
+import openai
+import pydantic
+
+from app.metrics import LLM_CIRCUIT_OPEN, LLM_DEADLINE_EXCEEDED, LLM_HEDGED_REQUESTS
+from app.ports.llm import LLm
+
+# Errors caused by the request itself: every backend would fail it the same way.
+CLIENT_ERRORS: tuple[type[BaseException], ...] = (openai.BadRequestError,)
+
+_REQUEST = httpx.Request("POST", "https://llm-backends.local/v1/chat/completions")
+_PRIMARY_WON = LLM_HEDGED_REQUESTS.labels("primary")
+_HEDGE_WON = LLM_HEDGED_REQUESTS.labels("hedge")
+_DEADLINE_EXCEEDED = LLM_DEADLINE_EXCEEDED.labels()
+
+
+class DeadlineExceededError(openai.APITimeoutError):
+    """No backend answered within the deadline of the call."""
+
+    def __init__(self) -> None:
+        super().__init__(request=_REQUEST)
+
+
+class NoBackendAvailableError(openai.APIConnectionError):
+    """Every backend's circuit breaker is open."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            message="Every LLM backend is unavailable. Please retry later.",
+            request=_REQUEST,
+        )
+
+
+class CircuitBreaker:
+    """
+    Keeps calls away from a backend after consecutive failures.
+
+    Closed until ``failure_threshold`` calls in a row fail, then open for
+    ``reset_seconds``. After that a single probe call is let through; its
+    success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._gauge = LLM_CIRCUIT_OPEN.labels(name)
+        self._gauge.set(0)
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._probing or self._clock() - self._opened_at < self._reset_seconds:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._gauge.set(0)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+            self._gauge.set(1)
+
+    def release(self) -> None:
+        """Ends a call that says nothing about the backend's health."""
+        self._probing = False
+
+
+@dataclass(eq=False)
+class _Backend:
+    name: str
+    llm: LLm
+    breaker: CircuitBreaker
+    latencies: deque[float] = field(default_factory=deque)
+
+
+class HedgedLLm(LLm):
+    """
+    Serves each call from the first healthy backend of several, in order.
+
+    When the backend serving a call has not answered by ``hedge_percentile``
+    of its recent latencies (kept within ``hedge_min_delay`` and
+    ``hedge_max_delay``), the call is duplicated to the next healthy backend;
+    the first success wins and the other attempt is cancelled. A failed
+    attempt hands the call over to the next healthy backend at once, and
+    each backend has a CircuitBreaker. The call as a whole, hedge and
+    failovers included, is abandoned with DeadlineExceededError after
+    ``deadline_seconds``, which counts as a failure of the backends that
+    were still working on it.
+
+    Errors in ``client_errors`` are raised at once without counting against
+    the backend. The synchronous path fails over but never hedges. Streamed
+    calls are not hedged either: they fail over until a backend yields its
+    first chunk, which is also what the deadline applies to.
+    """
+
+    def __init__(
+        self,
+        backends: dict[str, LLm],
+        deadline_seconds: float | None = 120.0,
+        hedge: bool = True,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay: float = 1.0,
+        hedge_max_delay: float = 30.0,
+        latency_window: int = 200,
+        min_latency_samples: int = 20,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        client_errors: tuple[type[BaseException], ...] = CLIENT_ERRORS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not backends:
+            raise ValueError("At least one backend is required")
+        self._backends = [
+            _Backend(
+                name=name,
+                llm=llm,
+                breaker=CircuitBreaker(name, failure_threshold, reset_seconds, clock),
+                latencies=deque(maxlen=latency_window),
+            )
+            for name, llm in backends.items()
+        ]
+        self._deadline_seconds = deadline_seconds
+        self._hedge = hedge and len(self._backends) > 1
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_delay = hedge_min_delay
+        self._hedge_max_delay = hedge_max_delay
+        self._min_latency_samples = min_latency_samples
+        self._client_errors = client_errors
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        return next(b.breaker for b in self._backends if b.name == name)
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        error: Exception = NoBackendAvailableError()
+        for backend in self._backends:
+            if not backend.breaker.allow():
+                continue
+            try:
+                result = backend.llm.run_completion(system_prompt, user_prompt, dto)
+            except self._client_errors:
+                backend.breaker.release()
+                raise
+            except Exception as exc:
+                backend.breaker.record_failure()
+                error = exc
+                continue
+            backend.breaker.record_success()
+            return result
+        raise error
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = (
+            None if self._deadline_seconds is None else started + self._deadline_seconds
+        )
+        candidates = iter(self._backends)
+        attempts: dict[asyncio.Task, _Backend] = {}
+
+        def launch() -> _Backend | None:
+            for backend in candidates:
+                if backend.breaker.allow():
+                    task = asyncio.ensure_future(
+                        self._attempt(backend, system_prompt, user_prompt, dto)
+                    )
+                    attempts[task] = backend
+                    return backend
+            return None
+
+        primary = launch()
+        if primary is None:
+            raise NoBackendAvailableError()
+        hedge_at = started + self._hedge_delay(primary) if self._hedge else None
+        hedged = False
+        try:
+            while True:
+                wake = min(
+                    (at for at in (hedge_at, deadline) if at is not None),
+                    default=None,
+                )
+                done, _ = await asyncio.wait(
+                    attempts,
+                    timeout=None if wake is None else max(0.0, wake - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                error = None
+                for task in done:
+                    backend = attempts.pop(task)
+                    if task.exception() is None:
+                        if hedged:
+                            (_PRIMARY_WON if backend is primary else _HEDGE_WON).inc()
+                        return task.result()
+                    error = task.exception()
+                    if isinstance(error, self._client_errors):
+                        raise error
+                if error is not None:
+                    # Fail over only once nothing else is working on the call.
+                    if not attempts and launch() is None:
+                        raise error
+                    continue
+
+                now = loop.time()
+                if deadline is not None and now >= deadline:
+                    _DEADLINE_EXCEEDED.inc()
+                    for backend in attempts.values():
+                        backend.breaker.record_failure()
+                    raise DeadlineExceededError()
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    hedged = launch() is not None
+        finally:
+            for task in attempts:
+                task.cancel()
+            if attempts:
+                await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        loop = asyncio.get_running_loop()
+        deadline = (
+            None
+            if self._deadline_seconds is None
+            else loop.time() + self._deadline_seconds
+        )
+        error: Exception = NoBackendAvailableError()
+        for backend in self._backends:
+            if not backend.breaker.allow():
+                continue
+            async with aclosing(
+                backend.llm.stream_completion(system_prompt, user_prompt, dto)
+            ) as chunks:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        first = await anext(chunks, None)
+                except TimeoutError:
+                    backend.breaker.record_failure()
+                    _DEADLINE_EXCEEDED.inc()
+                    raise DeadlineExceededError() from None
+                except self._client_errors:
+                    backend.breaker.release()
+                    raise
+                except Exception as exc:
+                    backend.breaker.record_failure()
+                    error = exc
+                    continue
+                try:
+                    if first is not None:
+                        yield first
+                        async for chunk in chunks:
+                            yield chunk
+                except Exception:
+                    backend.breaker.record_failure()
+                    raise
+                except BaseException:
+                    backend.breaker.release()
+                    raise
+                backend.breaker.record_success()
+                return
+        raise error
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await asyncio.gather(
+            *(backend.llm.warm_up(connections) for backend in self._backends)
+        )
+
+    async def aclose(self) -> None:
+        for backend in self._backends:
+            await backend.llm.aclose()
+
+    async def _attempt(
+        self,
+        backend: _Backend,
+        system_prompt: str,
+        user_prompt: str,
+        dto: type[pydantic.BaseModel],
+    ) -> pydantic.BaseModel:
+        started = time.perf_counter()
+        try:
+            result = await backend.llm.run_completion_async(
+                system_prompt, user_prompt, dto
+            )
+        except asyncio.CancelledError:
+            backend.breaker.release()
+            # A lower bound, but leaving it out would skew the tail downwards
+            # and make hedges more frequent than the percentile implies.
+            backend.latencies.append(time.perf_counter() - started)
+            raise
+        except self._client_errors:
+            backend.breaker.release()
+            raise
+        except Exception:
+            backend.breaker.record_failure()
+            raise
+        backend.breaker.record_success()
+        backend.latencies.append(time.perf_counter() - started)
+        return result
+
+    def _hedge_delay(self, backend: _Backend) -> float:
+        samples = backend.latencies
+        if len(samples) < self._min_latency_samples:
+            return self._hedge_max_delay
+        ordered = sorted(samples)
+        rank = math.ceil(self._hedge_percentile / 100 * len(ordered)) - 1
+        value = ordered[min(max(rank, 0), len(ordered) - 1)]
+        return min(max(value, self._hedge_min_delay), self._hedge_max_delay)
@@ -0,0 +1,86 @@
+import time
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+
+import pydantic
+
+from app.metrics import LLM_ERRORS, LLM_REQUEST_DURATION, LLM_REQUESTS_IN_FLIGHT
+from app.ports.llm import LLm
+
+_SUCCEEDED = LLM_REQUEST_DURATION.labels("ok")
+_FAILED = LLM_REQUEST_DURATION.labels("error")
+_IN_FLIGHT = LLM_REQUESTS_IN_FLIGHT.labels()
+
+
+class InstrumentedLLm(LLm):
+    """
+    Records latency, in-flight calls and errors of another LLm.
+
+    Meant to wrap the backend directly, below any retrying decorator, so that
+    every attempt sent to the provider is observed on its own.
+    """
+
+    def __init__(self, llm: LLm) -> None:
+        self._llm = llm
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        _IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            result = self._llm.run_completion(system_prompt, user_prompt, dto)
+        except Exception as exc:
+            self._record_failure(exc, started)
+            raise
+        finally:
+            _IN_FLIGHT.dec()
+        _SUCCEEDED.observe(time.perf_counter() - started)
+        return result
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        _IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            result = await self._llm.run_completion_async(
+                system_prompt, user_prompt, dto
+            )
+        except Exception as exc:
+            self._record_failure(exc, started)
+            raise
+        finally:
+            _IN_FLIGHT.dec()
+        _SUCCEEDED.observe(time.perf_counter() - started)
+        return result
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        # Observed until the last chunk; a stream the caller abandons is not.
+        _IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            async with aclosing(
+                self._llm.stream_completion(system_prompt, user_prompt, dto)
+            ) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        except Exception as exc:
+            self._record_failure(exc, started)
+            raise
+        finally:
+            _IN_FLIGHT.dec()
+        _SUCCEEDED.observe(time.perf_counter() - started)
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await self._llm.warm_up(connections)
+
+    async def aclose(self) -> None:
+        await self._llm.aclose()
+
+    @staticmethod
+    def _record_failure(exc: Exception, started: float) -> None:
+        _FAILED.observe(time.perf_counter() - started)
+        LLM_ERRORS.labels(type(exc).__name__).inc()
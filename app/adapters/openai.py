@@ -1,14 +1,85 @@
+import asyncio
+import functools
+import time
+from collections.abc import AsyncGenerator
+
+import httpx
 import openai
 import pydantic
 
+from app.metrics import LLM_TOKENS, STAGE_DURATION
 from app.ports.llm import LLm
 
+_PARSE_STAGE = STAGE_DURATION.labels("llm_parse")
+_PROMPT_TOKENS = LLM_TOKENS.labels("prompt")
+_COMPLETION_TOKENS = LLM_TOKENS.labels("completion")
+
+
+def _record_usage(completion) -> None:
+    if completion.usage is not None:
+        _PROMPT_TOKENS.inc(completion.usage.prompt_tokens)
+        _COMPLETION_TOKENS.inc(completion.usage.completion_tokens)
+
+
+def _parse_completion(raw_response) -> pydantic.BaseModel:
+    # The raw response defers JSON decoding and DTO validation to .parse(),
+    # which lets that CPU time be told apart from the network wait.
+    started = time.perf_counter()
+    completion = raw_response.parse()
+    _PARSE_STAGE.observe(time.perf_counter() - started)
+    _record_usage(completion)
+    return completion.choices[0].message.parsed
+
 
 class OpenAIAdapter(LLm):
-    def __init__(self, api_key: str, model: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_retries: int = openai.DEFAULT_MAX_RETRIES,
+    ) -> None:
+        """
+        Builds the async OpenAI client, and the sync one on first use, on top of
+        pooled HTTP connections.
+
+        The adapter is meant to be created once per process and shared across
+        requests, so that TLS handshakes and keep-alive connections are reused.
+
+        Args:
+            api_key (str): The OpenAI API key.
+            model (str): The model used for every completion.
+            max_connections (int): Upper bound of concurrent connections per client.
+            max_keepalive_connections (int): Idle connections kept open for reuse.
+            keepalive_expiry (float): Seconds an idle connection is kept alive.
+            max_retries (int): Retries done by the OpenAI client itself. Set it to 0
+                when a RateLimitedLLm in front of the adapter owns the retries.
+        """
         self._model = model
-        self._client = openai.OpenAI(api_key=api_key)
-        self._aclient = openai.AsyncOpenAI(api_key=api_key)
+        self._api_key = api_key
+        self._max_retries = max_retries
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._aclient = openai.AsyncOpenAI(
+            api_key=api_key,
+            max_retries=max_retries,
+            http_client=openai.DefaultAsyncHttpxClient(limits=self._limits),
+        )
+
+    @functools.cached_property
+    def _client(self) -> openai.OpenAI:
+        # Built on first use: the API only calls the async client, and each
+        # client loads the CA bundle for its own SSL context.
+        return openai.OpenAI(
+            api_key=self._api_key,
+            max_retries=self._max_retries,
+            http_client=openai.DefaultHttpxClient(limits=self._limits),
+        )
 
     def run_completion(
         self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
@@ -26,7 +97,7 @@ class OpenAIAdapter(LLm):
             more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat
         """
 
-        completion = self._client.beta.chat.completions.parse(
+        raw_response = self._client.beta.chat.completions.with_raw_response.parse(
             model=self._model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -34,7 +105,7 @@ class OpenAIAdapter(LLm):
             ],
             response_format=dto,
         )
-        return completion.choices[0].message.parsed
+        return _parse_completion(raw_response)
 
     async def run_completion_async(
         self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
@@ -52,12 +123,71 @@ class OpenAIAdapter(LLm):
 
          more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat
         """
-        completion = await self._aclient.beta.chat.completions.parse(
+        raw_response = (
+            await self._aclient.beta.chat.completions.with_raw_response.parse(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=dto,
+            )
+        )
+        return _parse_completion(raw_response)
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Streams a structured-output completion, yielding the JSON text as it is generated.
+
+        Args:
+            system_prompt (str): The system's introductory message for the chat.
+            user_prompt (str): The user input for which a response is needed.
+            dto (Type[pydantic.BaseModel]): A Pydantic model class used to define the structure of the API response.
+
+        Yields:
+            str: The next piece of the JSON document, which validates as ``dto`` once complete.
+
+            more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat#streaming
+        """
+        async with self._aclient.beta.chat.completions.stream(
             model=self._model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             response_format=dto,
+            stream_options={"include_usage": True},
+        ) as stream:
+            async for event in stream:
+                if event.type == "content.delta" and event.delta:
+                    yield event.delta
+            # Raises on a refusal or a reply cut short by the token limit.
+            _record_usage(await stream.get_final_completion())
+
+    async def warm_up(self, connections: int = 1) -> None:
+        """
+        Loads the completion resources and opens pooled connections to the API.
+
+        The OpenAI client imports its API resources on first use, which would
+        otherwise land on the first completion. Each concurrent request for the
+        model's metadata opens a connection of its own; it spends no tokens and
+        fails early on a wrong key or model.
+
+        Args:
+            connections (int): Connections opened to the API, at most the pool size.
+        """
+        # The attribute lookups are what import the resources.
+        self._aclient.beta.chat.completions.with_raw_response
+        if self._limits.max_keepalive_connections is not None:
+            connections = min(connections, self._limits.max_keepalive_connections)
+        await asyncio.gather(
+            *(self._aclient.models.retrieve(self._model) for _ in range(connections))
         )
-        return completion.choices[0].message.parsed
+
+    async def aclose(self) -> None:
+        """Closes both HTTP connection pools."""
+        if "_client" in self.__dict__:
+            self._client.close()
+        await self._aclient.close()
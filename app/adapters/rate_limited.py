@@ -0,0 +1,282 @@
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing
+
+import openai
+import pydantic
+
+from app.ports.llm import LLm
+
+RATE_LIMIT_ERRORS: tuple[type[BaseException], ...] = (openai.RateLimitError,)
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Reads the server-provided back-off from an HTTP error, if there is one."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    for header, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / scale)
+        except ValueError:
+            # HTTP-date values are rare for LLM providers; fall back to backoff.
+            continue
+    return None
+
+
+class _TokenBucket:
+    """Per-minute budget. Reservations may overdraw it; callers wait it back."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float]) -> None:
+        self._capacity = per_minute
+        self._rate = per_minute / 60.0
+        self._tokens = per_minute
+        self._clock = clock
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        now = self._clock()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        self._tokens -= min(amount, self._capacity)
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+
+class _AdaptiveLimit:
+    """FIFO concurrency gate sized by additive-increase/multiplicative-decrease."""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        decrease_factor: float,
+        clock: Callable[[], float],
+    ) -> None:
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._minimum = minimum
+        self._maximum = maximum
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        if not self._waiters and self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation landed.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def increase(self) -> None:
+        # +1 per "window" of successes: each success adds 1/limit.
+        self._limit = min(self._maximum, self._limit + 1.0 / self._limit)
+        self._wake()
+
+    def decrease(self, cooldown: float) -> None:
+        # A burst of 429s from calls that were already in flight is a single
+        # congestion signal, so only shrink once per cooldown.
+        now = self._clock()
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(self._minimum, self._limit * self._decrease_factor)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
+class RateLimitedLLm(LLm):
+    """
+    Schedules async completions of another LLm within provider quotas.
+
+    Calls pass a request-per-minute and a token-per-minute budget (tokens are
+    estimated from prompt length), then an adaptive concurrency limit that is
+    halved on rate-limit errors and grows back by one slot per window of
+    successful calls. A ``Retry-After`` hint pauses every caller, not only
+    the one that got the 429. Rate-limit and transient errors are retried with
+    jittered exponential backoff; a streamed call is only retried until its
+    first chunk, and holds its concurrency slot until its last.
+
+    The synchronous path is passed through untouched.
+    """
+
+    def __init__(
+        self,
+        llm: LLm,
+        max_concurrency: int = 32,
+        min_concurrency: int = 1,
+        initial_concurrency: int = 8,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        decrease_factor: float = 0.5,
+        chars_per_token: float = 4.0,
+        completion_tokens_estimate: int = 512,
+        rate_limit_errors: tuple[type[BaseException], ...] = RATE_LIMIT_ERRORS,
+        transient_errors: tuple[type[BaseException], ...] = TRANSIENT_ERRORS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._llm = llm
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._chars_per_token = chars_per_token
+        self._completion_tokens_estimate = completion_tokens_estimate
+        self._rate_limit_errors = rate_limit_errors
+        self._retryable_errors = rate_limit_errors + transient_errors
+        self._clock = clock
+        self._requests = _TokenBucket(requests_per_minute, clock)
+        self._tokens = _TokenBucket(tokens_per_minute, clock)
+        self._limit = _AdaptiveLimit(
+            initial_concurrency,
+            min_concurrency,
+            max_concurrency,
+            decrease_factor,
+            clock,
+        )
+        self._paused_until = 0.0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self._limit.limit
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        return self._llm.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        estimated_tokens = self.estimate_tokens(system_prompt, user_prompt)
+        attempt = 0
+        while True:
+            await self._wait_for_budget(estimated_tokens)
+            await self._limit.acquire()
+            try:
+                result = await self._llm.run_completion_async(
+                    system_prompt, user_prompt, dto
+                )
+            except self._retryable_errors as exc:
+                delay = self._retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._limit.increase()
+                return result
+            finally:
+                self._limit.release()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        estimated_tokens = self.estimate_tokens(system_prompt, user_prompt)
+        attempt = 0
+        while True:
+            await self._wait_for_budget(estimated_tokens)
+            await self._limit.acquire()
+            streaming = False
+            try:
+                async with aclosing(
+                    self._llm.stream_completion(system_prompt, user_prompt, dto)
+                ) as chunks:
+                    async for chunk in chunks:
+                        streaming = True
+                        yield chunk
+            except self._retryable_errors as exc:
+                delay = self._retry_delay(exc, attempt)
+                # Chunks already handed out cannot be taken back.
+                if delay is None or streaming:
+                    raise
+            else:
+                self._limit.increase()
+                return
+            finally:
+                self._limit.release()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await self._llm.warm_up(connections)
+
+    async def aclose(self) -> None:
+        await self._llm.aclose()
+
+    def estimate_tokens(self, system_prompt: str, user_prompt: str) -> int:
+        prompt_chars = len(system_prompt) + len(user_prompt)
+        return (
+            int(prompt_chars / self._chars_per_token) + self._completion_tokens_estimate
+        )
+
+    async def _wait_for_budget(self, estimated_tokens: int) -> None:
+        pause = self._paused_until - self._clock()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        delay = max(self._requests.reserve(1), self._tokens.reserve(estimated_tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, exc: BaseException, attempt: int) -> float | None:
+        """Seconds to wait before retrying after ``exc``, or None to give up."""
+        retry_after = None
+        if isinstance(exc, self._rate_limit_errors):
+            retry_after = retry_after_seconds(exc)
+            self._limit.decrease(cooldown=retry_after or self._base_delay)
+            if retry_after is not None:
+                self._paused_until = max(
+                    self._paused_until, self._clock() + retry_after
+                )
+        if attempt >= self._max_retries:
+            return None
+        return self._backoff(attempt, retry_after)
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self._base_delay)
+        ceiling = min(self._max_delay, self._base_delay * 2**attempt)
+        return random.uniform(0, ceiling)
@@ -0,0 +1,196 @@
+"""
+Builds the long-lived services from the settings.
+
+Shared by the API lifespan and the command-line tools, so that both run with
+the same configured LLM decorators and storage backends. Optional backends are
+imported only when configured, which keeps them out of the start-up time.
+"""
+
+from app.adapters.cached import CachedLLm
+from app.adapters.fake import FakeLLMAdapter
+from app.adapters.hedged import HedgedLLm
+from app.adapters.instrumented import InstrumentedLLm
+from app.adapters.openai import OpenAIAdapter
+from app.adapters.rate_limited import RateLimitedLLm
+from app.configurations import settings
+from app.ports.job_repository import JobRepository
+from app.ports.llm import LLm
+from app.ports.summary_repository import SummaryRepository
+from app.repositories.in_memory import (
+    BoundedInMemorySummaryRepository,
+    InMemoryJobRepository,
+    InMemorySummaryRepository,
+)
+from app.repositories.instrumented import InstrumentedSummaryRepository
+from app.repositories.search_index import IndexedSummaryRepository, InvertedIndex
+from app.services.packer import TranscriptPacker
+from app.services.scheduler import LLMScheduler, ScheduledLLm
+from app.services.summary_responses import SummaryResponseCache
+
+
+def build_summary_repository() -> SummaryRepository:
+    # The index is in process, so it is left out in front of the shared redis
+    # store, where each worker would only find the summaries it saved itself.
+    index = (
+        InvertedIndex(max_postings=settings.SUMMARY_SEARCH_MAX_POSTINGS)
+        if settings.SUMMARY_SEARCH_ENABLED
+        and settings.SUMMARY_REPOSITORY_BACKEND != "redis"
+        else None
+    )
+    if settings.SUMMARY_REPOSITORY_BACKEND == "redis":
+        from app.repositories.redis import RedisSummaryRepository
+
+        repository: SummaryRepository = RedisSummaryRepository.from_connection_params(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            key_prefix=settings.REDIS_KEY_PREFIX,
+            ttl_seconds=settings.SUMMARY_TTL_SECONDS,
+        )
+    elif settings.SUMMARY_REPOSITORY_BACKEND == "bounded":
+        repository = BoundedInMemorySummaryRepository(
+            max_entries=settings.SUMMARY_MEMORY_MAX_ENTRIES,
+            max_bytes=settings.SUMMARY_MEMORY_MAX_BYTES,
+            ttl_seconds=settings.SUMMARY_TTL_SECONDS,
+            compression=settings.SUMMARY_MEMORY_COMPRESSION,
+            compress_min_bytes=settings.SUMMARY_MEMORY_COMPRESS_MIN_BYTES,
+            # Evicted and expired summaries leave the index as well, so that it
+            # stays within the store's bounds.
+            on_remove=None if index is None else index.remove,
+        )
+    else:
+        repository = InMemorySummaryRepository()
+    if index is not None:
+        repository = IndexedSummaryRepository(repository, index)
+    return InstrumentedSummaryRepository(repository)
+
+
+def build_summary_response_cache() -> SummaryResponseCache:
+    return SummaryResponseCache(
+        max_entries=settings.SUMMARY_RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.SUMMARY_RESPONSE_CACHE_MAX_BYTES,
+        ttl_seconds=settings.SUMMARY_TTL_SECONDS,
+        max_age_seconds=settings.SUMMARY_HTTP_MAX_AGE_SECONDS,
+    )
+
+
+def build_job_repository() -> JobRepository:
+    if settings.JOB_REPOSITORY_BACKEND == "redis":
+        from app.repositories.redis import RedisJobRepository
+
+        return RedisJobRepository.from_connection_params(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            key_prefix=settings.REDIS_JOB_KEY_PREFIX,
+        )
+    return InMemoryJobRepository()
+
+
+def build_llm_backend(
+    backend: str | None = None, model: str | None = None, seed_offset: int = 0
+) -> LLm:
+    if (backend or settings.LLM_BACKEND) == "fake":
+        seed = settings.FAKE_LLM_SEED
+        return FakeLLMAdapter(
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            latency_distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+            latency_spread=settings.FAKE_LLM_LATENCY_SPREAD,
+            ms_per_prompt_char=settings.FAKE_LLM_MS_PER_PROMPT_CHAR,
+            error_rate=settings.FAKE_LLM_ERROR_RATE,
+            rate_limit_rate=settings.FAKE_LLM_RATE_LIMIT_RATE,
+            packed_item_drop_rate=settings.FAKE_LLM_PACKED_ITEM_DROP_RATE,
+            seed=None if seed is None else seed + seed_offset,
+        )
+    return OpenAIAdapter(
+        api_key=settings.OPENAI_API_KEY,
+        model=model or settings.OPENAI_MODEL,
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        max_retries=0,
+    )
+
+
+def _build_scheduled_backend(
+    backend: str | None = None, model: str | None = None, seed_offset: int = 0
+) -> LLm:
+    # Instrumented below the retries, so that every attempt is observed.
+    return RateLimitedLLm(
+        InstrumentedLLm(build_llm_backend(backend, model, seed_offset)),
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        min_concurrency=settings.LLM_MIN_CONCURRENCY,
+        initial_concurrency=settings.LLM_INITIAL_CONCURRENCY,
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+        max_retries=settings.LLM_MAX_RETRIES,
+        base_delay=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+        max_delay=settings.LLM_RETRY_MAX_DELAY_SECONDS,
+    )
+
+
+def build_llm_scheduler() -> LLMScheduler | None:
+    if not settings.SCHEDULER_ENABLED:
+        return None
+    return LLMScheduler(
+        max_concurrency=settings.SCHEDULER_MAX_CONCURRENCY,
+        interactive_weight=settings.SCHEDULER_INTERACTIVE_WEIGHT,
+        interactive_max_queue=settings.SCHEDULER_INTERACTIVE_MAX_QUEUE,
+        batch_max_queue=settings.SCHEDULER_BATCH_MAX_QUEUE,
+        interactive_max_wait=settings.SCHEDULER_INTERACTIVE_MAX_WAIT_SECONDS,
+        batch_max_wait=settings.SCHEDULER_BATCH_MAX_WAIT_SECONDS,
+        max_queued_per_client=settings.SCHEDULER_MAX_QUEUED_PER_CLIENT,
+    )
+
+
+def build_llm_service(scheduler: LLMScheduler | None = None) -> LLm:
+    backends = {"primary": _build_scheduled_backend()}
+    if settings.LLM_SECONDARY_BACKEND != "none":
+        backends["secondary"] = _build_scheduled_backend(
+            settings.LLM_SECONDARY_BACKEND, settings.LLM_SECONDARY_MODEL, seed_offset=1
+        )
+    # Above the per-backend quotas and retries, so that the deadline bounds the
+    # whole call and a backend stuck in back-off gets hedged around.
+    llm: LLm = HedgedLLm(
+        backends,
+        deadline_seconds=settings.LLM_DEADLINE_SECONDS,
+        hedge=settings.LLM_HEDGE_ENABLED,
+        hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY_SECONDS,
+        hedge_max_delay=settings.LLM_HEDGE_MAX_DELAY_SECONDS,
+        failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds=settings.LLM_CIRCUIT_RESET_SECONDS,
+    )
+    # Below the cache, so that cache hits never queue.
+    if scheduler is not None:
+        llm = ScheduledLLm(llm, scheduler)
+    # Cache hits must not spend rate-limit budget, so the cache goes in front.
+    if settings.LLM_CACHE_ENABLED:
+        llm = CachedLLm(
+            llm,
+            model=settings.OPENAI_MODEL,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+    return llm
+
+
+def build_transcript_packer(llm: LLm) -> TranscriptPacker | None:
+    if not settings.LLM_PACKING_ENABLED:
+        return None
+    # The packer keeps each summary under its single-transcript key itself,
+    # and sends its calls below the cache.
+    cache = llm if isinstance(llm, CachedLLm) else None
+    return TranscriptPacker(
+        llm if cache is None else cache.llm,
+        window_seconds=settings.LLM_PACKING_WINDOW_MS / 1000,
+        max_transcripts=settings.LLM_PACKING_MAX_TRANSCRIPTS,
+        max_prompt_tokens=settings.LLM_PACKING_MAX_PROMPT_TOKENS,
+        max_transcript_chars=settings.LLM_PACKING_MAX_TRANSCRIPT_CHARS,
+        cache=cache,
+    )
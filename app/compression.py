@@ -0,0 +1,285 @@
+import zlib
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # Optional: zstd bodies are refused without it.
+    zstandard = None
+
+# Streamed to the client event by event; compressing them buys little.
+_UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+# zstd input is fed in slices this small so that a single highly compressed
+# message cannot expand far past the size cap before it is checked.
+_ZSTD_INPUT_SLICE = 256
+
+
+def supported_encodings() -> list[str]:
+    """Content codings accepted on request bodies, best first."""
+    return ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+
+class _GzipDecoder:
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    @property
+    def finished(self) -> bool:
+        return self._decompressor.eof
+
+    def decode(self, data: bytes, limit: int) -> bytes:
+        # Never inflates more than one byte past the limit.
+        return self._decompressor.decompress(data, limit + 1)
+
+
+class _ZstdDecoder:
+    def __init__(self) -> None:
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    @property
+    def finished(self) -> bool:
+        return self._decompressor.eof
+
+    def decode(self, data: bytes, limit: int) -> bytes:
+        parts: list[bytes] = []
+        size = 0
+        for start in range(0, len(data), _ZSTD_INPUT_SLICE):
+            part = self._decompressor.decompress(
+                data[start : start + _ZSTD_INPUT_SLICE]
+            )
+            parts.append(part)
+            size += len(part)
+            if size > limit:
+                break
+        return b"".join(parts)
+
+
+_DECODERS: dict[str, type[_GzipDecoder] | type[_ZstdDecoder]] = {
+    "gzip": _GzipDecoder,
+    "x-gzip": _GzipDecoder,
+    "zstd": _ZstdDecoder,
+}
+
+
+class RequestDecompressionMiddleware:
+    """
+    Inflates gzip and zstd request bodies as they are received.
+
+    Bodies, compressed or not, are capped at ``max_body_bytes`` once
+    inflated: a larger one is answered with 413 as soon as the cap is
+    crossed, without buffering the rest. Unknown codings get 415 and corrupt
+    or truncated compressed bodies 400.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = 16 * 1024 * 1024) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = headers.get("content-encoding", "identity").strip().lower()
+        if encoding != "identity" and (
+            encoding not in _DECODERS or (encoding == "zstd" and zstandard is None)
+        ):
+            response = JSONResponse(
+                {"detail": f"Unsupported Content-Encoding: {encoding}"},
+                status_code=415,
+                headers={"Accept-Encoding": ", ".join(supported_encodings())},
+            )
+            await response(scope, receive, send)
+            return
+        length = headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_body_bytes:
+            response = JSONResponse({"detail": "Request body too large"}, 413)
+            await response(scope, receive, send)
+            return
+
+        if encoding == "identity":
+            await self.app(scope, self._capped(receive), send)
+            return
+        # The application sees the inflated body, so the headers describing
+        # the compressed one are dropped. The scope is updated in place, so
+        # that the outer middlewares still see the route matched within it.
+        scope["headers"] = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        await self.app(scope, self._inflated(receive, encoding), send)
+
+    def _capped(self, receive: Receive) -> Receive:
+        received = 0
+
+        async def receive_capped() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise HTTPException(413, "Request body too large")
+            return message
+
+        return receive_capped
+
+    def _inflated(self, receive: Receive, encoding: str) -> Receive:
+        decoder = _DECODERS[encoding]()
+        inflated = 0
+
+        async def receive_inflated() -> Message:
+            nonlocal inflated
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+            try:
+                body = decoder.decode(
+                    message.get("body", b""), self.max_body_bytes - inflated
+                )
+            except Exception:
+                raise HTTPException(400, f"Invalid {encoding} request body") from None
+            inflated += len(body)
+            if inflated > self.max_body_bytes:
+                raise HTTPException(413, "Request body too large")
+            more_body = message.get("more_body", False)
+            if not more_body and not decoder.finished:
+                raise HTTPException(400, f"Truncated {encoding} request body")
+            return {"type": "http.request", "body": body, "more_body": more_body}
+
+        return receive_inflated
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        # A sync flush hands every streamed item to the client right away.
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+_ENCODERS: dict[str, type[_GzipEncoder] | type[_ZstdEncoder]] = {
+    "gzip": _GzipEncoder,
+    "zstd": _ZstdEncoder,
+}
+
+
+def _accepted_encoding(accept_encoding: str) -> str | None:
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    for encoding in supported_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+class ResponseCompressionMiddleware:
+    """
+    Compresses responses of at least ``minimum_size`` bytes with zstd or gzip.
+
+    zstd is preferred when the client accepts it and the zstandard package is
+    installed. Streamed responses are compressed chunk by chunk and flushed
+    after each one, so their items are not held back; Server-Sent Events are
+    left alone. Levels favour CPU time over the last few percent of size.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "zstd": zstd_level}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = None
+        if scope["type"] == "http":
+            encoding = _accepted_encoding(
+                Headers(scope=scope).get("accept-encoding", "")
+            )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder: _GzipEncoder | _ZstdEncoder | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk tells whether to compress.
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                response_start, start = start, None
+                headers = MutableHeaders(raw=response_start["headers"])
+                if (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(
+                        _UNCOMPRESSED_MEDIA_TYPES
+                    )
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    await send(response_start)
+                    await send(message)
+                    return
+                encoder = _ENCODERS[encoding](self.levels[encoding])
+                body = encoder.encode(body, final=not more_body)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                # The compressed bytes differ from those the strong ETag names.
+                etag = headers.get("etag")
+                if etag is not None and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(response_start)
+            elif encoder is not None:
+                body = encoder.encode(body, final=not more_body)
+            await send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
+        if start is not None:
+            # A response without a body message.
+            await send(start)
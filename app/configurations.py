@@ -1,3 +1,5 @@
+from typing import Literal
+
 import pydantic_settings
 
 
@@ -6,11 +8,115 @@ class EnvConfigs(pydantic_settings.BaseSettings):
         env_file=".env", env_file_encoding="utf-8"
     )
 
+    # "fake" swaps OpenAI for FakeLLMAdapter, for offline load tests.
+    LLM_BACKEND: Literal["openai", "fake"] = "openai"
+
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-2024-08-06"
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+    FAKE_LLM_LATENCY_MS: float = 800.0
+    FAKE_LLM_LATENCY_DISTRIBUTION: Literal[
+        "constant", "uniform", "exponential", "lognormal"
+    ] = "lognormal"
+    FAKE_LLM_LATENCY_SPREAD: float = 0.5
+    FAKE_LLM_MS_PER_PROMPT_CHAR: float = 0.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_RATE_LIMIT_RATE: float = 0.0
+    FAKE_LLM_PACKED_ITEM_DROP_RATE: float = 0.0
+    FAKE_LLM_SEED: int | None = 0
+
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MIN_CONCURRENCY: int = 1
+    LLM_INITIAL_CONCURRENCY: int = 8
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 200_000
+    LLM_MAX_RETRIES: int = 4
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 20.0
+
+    # Every call is abandoned after the deadline; None waits for the backend.
+    LLM_DEADLINE_SECONDS: float | None = 120.0
+    # Optional second backend for failover and hedged calls, e.g. a smaller model.
+    LLM_SECONDARY_BACKEND: Literal["none", "openai", "fake"] = "none"
+    LLM_SECONDARY_MODEL: str | None = None
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_HEDGE_MAX_DELAY_SECONDS: float = 30.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Process-wide admission control: priority lanes, a global concurrency
+    # budget and load shedding. Clients are told apart by the header, else by IP.
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_MAX_CONCURRENCY: int = 64
+    SCHEDULER_INTERACTIVE_WEIGHT: int = 4
+    SCHEDULER_INTERACTIVE_MAX_QUEUE: int = 256
+    SCHEDULER_BATCH_MAX_QUEUE: int = 4096
+    SCHEDULER_INTERACTIVE_MAX_WAIT_SECONDS: float = 10.0
+    SCHEDULER_BATCH_MAX_WAIT_SECONDS: float = 300.0
+    SCHEDULER_MAX_QUEUED_PER_CLIENT: int = 1024
+    SCHEDULER_CLIENT_HEADER: str = "X-Client-Id"
+
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 10_000
+    LLM_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LLM_CACHE_TTL_SECONDS: float | None = 3600.0
+
+    # "bounded" is the in-process store with eviction and compression.
+    SUMMARY_REPOSITORY_BACKEND: Literal["memory", "bounded", "redis"] = "memory"
+    SUMMARY_TTL_SECONDS: int | None = None
+    SUMMARY_MEMORY_MAX_ENTRIES: int | None = 100_000
+    SUMMARY_MEMORY_MAX_BYTES: int | None = 256 * 1024 * 1024
+    SUMMARY_MEMORY_COMPRESSION: Literal["none", "zlib", "zstd"] = "zlib"
+    SUMMARY_MEMORY_COMPRESS_MIN_BYTES: int = 512
+    # In-process full-text index of the summaries saved by this process; not
+    # built in front of the shared redis backend.
+    SUMMARY_SEARCH_ENABLED: bool = True
+    SUMMARY_SEARCH_MAX_POSTINGS: int = 2048
+    # Rendered get-by-id responses kept per process; 0 entries disables it.
+    SUMMARY_RESPONSE_CACHE_MAX_ENTRIES: int = 4096
+    SUMMARY_RESPONSE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Cache-Control max-age of summaries, capped at SUMMARY_TTL_SECONDS.
+    SUMMARY_HTTP_MAX_AGE_SECONDS: int = 365 * 24 * 3600
+
+    # Transcripts longer than this are summarized with map-reduce; None disables it.
+    LONG_TRANSCRIPT_CHARS: int | None = 48_000
+    TRANSCRIPT_CHUNK_CHARS: int = 16_000
+
+    # Packs short transcripts arriving within the window into one LLM call.
+    LLM_PACKING_ENABLED: bool = False
+    LLM_PACKING_WINDOW_MS: float = 20.0
+    LLM_PACKING_MAX_TRANSCRIPTS: int = 16
+    LLM_PACKING_MAX_PROMPT_TOKENS: int = 6_000
+    LLM_PACKING_MAX_TRANSCRIPT_CHARS: int = 4_000
+
+    # Request bodies are capped after gzip/zstd decompression.
+    REQUEST_MAX_BODY_BYTES: int = 16 * 1024 * 1024
+    RESPONSE_COMPRESSION_ENABLED: bool = True
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+
+    JOB_REPOSITORY_BACKEND: Literal["memory", "redis"] = "memory"
+    JOB_WORKERS: int = 2
+    JOB_ITEM_CONCURRENCY: int = 8
+    JOB_LEASE_SECONDS: float = 30.0
 
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_PASSWORD: str | None = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_KEY_PREFIX: str = "summary:"
+    REDIS_JOB_KEY_PREFIX: str = "job:"
+
+    # Opens LLM and Redis connections after start-up; /ready answers 503 until
+    # done. A failed or timed-out warm-up is logged and the replica turns ready.
+    STARTUP_WARMUP_ENABLED: bool = False
+    STARTUP_WARMUP_CONNECTIONS: int = 4
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 10.0
 
 
 settings = EnvConfigs()
@@ -1,13 +1,96 @@
-from fastapi import HTTPException
+from fastapi import Depends, HTTPException, Request
 
-from app.adapters.openai import OpenAIAdapter
+from app.adapters.cached import CachedLLm
 from app.configurations import settings
+from app.ports.job_repository import JobRepository
 from app.ports.llm import LLm
 from app.ports.summary_repository import SummaryRepository
+from app.services.jobs import JobWorkerPool
+from app.services.packer import TranscriptPacker
+from app.services.scheduler import CallContext, LLMScheduler, set_call_context
+from app.services.summarizer import TranscriptSummarizer
+from app.services.summary_responses import SummaryResponseCache
 
+_llm_service: LLm | None = None
 
-def get_llm_service_openai() -> LLm:
-    return OpenAIAdapter(model=settings.OPENAI_MODEL, api_key=settings.OPENAI_API_KEY)
+
+def get_llm_service() -> LLm:
+    if _llm_service is None:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    return _llm_service
+
+
+def set_llm_service(llm: LLm | None) -> None:
+    global _llm_service
+    _llm_service = llm
+
+
+_transcript_packer: TranscriptPacker | None = None
+
+
+def get_transcript_packer() -> TranscriptPacker | None:
+    """The shared packer, or None when packing is disabled."""
+    return _transcript_packer
+
+
+def set_transcript_packer(packer: TranscriptPacker | None) -> None:
+    global _transcript_packer
+    _transcript_packer = packer
+
+
+def get_summarizer(
+    llm: LLm = Depends(get_llm_service),
+    packer: TranscriptPacker | None = Depends(get_transcript_packer),
+) -> TranscriptSummarizer:
+    return TranscriptSummarizer(
+        llm,
+        long_transcript_chars=settings.LONG_TRANSCRIPT_CHARS,
+        chunk_chars=settings.TRANSCRIPT_CHUNK_CHARS,
+        packer=packer,
+    )
+
+
+_llm_scheduler: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler | None:
+    """The shared scheduler, or None when admission control is disabled."""
+    return _llm_scheduler
+
+
+def set_llm_scheduler(scheduler: LLMScheduler | None) -> None:
+    global _llm_scheduler
+    _llm_scheduler = scheduler
+
+
+def _client_id(request: Request) -> str:
+    client = request.headers.get(settings.SCHEDULER_CLIENT_HEADER)
+    if client:
+        return client
+    return request.client.host if request.client else "anonymous"
+
+
+# Async, so that the context is set in the task running the endpoint.
+async def use_interactive_lane(request: Request) -> None:
+    set_call_context(CallContext(lane="interactive", client=_client_id(request)))
+
+
+async def use_batch_lane(request: Request) -> None:
+    set_call_context(CallContext(lane="batch", client=_client_id(request)))
+
+
+_llm_cache: CachedLLm | None = None
+
+
+def get_llm_cache() -> CachedLLm:
+    if _llm_cache is None:
+        raise HTTPException(status_code=404, detail="LLM cache is disabled")
+    return _llm_cache
+
+
+def set_llm_cache(cache: CachedLLm | None) -> None:
+    global _llm_cache
+    _llm_cache = cache
 
 
 _summary_repository: SummaryRepository | None = None
@@ -22,3 +105,46 @@ def get_summary_repository() -> SummaryRepository:
 def set_summary_repository(repository: SummaryRepository) -> None:
     global _summary_repository
     _summary_repository = repository
+
+
+_summary_response_cache: SummaryResponseCache | None = None
+
+
+# Async, so that hot reads do not resolve it on the thread pool.
+async def get_summary_response_cache() -> SummaryResponseCache:
+    if _summary_response_cache is None:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    return _summary_response_cache
+
+
+def set_summary_response_cache(cache: SummaryResponseCache | None) -> None:
+    global _summary_response_cache
+    _summary_response_cache = cache
+
+
+_job_repository: JobRepository | None = None
+
+
+def get_job_repository() -> JobRepository:
+    if _job_repository is None:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    return _job_repository
+
+
+def set_job_repository(repository: JobRepository | None) -> None:
+    global _job_repository
+    _job_repository = repository
+
+
+_job_worker_pool: JobWorkerPool | None = None
+
+
+def get_job_worker_pool() -> JobWorkerPool:
+    if _job_worker_pool is None:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    return _job_worker_pool
+
+
+def set_job_worker_pool(pool: JobWorkerPool | None) -> None:
+    global _job_worker_pool
+    _job_worker_pool = pool
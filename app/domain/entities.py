@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from enum import Enum
 
 
 @dataclass
@@ -6,3 +7,52 @@ class Summary:
     id: str
     content: str
     ctas: list[str]
+
+
+@dataclass
+class SummaryDelta:
+    """Part of a summary being generated: more content text or one whole CTA."""
+
+    content: str = ""
+    cta: str | None = None
+
+
+@dataclass
+class IdPage:
+    ids: list[str]
+    next_cursor: str | None = None
+
+
+@dataclass
+class SearchHit:
+    summary: Summary
+    score: float
+
+
+@dataclass
+class SearchPage:
+    hits: list[SearchHit]
+    next_cursor: str | None = None
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+@dataclass
+class Job:
+    id: str
+    total: int
+    created_at: float
+    status: JobStatus = JobStatus.PENDING
+    completed: int = 0
+    failed: int = 0
+
+
+@dataclass
+class JobItemResult:
+    index: int
+    summary_id: str | None = None
+    error: str | None = None
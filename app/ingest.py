@@ -0,0 +1,335 @@
+"""
+Summarizes every transcript of a JSONL file, resumably, without the HTTP API.
+
+    python -m app.ingest transcripts.jsonl summaries.jsonl --field transcript
+
+Each input line is a JSON object holding the transcript under ``--field``
+(or a bare JSON string). Lines are read lazily and at most ``--concurrency``
+transcripts are in flight, so memory stays flat however large the file is.
+Every result is saved to the configured summary repository and appended to
+the output file as soon as it is ready, tagged with its input line number.
+
+Progress is checkpointed next to the output. A rerun with the same arguments
+skips every line that already has a summary in the output, including the
+ones written after the last checkpoint, and seeks past the finished prefix of
+the input instead of reading it again. Lines that failed are tried again by
+the next run, which appends a new record for them: the last record of a line
+is the one that counts.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+from app.builders import (
+    build_llm_service,
+    build_summary_repository,
+    build_transcript_packer,
+)
+from app.dependencies import get_summarizer
+from app.ports.summary_repository import SummaryRepository
+from app.schemas.responses import SummaryResponse
+from app.services.summarizer import TranscriptSummarizer
+
+
+@dataclass
+class Checkpoint:
+    """
+    Which input lines are finished, in constant space for in-order progress.
+
+    Every line below ``watermark`` has been processed; ``completed`` holds
+    the processed lines above it, which only grows while an early line is
+    slow. Of those, the lines in ``failed`` are not done and are retried;
+    each maps to its byte offset in the input, or None until a run reads it
+    again. ``prefix_offset`` is the byte offset of ``prefix_line``: every
+    line before it has been processed, and the failed ones are retried from
+    their own offsets. A run resumes at the first failed line or the prefix,
+    whichever comes first. ``output_offset`` is the output size at the time
+    of the checkpoint.
+    """
+
+    input: str
+    watermark: int = 0
+    completed: set[int] = field(default_factory=set)
+    failed: dict[int, int | None] = field(default_factory=dict)
+    prefix_line: int = 0
+    prefix_offset: int = 0
+    output_offset: int = 0
+    _line_ends: dict[int, int] = field(default_factory=dict, repr=False)
+
+    @property
+    def resume_line(self) -> int:
+        return self._resume_point()[0]
+
+    @property
+    def resume_offset(self) -> int:
+        return self._resume_point()[1]
+
+    def is_done(self, line: int) -> bool:
+        return (
+            line < self.watermark or line in self.completed
+        ) and line not in self.failed
+
+    def mark_read(self, line: int, start_offset: int, end_offset: int) -> None:
+        """Records where a line read by this run starts and ends, done or not."""
+        if line in self.failed:
+            self.failed[line] = start_offset
+        if line >= self.watermark:
+            self._line_ends[line] = end_offset
+        elif line == self.prefix_line:
+            # Lines are read in order, so the prefix follows the reads over
+            # lines that were already processed.
+            self.prefix_line, self.prefix_offset = line + 1, end_offset
+
+    def mark(
+        self,
+        line: int,
+        end_offset: int | None = None,
+        failed: bool = False,
+        start_offset: int | None = None,
+    ) -> None:
+        if failed:
+            if start_offset is None:
+                start_offset = self.failed.get(line)
+            self.failed[line] = start_offset
+        else:
+            # A retried line that now succeeded no longer holds the resume
+            # point back.
+            self.failed.pop(line, None)
+        if line < self.watermark:
+            return
+        if end_offset is not None:
+            self._line_ends[line] = end_offset
+        self.completed.add(line)
+        while self.watermark in self.completed:
+            self.completed.remove(self.watermark)
+            end = self._line_ends.pop(self.watermark, None)
+            if end is not None:
+                self.prefix_line, self.prefix_offset = self.watermark + 1, end
+            self.watermark += 1
+
+    def _resume_point(self) -> tuple[int, int]:
+        known = [
+            (line, offset) for line, offset in self.failed.items() if offset is not None
+        ]
+        return min([(self.prefix_line, self.prefix_offset), *known])
+
+    @classmethod
+    def load(cls, path: Path, input_path: Path) -> "Checkpoint":
+        if not path.exists():
+            return cls(input=str(input_path.resolve()))
+        data = json.loads(path.read_text())
+        if data["input"] != str(input_path.resolve()):
+            raise ValueError(f"{path} belongs to {data['input']}, not to {input_path}")
+        return cls(
+            input=data["input"],
+            watermark=data["watermark"],
+            completed=set(data["completed"]),
+            failed={int(line): offset for line, offset in data["failed"].items()},
+            prefix_line=data["prefix_line"],
+            prefix_offset=data["prefix_offset"],
+            output_offset=data["output_offset"],
+        )
+
+    def save(self, path: Path) -> None:
+        data = {
+            "input": self.input,
+            "watermark": self.watermark,
+            "completed": sorted(self.completed),
+            "failed": {str(line): offset for line, offset in self.failed.items()},
+            "prefix_line": self.prefix_line,
+            "prefix_offset": self.prefix_offset,
+            "output_offset": self.output_offset,
+        }
+        # Written aside and renamed, so a crash never leaves half a checkpoint.
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(json.dumps(data))
+        os.replace(temporary, path)
+
+
+def read_lines(stream: BinaryIO, first_line: int) -> Iterator[tuple[int, bytes, int]]:
+    """Yields ``(line number, raw line, end offset)`` from the stream position on."""
+    offset = stream.tell()
+    for line_number, raw in enumerate(stream, start=first_line):
+        offset += len(raw)
+        yield line_number, raw, offset
+
+
+def parse_transcript(raw: bytes, field_name: str) -> str:
+    record = json.loads(raw)
+    transcript = record if isinstance(record, str) else record[field_name]
+    if not isinstance(transcript, str):
+        raise ValueError(f"{field_name!r} is not a string")
+    return transcript
+
+
+def recover_output(output: BinaryIO, checkpoint: Checkpoint) -> None:
+    """
+    Marks the lines written after the checkpoint as done and drops a torn
+    last record, so that a crash costs no LLM call twice.
+    """
+    output.seek(0, os.SEEK_END)
+    if output.tell() < checkpoint.output_offset:
+        raise ValueError("The output file is shorter than its checkpoint says")
+    output.seek(checkpoint.output_offset)
+    valid_end = checkpoint.output_offset
+    for raw in output:
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            break
+        if not raw.endswith(b"\n"):
+            break
+        checkpoint.mark(record["line"], failed="error" in record)
+        valid_end += len(raw)
+    output.truncate(valid_end)
+    output.seek(valid_end)
+
+
+@dataclass
+class IngestStats:
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+
+async def ingest(
+    input_path: Path,
+    output_path: Path,
+    checkpoint_path: Path,
+    summarizer: TranscriptSummarizer,
+    repository: SummaryRepository,
+    field_name: str = "transcript",
+    concurrency: int = 16,
+    checkpoint_every: float = 5.0,
+    progress_every: float = 10.0,
+    progress: TextIO = sys.stderr,
+) -> IngestStats:
+    checkpoint = Checkpoint.load(checkpoint_path, input_path)
+    stats = IngestStats()
+    input_size = input_path.stat().st_size
+    output_path.touch()
+
+    with input_path.open("rb") as source, output_path.open("r+b") as output:
+        recover_output(output, checkpoint)
+        source.seek(checkpoint.resume_offset)
+        lines = read_lines(source, checkpoint.resume_line)
+        last_checkpoint = last_progress = time.monotonic()
+
+        def save_checkpoint() -> None:
+            output.flush()
+            checkpoint.output_offset = output.tell()
+            checkpoint.save(checkpoint_path)
+
+        def report(final: bool = False) -> None:
+            elapsed = time.monotonic() - stats.started_at
+            read = source.tell()
+            print(
+                f"{'done' if final else 'progress'}: {stats.succeeded} ok, "
+                f"{stats.failed} failed, {stats.skipped} skipped, "
+                f"{stats.processed / elapsed if elapsed else 0.0:.1f} items/s, "
+                f"{100 * read / input_size if input_size else 100.0:.1f}% of input",
+                file=progress,
+                flush=True,
+            )
+
+        async def process(line_number: int, raw: bytes, end_offset: int) -> None:
+            record: dict = {"line": line_number}
+            try:
+                transcript = parse_transcript(raw, field_name)
+                summary = await summarizer.summarize(transcript)
+                await repository.save(summary)
+            except Exception as exc:
+                record["error"] = f"{type(exc).__name__}: {exc}"
+                stats.failed += 1
+            else:
+                record["summary"] = SummaryResponse.from_entity(summary).model_dump()
+                stats.succeeded += 1
+            output.write(json.dumps(record).encode("utf-8") + b"\n")
+            checkpoint.mark(
+                line_number,
+                end_offset,
+                failed="error" in record,
+                start_offset=end_offset - len(raw),
+            )
+
+        async def consume() -> None:
+            nonlocal last_checkpoint, last_progress
+            # Consumers share one iterator: at most `concurrency` lines are
+            # read ahead of the slowest unfinished one.
+            for line_number, raw, end_offset in lines:
+                checkpoint.mark_read(line_number, end_offset - len(raw), end_offset)
+                if checkpoint.is_done(line_number):
+                    stats.skipped += 1
+                    continue
+                if not raw.strip():
+                    checkpoint.mark(line_number, end_offset)
+                    continue
+                await process(line_number, raw, end_offset)
+
+                now = time.monotonic()
+                if now - last_checkpoint >= checkpoint_every:
+                    last_checkpoint = now
+                    save_checkpoint()
+                if now - last_progress >= progress_every:
+                    last_progress = now
+                    report()
+
+        try:
+            await asyncio.gather(*(consume() for _ in range(concurrency)))
+        finally:
+            save_checkpoint()
+        report(final=True)
+    return stats
+
+
+async def main(args: argparse.Namespace) -> IngestStats:
+    repository = build_summary_repository()
+    llm = build_llm_service()
+    packer = build_transcript_packer(llm)
+    try:
+        return await ingest(
+            args.input,
+            args.output,
+            args.checkpoint or args.output.with_name(args.output.name + ".checkpoint"),
+            get_summarizer(llm, packer),
+            repository,
+            field_name=args.field,
+            concurrency=args.concurrency,
+            checkpoint_every=args.checkpoint_every,
+            progress_every=args.progress_every,
+        )
+    finally:
+        if packer is not None:
+            await packer.aclose()
+        await llm.aclose()
+        await repository.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", type=Path, help="JSONL file of transcripts")
+    parser.add_argument("output", type=Path, help="JSONL file results are added to")
+    parser.add_argument(
+        "--field", default="transcript", help="Key holding the transcript"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--checkpoint", type=Path, help="Defaults to <output>.checkpoint"
+    )
+    parser.add_argument("--checkpoint-every", type=float, default=5.0, help="Seconds")
+    parser.add_argument("--progress-every", type=float, default=10.0, help="Seconds")
+    result = asyncio.run(main(parser.parse_args()))
+    sys.exit(1 if result.failed else 0)
@@ -1,33 +1,150 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager, suppress
 
 import fastapi
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from openai import (
     AuthenticationError,
     BadRequestError,
     OpenAIError,
 )
 
-from app.dependencies import set_summary_repository
-from app.repositories.in_memory import InMemorySummaryRepository
-from app.routers import extras, summary
+from app.adapters.cached import CachedLLm
+from app.builders import (
+    build_job_repository,
+    build_llm_scheduler,
+    build_llm_service,
+    build_summary_repository,
+    build_summary_response_cache,
+    build_transcript_packer,
+)
+from app.compression import (
+    RequestDecompressionMiddleware,
+    ResponseCompressionMiddleware,
+)
+from app.configurations import settings
+from app.dependencies import (
+    get_summarizer,
+    set_job_repository,
+    set_job_worker_pool,
+    set_llm_cache,
+    set_llm_scheduler,
+    set_llm_service,
+    set_summary_repository,
+    set_summary_response_cache,
+    set_transcript_packer,
+)
+from app.metrics import API_LLM_ERRORS, REGISTRY, STARTUP_DURATION, MetricsMiddleware
+from app.ports.job_repository import JobRepository
+from app.ports.llm import LLm
+from app.ports.summary_repository import SummaryRepository
+from app.routers import extras, jobs, summary
+from app.services.jobs import JobWorkerPool
+from app.services.scheduler import OverloadedError
+from app.services.summarizer import EmptyTranscriptError
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up(
+    app: FastAPI, llm: LLm, repository: SummaryRepository, job_repository: JobRepository
+) -> None:
+    started = time.perf_counter()
+    connections = settings.STARTUP_WARMUP_CONNECTIONS
+    try:
+        async with asyncio.timeout(settings.STARTUP_WARMUP_TIMEOUT_SECONDS):
+            await asyncio.gather(
+                llm.warm_up(connections),
+                repository.warm_up(connections),
+                job_repository.warm_up(connections),
+            )
+    except Exception:
+        # Cold connections are opened by the first requests instead.
+        logger.warning("Warm-up failed, serving without it", exc_info=True)
+    STARTUP_DURATION.labels("warm_up").set(time.perf_counter() - started)
+    app.state.ready = True
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    repository = InMemorySummaryRepository()
+    started = time.perf_counter()
+    app.state.ready = False
+    repository = build_summary_repository()
     set_summary_repository(repository)
+    set_summary_response_cache(build_summary_response_cache())
+
+    scheduler = build_llm_scheduler()
+    set_llm_scheduler(scheduler)
+    llm = build_llm_service(scheduler)
+    set_llm_service(llm)
+    if isinstance(llm, CachedLLm):
+        set_llm_cache(llm)
+    packer = build_transcript_packer(llm)
+    set_transcript_packer(packer)
+
+    job_repository = build_job_repository()
+    set_job_repository(job_repository)
+    job_worker_pool = JobWorkerPool(
+        get_summarizer(llm, packer),
+        job_repository,
+        repository,
+        workers=settings.JOB_WORKERS,
+        item_concurrency=settings.JOB_ITEM_CONCURRENCY,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+    )
+    await job_worker_pool.start()
+    set_job_worker_pool(job_worker_pool)
+    STARTUP_DURATION.labels("lifespan").set(time.perf_counter() - started)
+
+    # In the background, so that liveness probes on / are answered meanwhile.
+    warm_up = None
+    if settings.STARTUP_WARMUP_ENABLED:
+        warm_up = asyncio.create_task(_warm_up(app, llm, repository, job_repository))
+    else:
+        app.state.ready = True
 
     yield
 
+    app.state.ready = False
+    if warm_up is not None:
+        warm_up.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_up
+    set_job_worker_pool(None)
+    await job_worker_pool.stop()
+    set_job_repository(None)
+    await job_repository.aclose()
+    set_transcript_packer(None)
+    if packer is not None:
+        await packer.aclose()
+    set_llm_service(None)
+    set_llm_cache(None)
+    set_llm_scheduler(None)
+    await llm.aclose()
+    await repository.aclose()
+
 
 app = fastapi.FastAPI(lifespan=lifespan)
+app.add_middleware(
+    RequestDecompressionMiddleware, max_body_bytes=settings.REQUEST_MAX_BODY_BYTES
+)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        ResponseCompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+    )
+# Added last, so that it is outermost and times the whole request.
+app.add_middleware(MetricsMiddleware)
 
 
 def _openai_error_response(
     request: Request, status_code: int, detail: str, exception: Exception
 ) -> JSONResponse:
+    API_LLM_ERRORS.labels(type(exception).__name__, str(status_code)).inc()
     return JSONResponse(
         status_code=status_code,
         content={"detail": detail},
@@ -52,7 +169,24 @@ async def openai_error_handler(request: Request, exc: OpenAIError) -> JSONRespon
     )
 
 
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request: Request, exc: OverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+@app.exception_handler(EmptyTranscriptError)
+async def empty_transcript_handler(
+    request: Request, exc: EmptyTranscriptError
+) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
 app.include_router(summary.router)
+app.include_router(jobs.router)
 app.include_router(extras.router)
 
 
@@ -61,5 +195,20 @@ def read_root():
     return {"Hello": "World"}
 
 
+@app.get("/ready", include_in_schema=False)
+def ready(request: Request) -> JSONResponse:
+    """Readiness probe: 503 until the warm-up is over and once shutdown starts."""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse({"detail": "Not ready"}, status_code=503)
+    return JSONResponse({"status": "ready"})
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     fastapi.run(app, host="[IP_ADDRESS]", port=8000)
@@ -0,0 +1,345 @@
+"""
+Process-local metrics exposed in the Prometheus text format on ``/metrics``.
+
+A deliberately small subset of a Prometheus client: counters, gauges and
+histograms with fixed label names. Recording is a dict lookup plus an addition
+(and a bisect for histograms), so it is cheap enough for the request hot path.
+Values are per process; with several workers, scrape each one or aggregate in
+Prometheus.
+"""
+
+import bisect
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Generic, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    # HELP lines escape backslashes and line feeds, but not quotes.
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list["_Metric"] = []
+
+    def register(self, metric: "_Metric") -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+_Child = TypeVar("_Child")
+
+
+class _Metric(ABC, Generic[_Child]):
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        registry: Registry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], _Child] = {}
+        if not labelnames:
+            # Unlabelled metrics are exported from the start, even at zero.
+            self.labels()
+        registry.register(self)
+
+    def labels(self, *values: str) -> _Child:
+        """
+        Returns the child for these label values, creating it on first use.
+
+        Callers on the hot path with fixed label values should keep the child
+        around instead of looking it up on every observation.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> _Child:
+        pass
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for values, child in sorted(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            lines.extend(self._render_child(labels, child))
+        return lines
+
+    @abstractmethod
+    def _render_child(self, labels: str, child: _Child) -> list[str]:
+        pass
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _ValueMetric(_Metric[_Value]):
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def _render_child(self, labels: str, child: _Value) -> list[str]:
+        return [f"{self.name}{labels} {child.value}"]
+
+
+class Counter(_ValueMetric):
+    type_name = "counter"
+
+
+class Gauge(_ValueMetric):
+    type_name = "gauge"
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric[_HistogramValue]):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        registry: Registry = REGISTRY,
+    ) -> None:
+        self.buckets = buckets
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def _render_child(self, labels: str, child: _HistogramValue) -> list[str]:
+        prefix = labels[:-1] + "," if labels else "{"
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), child.counts):
+            cumulative += count
+            le = _escape(str(bound))
+            lines.append(f'{self.name}_bucket{prefix}le="{le}"}} {cumulative}')
+        lines.append(f"{self.name}_sum{labels} {child.sum}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to fully send an HTTP response, by route template.",
+    ("method", "route", "status"),
+)
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Duration of a single call to the LLM backend, retries counted separately.",
+    ("outcome",),
+)
+LLM_REQUESTS_IN_FLIGHT = Gauge(
+    "llm_requests_in_flight", "Calls to the LLM backend currently awaiting a reply."
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "Failed calls to the LLM backend, by exception class.",
+    ("exception",),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported in the completion usage field.",
+    ("type",),
+)
+LLM_HEDGED_REQUESTS = Counter(
+    "llm_hedged_requests_total",
+    "Calls duplicated to another backend after the hedge delay, by winning attempt.",
+    ("winner",),
+)
+LLM_DEADLINE_EXCEEDED = Counter(
+    "llm_deadline_exceeded_total",
+    "Calls abandoned because no backend answered within the deadline.",
+)
+LLM_CIRCUIT_OPEN = Gauge(
+    "llm_circuit_open",
+    "1 while the circuit breaker of an LLM backend keeps calls away from it.",
+    ("backend",),
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "llm_queue_depth", "Calls waiting for an LLM slot, by scheduler lane.", ("lane",)
+)
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds",
+    "Time calls waited for an LLM slot, by scheduler lane.",
+    ("lane",),
+)
+LLM_SCHEDULER_IN_FLIGHT = Gauge(
+    "llm_scheduler_in_flight", "LLM calls holding a slot of the global budget."
+)
+LLM_SHED = Counter(
+    "llm_shed_total",
+    "Calls or batches rejected before queueing, by lane and reason.",
+    ("lane", "reason"),
+)
+API_LLM_ERRORS = Counter(
+    "api_llm_errors_total",
+    "LLM errors turned into HTTP error responses, by exception class.",
+    ("exception", "status"),
+)
+STAGE_DURATION = Histogram(
+    "stage_duration_seconds",
+    "Time spent in hot-path stages other than waiting on the network.",
+    ("stage",),
+)
+BATCH_SIZE = Histogram(
+    "batch_size",
+    "Number of transcripts per batch request.",
+    ("endpoint",),
+    buckets=SIZE_BUCKETS,
+)
+PACKED_BATCH_SIZE = Histogram(
+    "llm_packed_batch_size",
+    "Number of transcripts summarized together in one packed LLM call.",
+    buckets=SIZE_BUCKETS,
+)
+PACKED_ITEM_RETRIES = Counter(
+    "llm_packed_item_retries_total",
+    "Transcripts summarized again on their own after a packed call left them out.",
+)
+SUMMARY_REPOSITORY_ENTRIES = Gauge(
+    "summary_repository_entries", "Summaries held by the bounded in-memory store."
+)
+SUMMARY_REPOSITORY_BYTES = Gauge(
+    "summary_repository_bytes",
+    "Estimated memory used by the bounded in-memory summary store.",
+)
+SUMMARY_REPOSITORY_EVICTIONS = Counter(
+    "summary_repository_evictions_total",
+    "Summaries evicted from the bounded in-memory store to stay within its caps.",
+)
+REPOSITORY_OPERATION_DURATION = Histogram(
+    "repository_operation_duration_seconds",
+    "Duration of summary repository operations.",
+    ("operation",),
+)
+STARTUP_DURATION = Gauge(
+    "startup_duration_seconds",
+    "Time spent starting this process, by phase (lifespan, warm_up).",
+    ("phase",),
+)
+SUMMARY_RESPONSE_CACHE_LOOKUPS = Counter(
+    "summary_response_cache_lookups_total",
+    "Reads of a summary by id, by whether its rendered response was cached.",
+    ("result",),
+)
+
+
+class MetricsMiddleware:
+    """Records the latency of every HTTP request, labelled by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label to keep cardinality bounded.
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route_path, status).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+
+from app.domain.entities import Job, JobItemResult, JobStatus
+
+
+class JobRepository(ABC):
+    @abstractmethod
+    async def create(self, job: Job, transcripts: list[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Job | None:
+        pass
+
+    @abstractmethod
+    async def set_status(self, job_id: str, status: JobStatus) -> None:
+        pass
+
+    @abstractmethod
+    async def pending_items(self, job_id: str) -> list[tuple[int, str]]:
+        """Returns ``(index, transcript)`` pairs that have no recorded result yet."""
+        pass
+
+    @abstractmethod
+    async def record_result(self, job_id: str, result: JobItemResult) -> None:
+        """Stores an item result once; a second result for the same index is ignored."""
+        pass
+
+    @abstractmethod
+    async def list_results(
+        self, job_id: str, offset: int, limit: int
+    ) -> list[JobItemResult]:
+        """Returns the recorded results whose index is in ``[offset, offset + limit)``."""
+        pass
+
+    @abstractmethod
+    async def list_unfinished(self) -> list[str]:
+        pass
+
+    async def acquire_lease(self, job_id: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Claims ``job_id`` for ``owner`` for ``ttl_seconds``, unless another owner
+        holds an unexpired lease. Backends shared by several processes override
+        this; a single process always owns its jobs.
+        """
+        return True
+
+    async def renew_lease(self, job_id: str, owner: str, ttl_seconds: float) -> bool:
+        """Extends the lease of ``owner``; False when it has expired or changed hands."""
+        return True
+
+    async def release_lease(self, job_id: str, owner: str) -> None:
+        """Drops the lease if ``owner`` still holds it."""
+        return None
+
+    async def warm_up(self, connections: int = 1) -> None:
+        """Opens up to ``connections`` pooled connections. Networked backends override this."""
+        return None
+
+    async def aclose(self) -> None:
+        """Releases pooled connections. Networked backends override this."""
+        return None
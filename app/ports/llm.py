@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator
 
 import pydantic
 
@@ -15,3 +16,26 @@ class LLm(ABC):
         self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
     ) -> pydantic.BaseModel:
         pass
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Yields the JSON text of the structured output as it is generated.
+
+        The chunks joined together validate as ``dto``. Implementations that
+        cannot stream yield the whole completion as one chunk.
+        """
+        result = await self.run_completion_async(system_prompt, user_prompt, dto)
+        yield result.model_dump_json()
+
+    async def warm_up(self, connections: int = 1) -> None:
+        """
+        Opens up to ``connections`` pooled connections and loads whatever the
+        first call would otherwise set up. Networked implementations override this.
+        """
+        return None
+
+    async def aclose(self) -> None:
+        """Releases pooled connections. Long-lived implementations override this."""
+        return None
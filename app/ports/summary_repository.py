@@ -1,17 +1,59 @@
 from abc import ABC, abstractmethod
 
-from app.domain.entities import Summary
+from app.domain.entities import IdPage, SearchPage, Summary
 
 
 class SummaryRepository(ABC):
     @abstractmethod
-    def save(self, summary: Summary) -> None:
+    async def save(self, summary: Summary) -> None:
         pass
 
     @abstractmethod
-    def get_by_id(self, id: str) -> Summary | None:
+    async def get_by_id(self, id: str) -> Summary | None:
         pass
 
     @abstractmethod
-    def list_ids(self) -> list[str]:
+    async def list_ids(self, cursor: str | None = None, limit: int = 1000) -> IdPage:
+        """
+        Returns up to ``limit`` ids starting at ``cursor`` (``None`` for the first
+        page). Pass the returned ``next_cursor`` to get the following page; it is
+        ``None`` once every id has been listed. Cursors are opaque and raise
+        ValueError when malformed.
+        """
         pass
+
+    async def exists(self, id: str) -> bool:
+        """Whether ``id`` is stored. Backends override this with a check cheaper than a read."""
+        return await self.get_by_id(id) is not None
+
+    async def get_many(self, ids: list[str]) -> list[Summary]:
+        """Fetches several summaries, in the order of ``ids``, skipping missing ones."""
+        summaries = [await self.get_by_id(id) for id in ids]
+        return [summary for summary in summaries if summary is not None]
+
+    async def save_many(self, summaries: list[Summary]) -> None:
+        """Stores several summaries. Backends with batching support override this."""
+        for summary in summaries:
+            await self.save(summary)
+
+    @property
+    def supports_search(self) -> bool:
+        """Whether ``search`` is available. Backends with a full-text index override this."""
+        return False
+
+    async def search(
+        self, query: str, cursor: str | None = None, limit: int = 20
+    ) -> SearchPage:
+        """
+        Returns the summaries best matching ``query``, best first, paged like
+        ``list_ids``. Only call it when ``supports_search`` is true.
+        """
+        raise TypeError(f"{type(self).__name__} does not support search")
+
+    async def warm_up(self, connections: int = 1) -> None:
+        """Opens up to ``connections`` pooled connections. Networked backends override this."""
+        return None
+
+    async def aclose(self) -> None:
+        """Releases pooled connections. Networked backends override this."""
+        return None
@@ -8,3 +8,35 @@ RAW_USER_PROMPT = """Given the transcript below, generate:
 
                     Transcript:
                     {transcript}"""
+
+RAW_CHUNK_USER_PROMPT = """The transcript below is part {part} of {parts} of a longer conversation.
+                    Given this part, generate:
+                    1. A brief, insightful summary highlighting key points discussed in it.
+                    2. A clear, structured list of recommended next actions raised in it.
+
+                    Transcript part:
+                    {transcript}"""
+
+RAW_REDUCE_USER_PROMPT = """The summaries below each cover one consecutive part of the same transcript.
+                    Combine them and generate:
+                    1. A single brief, insightful summary of the whole conversation.
+                    2. A clear, structured list of recommended next actions, merging duplicates.
+
+                    Partial summaries:
+                    {summaries}
+
+                    Candidate next actions:
+                    {ctas}"""
+
+RAW_PACKED_USER_PROMPT = """Each transcript below is a separate, unrelated conversation, tagged with its id.
+                    For every transcript, generate one item with its transcript_id and:
+                    1. A brief, insightful summary highlighting key points discussed in it.
+                    2. A clear, structured list of recommended next actions raised in it.
+                    Never mix content between transcripts.
+
+                    Transcripts:
+                    {transcripts}"""
+
+PACKED_TRANSCRIPT = """<transcript id="{transcript_id}">
+{transcript}
+</transcript>"""
@@ -1,16 +1,368 @@
-from app.domain.entities import Summary
+import bisect
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Literal
+
+from app.domain.entities import IdPage, Job, JobItemResult, JobStatus, Summary
+from app.metrics import (
+    SUMMARY_REPOSITORY_BYTES,
+    SUMMARY_REPOSITORY_ENTRIES,
+    SUMMARY_REPOSITORY_EVICTIONS,
+)
+from app.ports.job_repository import JobRepository
 from app.ports.summary_repository import SummaryRepository
 
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for compression="zstd".
+    zstandard = None
+
+Compression = Literal["none", "zlib", "zstd"]
+
+# Rough cost of the bookkeeping around each payload: the entry object, its
+# OrderedDict node and the two slots of the listing index.
+_ENTRY_OVERHEAD_BYTES = 160
+
+_ENTRIES = SUMMARY_REPOSITORY_ENTRIES.labels()
+_BYTES = SUMMARY_REPOSITORY_BYTES.labels()
+_EVICTIONS = SUMMARY_REPOSITORY_EVICTIONS.labels()
+
+
+def _parse_offset_cursor(cursor: str | None) -> int:
+    if cursor is None:
+        return 0
+    offset = int(cursor)
+    if offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return offset
+
 
 class InMemorySummaryRepository(SummaryRepository):
     def __init__(self) -> None:
         self._store: dict[str, Summary] = {}
+        # Append-only insertion order, so that a cursor is a plain offset and
+        # a page costs O(limit) however deep it is.
+        self._ids: list[str] = []
 
-    def save(self, summary: Summary) -> None:
-        self._store[str(summary.id)] = summary
+    async def save(self, summary: Summary) -> None:
+        id = str(summary.id)
+        if id not in self._store:
+            self._ids.append(id)
+        self._store[id] = summary
 
-    def get_by_id(self, id: str) -> Summary | None:
+    async def get_by_id(self, id: str) -> Summary | None:
         return self._store.get(id)
 
-    def list_ids(self) -> list[str]:
-        return list(self._store.keys())
+    async def exists(self, id: str) -> bool:
+        return id in self._store
+
+    async def get_many(self, ids: list[str]) -> list[Summary]:
+        return [self._store[id] for id in ids if id in self._store]
+
+    async def list_ids(self, cursor: str | None = None, limit: int = 1000) -> IdPage:
+        offset = _parse_offset_cursor(cursor)
+        end = offset + limit
+        next_cursor = str(end) if end < len(self._ids) else None
+        return IdPage(ids=self._ids[offset:end], next_cursor=next_cursor)
+
+
+def _pack_fields(fields: list[str]) -> bytes:
+    # Field count and lengths up front: decoding is one UTF-8 decode and slices.
+    header = struct.pack(
+        f"<I{len(fields)}I", len(fields), *(len(field) for field in fields)
+    )
+    return header + "".join(fields).encode("utf-8")
+
+
+def _unpack_fields(payload: bytes) -> list[str]:
+    (count,) = struct.unpack_from("<I", payload)
+    lengths = struct.unpack_from(f"<{count}I", payload, 4)
+    body = payload[4 * (count + 1) :].decode("utf-8")
+    fields = []
+    position = 0
+    for length in lengths:
+        fields.append(body[position : position + length])
+        position += length
+    return fields
+
+
+@dataclass
+class MemoryStats:
+    entries: int = 0
+    bytes: int = 0
+    compressed_entries: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class _CompactEntry:
+    __slots__ = ("payload", "compressed", "sequence", "size", "expires_at")
+
+    def __init__(
+        self,
+        payload: bytes,
+        compressed: bool,
+        sequence: int,
+        size: int,
+        expires_at: float | None,
+    ) -> None:
+        self.payload = payload
+        self.compressed = compressed
+        self.sequence = sequence
+        self.size = size
+        self.expires_at = expires_at
+
+
+class BoundedInMemorySummaryRepository(SummaryRepository):
+    """
+    In-process summary store with a flat memory profile.
+
+    Each summary is kept as one bytes payload instead of a string per field
+    and a list, and compressed with zlib or zstd once it reaches
+    ``compress_min_bytes``. Beyond ``max_entries`` or ``max_bytes``
+    (estimated, including bookkeeping) the least recently read or written
+    summaries are evicted; with ``ttl_seconds`` they also expire that long
+    after being saved. Expired entries are dropped when read, and at the LRU
+    end on every save.
+
+    Cursors are insertion sequence numbers, so evictions never shift a page
+    that was already handed out: evicted ids are simply no longer listed.
+
+    ``on_remove`` is called with the id of every evicted or expired summary,
+    so that an index built over the store can forget it too.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = 100_000,
+        max_bytes: int | None = 256 * 1024 * 1024,
+        ttl_seconds: float | None = None,
+        compression: Compression = "zlib",
+        compress_min_bytes: int = 512,
+        compression_level: int = 6,
+        clock: Callable[[], float] = time.monotonic,
+        on_remove: Callable[[str], None] | None = None,
+    ) -> None:
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._compression = compression
+        self._compress_min_bytes = compress_min_bytes
+        self._clock = clock
+        self._on_remove = on_remove
+        if compression == "zstd":
+            self._compress = zstandard.ZstdCompressor(level=compression_level).compress
+            self._decompress = zstandard.ZstdDecompressor().decompress
+        else:
+            self._compress = lambda data: zlib.compress(data, compression_level)
+            self._decompress = zlib.decompress
+        self._entries: OrderedDict[str, _CompactEntry] = OrderedDict()
+        # Listing index in insertion order: sequence numbers and ids, with None
+        # left where an entry was removed until the index is compacted.
+        self._sequences = array("q")
+        self._listed_ids: list[str | None] = []
+        self._removed = 0
+        self._next_sequence = 0
+        self._stats = MemoryStats()
+
+    async def save(self, summary: Summary) -> None:
+        self._store(summary)
+        self._publish_stats()
+
+    async def save_many(self, summaries: list[Summary]) -> None:
+        for summary in summaries:
+            self._store(summary)
+        self._publish_stats()
+
+    async def get_by_id(self, id: str) -> Summary | None:
+        entry = self._live_entry(id)
+        return None if entry is None else self._decode(id, entry)
+
+    async def exists(self, id: str) -> bool:
+        return self._live_entry(id) is not None
+
+    async def get_many(self, ids: list[str]) -> list[Summary]:
+        summaries = []
+        for id in ids:
+            entry = self._live_entry(id)
+            if entry is not None:
+                summaries.append(self._decode(id, entry))
+        return summaries
+
+    async def list_ids(self, cursor: str | None = None, limit: int = 1000) -> IdPage:
+        position = bisect.bisect_left(self._sequences, _parse_offset_cursor(cursor))
+        now = self._clock()
+        ids: list[str] = []
+        while position < len(self._listed_ids) and len(ids) < limit:
+            id = self._listed_ids[position]
+            if id is not None and not self._expired(self._entries[id], now):
+                ids.append(id)
+            position += 1
+        while position < len(self._listed_ids) and self._listed_ids[position] is None:
+            position += 1
+        next_cursor = (
+            str(self._sequences[position]) if position < len(self._listed_ids) else None
+        )
+        return IdPage(ids=ids, next_cursor=next_cursor)
+
+    def stats(self) -> MemoryStats:
+        return replace(self._stats, entries=len(self._entries))
+
+    def _store(self, summary: Summary) -> None:
+        id = str(summary.id)
+        raw = _pack_fields([summary.content, *summary.ctas])
+        compressed = (
+            self._compression != "none" and len(raw) >= self._compress_min_bytes
+        )
+        payload = self._compress(raw) if compressed else raw
+        size = sys.getsizeof(id) + sys.getsizeof(payload) + _ENTRY_OVERHEAD_BYTES
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        expires_at = (
+            None if self._ttl_seconds is None else self._clock() + self._ttl_seconds
+        )
+
+        previous = self._entries.get(id)
+        if previous is not None:
+            # Overwrites keep their place in the listing, as in the unbounded store.
+            sequence = previous.sequence
+            self._account(previous, -1)
+            self._entries.move_to_end(id)
+        else:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            self._sequences.append(sequence)
+            self._listed_ids.append(id)
+        entry = _CompactEntry(payload, compressed, sequence, size, expires_at)
+        self._entries[id] = entry
+        self._account(entry, 1)
+        self._evict()
+
+    def _evict(self) -> None:
+        now = self._clock()
+        while self._entries:
+            oldest_id, oldest = next(iter(self._entries.items()))
+            if self._expired(oldest, now):
+                self._stats.expirations += 1
+            elif (
+                self._max_entries is not None and len(self._entries) > self._max_entries
+            ) or (self._max_bytes is not None and self._stats.bytes > self._max_bytes):
+                self._stats.evictions += 1
+                _EVICTIONS.inc()
+            else:
+                return
+            self._remove(oldest_id)
+
+    def _live_entry(self, id: str) -> _CompactEntry | None:
+        entry = self._entries.get(id)
+        if entry is None:
+            return None
+        if self._expired(entry, self._clock()):
+            self._stats.expirations += 1
+            self._remove(id)
+            self._publish_stats()
+            return None
+        self._entries.move_to_end(id)
+        return entry
+
+    def _decode(self, id: str, entry: _CompactEntry) -> Summary:
+        payload = self._decompress(entry.payload) if entry.compressed else entry.payload
+        content, *ctas = _unpack_fields(payload)
+        return Summary(id=id, content=content, ctas=ctas)
+
+    def _remove(self, id: str) -> None:
+        entry = self._entries.pop(id)
+        self._account(entry, -1)
+        position = bisect.bisect_left(self._sequences, entry.sequence)
+        self._listed_ids[position] = None
+        self._removed += 1
+        if self._removed > len(self._listed_ids) // 2:
+            self._compact_listing()
+        if self._on_remove is not None:
+            self._on_remove(id)
+
+    def _compact_listing(self) -> None:
+        kept = [
+            (sequence, id)
+            for sequence, id in zip(self._sequences, self._listed_ids)
+            if id is not None
+        ]
+        self._sequences = array("q", (sequence for sequence, _ in kept))
+        self._listed_ids = [id for _, id in kept]
+        self._removed = 0
+
+    def _account(self, entry: _CompactEntry, sign: int) -> None:
+        self._stats.bytes += sign * entry.size
+        self._stats.compressed_entries += sign * entry.compressed
+
+    def _expired(self, entry: _CompactEntry, now: float) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= now
+
+    def _publish_stats(self) -> None:
+        _ENTRIES.set(len(self._entries))
+        _BYTES.set(self._stats.bytes)
+
+
+class InMemoryJobRepository(JobRepository):
+    def __init__(self) -> None:
+        self._jobs: dict[str, Job] = {}
+        self._transcripts: dict[str, list[str]] = {}
+        self._results: dict[str, dict[int, JobItemResult]] = {}
+
+    async def create(self, job: Job, transcripts: list[str]) -> None:
+        self._jobs[job.id] = replace(job)
+        self._transcripts[job.id] = list(transcripts)
+        self._results[job.id] = {}
+
+    async def get(self, job_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        return None if job is None else replace(job)
+
+    async def set_status(self, job_id: str, status: JobStatus) -> None:
+        self._jobs[job_id].status = status
+        if status is JobStatus.COMPLETED:
+            self._transcripts.pop(job_id, None)
+
+    async def pending_items(self, job_id: str) -> list[tuple[int, str]]:
+        results = self._results[job_id]
+        return [
+            (index, transcript)
+            for index, transcript in enumerate(self._transcripts.get(job_id, []))
+            if index not in results
+        ]
+
+    async def record_result(self, job_id: str, result: JobItemResult) -> None:
+        results = self._results[job_id]
+        if result.index in results:
+            return
+        results[result.index] = result
+        job = self._jobs[job_id]
+        if result.error is None:
+            job.completed += 1
+        else:
+            job.failed += 1
+
+    async def list_results(
+        self, job_id: str, offset: int, limit: int
+    ) -> list[JobItemResult]:
+        results = self._results.get(job_id, {})
+        return [
+            results[index]
+            for index in range(offset, offset + limit)
+            if index in results
+        ]
+
+    async def list_unfinished(self) -> list[str]:
+        return [
+            job.id
+            for job in self._jobs.values()
+            if job.status is not JobStatus.COMPLETED
+        ]
@@ -0,0 +1,81 @@
+import time
+
+from app.domain.entities import IdPage, SearchPage, Summary
+from app.metrics import REPOSITORY_OPERATION_DURATION
+from app.ports.summary_repository import SummaryRepository
+
+_SAVE = REPOSITORY_OPERATION_DURATION.labels("save")
+_SAVE_MANY = REPOSITORY_OPERATION_DURATION.labels("save_many")
+_GET_BY_ID = REPOSITORY_OPERATION_DURATION.labels("get_by_id")
+_EXISTS = REPOSITORY_OPERATION_DURATION.labels("exists")
+_GET_MANY = REPOSITORY_OPERATION_DURATION.labels("get_many")
+_LIST_IDS = REPOSITORY_OPERATION_DURATION.labels("list_ids")
+_SEARCH = REPOSITORY_OPERATION_DURATION.labels("search")
+
+
+class InstrumentedSummaryRepository(SummaryRepository):
+    """Records the duration of every operation of another SummaryRepository."""
+
+    def __init__(self, repository: SummaryRepository) -> None:
+        self._repository = repository
+
+    async def save(self, summary: Summary) -> None:
+        started = time.perf_counter()
+        try:
+            await self._repository.save(summary)
+        finally:
+            _SAVE.observe(time.perf_counter() - started)
+
+    async def save_many(self, summaries: list[Summary]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._repository.save_many(summaries)
+        finally:
+            _SAVE_MANY.observe(time.perf_counter() - started)
+
+    async def get_by_id(self, id: str) -> Summary | None:
+        started = time.perf_counter()
+        try:
+            return await self._repository.get_by_id(id)
+        finally:
+            _GET_BY_ID.observe(time.perf_counter() - started)
+
+    async def exists(self, id: str) -> bool:
+        started = time.perf_counter()
+        try:
+            return await self._repository.exists(id)
+        finally:
+            _EXISTS.observe(time.perf_counter() - started)
+
+    async def get_many(self, ids: list[str]) -> list[Summary]:
+        started = time.perf_counter()
+        try:
+            return await self._repository.get_many(ids)
+        finally:
+            _GET_MANY.observe(time.perf_counter() - started)
+
+    async def list_ids(self, cursor: str | None = None, limit: int = 1000) -> IdPage:
+        started = time.perf_counter()
+        try:
+            return await self._repository.list_ids(cursor, limit)
+        finally:
+            _LIST_IDS.observe(time.perf_counter() - started)
+
+    @property
+    def supports_search(self) -> bool:
+        return self._repository.supports_search
+
+    async def search(
+        self, query: str, cursor: str | None = None, limit: int = 20
+    ) -> SearchPage:
+        started = time.perf_counter()
+        try:
+            return await self._repository.search(query, cursor, limit)
+        finally:
+            _SEARCH.observe(time.perf_counter() - started)
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await self._repository.warm_up(connections)
+
+    async def aclose(self) -> None:
+        await self._repository.aclose()
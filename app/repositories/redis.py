@@ -0,0 +1,318 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from typing import TypeVar, cast
+
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+
+from app.domain.entities import IdPage, Job, JobItemResult, JobStatus, Summary
+from app.ports.job_repository import JobRepository
+from app.ports.summary_repository import SummaryRepository
+
+_T = TypeVar("_T")
+
+
+async def _resolved(reply: Awaitable[_T] | _T) -> _T:
+    # redis-py types the commands its sync and async clients share as
+    # ``Awaitable[T] | T``; on the async client they are always awaitable.
+    return await cast(Awaitable[_T], reply)
+
+
+class RedisSummaryRepository(SummaryRepository):
+    """
+    Stores summaries in Redis so that every worker process shares the same data.
+
+    Each summary lives under ``<key_prefix><id>`` as a compact JSON array
+    ``[content, ctas]``; the id is not repeated in the value.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        key_prefix: str = "summary:",
+        ttl_seconds: int | None = None,
+    ) -> None:
+        self._client = client
+        self._key_prefix = key_prefix
+        self._ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_connection_params(
+        cls,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: str | None = None,
+        max_connections: int = 50,
+        key_prefix: str = "summary:",
+        ttl_seconds: int | None = None,
+    ) -> "RedisSummaryRepository":
+        client = redis.Redis(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            max_connections=max_connections,
+        )
+        return cls(client, key_prefix=key_prefix, ttl_seconds=ttl_seconds)
+
+    async def save(self, summary: Summary) -> None:
+        await self._client.set(
+            self._key(summary.id), self._serialize(summary), ex=self._ttl_seconds
+        )
+
+    async def save_many(self, summaries: list[Summary]) -> None:
+        if not summaries:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for summary in summaries:
+                pipe.set(
+                    self._key(summary.id),
+                    self._serialize(summary),
+                    ex=self._ttl_seconds,
+                )
+            await pipe.execute()
+
+    async def get_by_id(self, id: str) -> Summary | None:
+        raw = await self._client.get(self._key(id))
+        if raw is None:
+            return None
+        return self._deserialize(id, raw)
+
+    async def exists(self, id: str) -> bool:
+        return bool(await self._client.exists(self._key(id)))
+
+    async def get_many(self, ids: list[str]) -> list[Summary]:
+        if not ids:
+            return []
+        raw = await self._client.mget([self._key(id) for id in ids])
+        return [
+            self._deserialize(id, value)
+            for id, value in zip(ids, raw)
+            if value is not None
+        ]
+
+    async def list_ids(self, cursor: str | None = None, limit: int = 1000) -> IdPage:
+        # SCAN's cursor is stable across writes; ``count`` is a hint, so a page
+        # may hold slightly more or fewer ids than ``limit``.
+        next_cursor, keys = await self._client.scan(
+            cursor=int(cursor or 0), match=f"{self._key_prefix}*", count=limit
+        )
+        prefix_length = len(self._key_prefix)
+        return IdPage(
+            ids=[key.decode("utf-8")[prefix_length:] for key in keys],
+            next_cursor=str(next_cursor) if next_cursor else None,
+        )
+
+    async def warm_up(self, connections: int = 1) -> None:
+        # Concurrent pings each check out a connection of their own.
+        await asyncio.gather(
+            *(_resolved(self._client.ping()) for _ in range(connections))
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _key(self, id: str) -> str:
+        return f"{self._key_prefix}{id}"
+
+    @staticmethod
+    def _serialize(summary: Summary) -> bytes:
+        return json.dumps(
+            [summary.content, summary.ctas], ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    @staticmethod
+    def _deserialize(id: str, raw: bytes) -> Summary:
+        content, ctas = json.loads(raw)
+        return Summary(id=id, content=content, ctas=ctas)
+
+
+class RedisJobRepository(JobRepository):
+    """
+    Keeps job state in Redis so that a restarted worker can resume it.
+
+    Per job there is a hash with status and counters, a list with the input
+    transcripts (dropped once the job completes) and a hash of item results
+    keyed by input index. Unfinished job ids are tracked in a set. The worker
+    running a job holds a lease on it, a key holding the owner's id that
+    expires unless renewed, so that replicas never run the same job at once.
+    """
+
+    def __init__(self, client: redis.Redis, key_prefix: str = "job:") -> None:
+        self._client = client
+        self._key_prefix = key_prefix
+
+    @classmethod
+    def from_connection_params(
+        cls,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: str | None = None,
+        max_connections: int = 50,
+        key_prefix: str = "job:",
+    ) -> "RedisJobRepository":
+        client = redis.Redis(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            max_connections=max_connections,
+        )
+        return cls(client, key_prefix=key_prefix)
+
+    async def create(self, job: Job, transcripts: list[str]) -> None:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                self._key(job.id),
+                mapping={
+                    "total": job.total,
+                    "created_at": job.created_at,
+                    "status": job.status.value,
+                    "completed": job.completed,
+                    "failed": job.failed,
+                },
+            )
+            if transcripts:
+                pipe.rpush(self._key(job.id, "transcripts"), *transcripts)
+            pipe.sadd(self._unfinished_key, job.id)
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> Job | None:
+        raw = await _resolved(self._client.hgetall(self._key(job_id)))
+        if not raw:
+            return None
+        return Job(
+            id=job_id,
+            total=int(raw[b"total"]),
+            created_at=float(raw[b"created_at"]),
+            status=JobStatus(raw[b"status"].decode("utf-8")),
+            completed=int(raw[b"completed"]),
+            failed=int(raw[b"failed"]),
+        )
+
+    async def set_status(self, job_id: str, status: JobStatus) -> None:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key(job_id), "status", status.value)
+            if status is JobStatus.COMPLETED:
+                pipe.delete(self._key(job_id, "transcripts"))
+                pipe.srem(self._unfinished_key, job_id)
+            await pipe.execute()
+
+    async def pending_items(self, job_id: str) -> list[tuple[int, str]]:
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.lrange(self._key(job_id, "transcripts"), 0, -1)
+            pipe.hkeys(self._key(job_id, "results"))
+            transcripts, done = await pipe.execute()
+        done_indexes = {int(index) for index in done}
+        return [
+            (index, transcript.decode("utf-8"))
+            for index, transcript in enumerate(transcripts)
+            if index not in done_indexes
+        ]
+
+    async def record_result(self, job_id: str, result: JobItemResult) -> None:
+        results_key = self._key(job_id, "results")
+        counter = "completed" if result.error is None else "failed"
+        value = json.dumps([result.summary_id, result.error], separators=(",", ":"))
+        # The result and its counter are written in one transaction, retried
+        # if another writer touches the results in between.
+        async with self._client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(results_key)
+                    if await _resolved(pipe.hexists(results_key, str(result.index))):
+                        return
+                    pipe.multi()
+                    pipe.hset(results_key, str(result.index), value)
+                    pipe.hincrby(self._key(job_id), counter, 1)
+                    await pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+
+    async def list_results(
+        self, job_id: str, offset: int, limit: int
+    ) -> list[JobItemResult]:
+        indexes = list(range(offset, offset + limit))
+        if not indexes:
+            return []
+        raw = await _resolved(
+            self._client.hmget(
+                self._key(job_id, "results"), [str(index) for index in indexes]
+            )
+        )
+        results = []
+        for index, value in zip(indexes, raw):
+            if value is None:
+                continue
+            summary_id, error = json.loads(value)
+            results.append(
+                JobItemResult(index=index, summary_id=summary_id, error=error)
+            )
+        return results
+
+    async def list_unfinished(self) -> list[str]:
+        return [
+            job_id.decode("utf-8")
+            for job_id in await _resolved(self._client.smembers(self._unfinished_key))
+        ]
+
+    async def acquire_lease(self, job_id: str, owner: str, ttl_seconds: float) -> bool:
+        return bool(
+            await self._client.set(
+                self._key(job_id, "lease"),
+                owner,
+                nx=True,
+                px=int(ttl_seconds * 1000),
+            )
+        )
+
+    async def renew_lease(self, job_id: str, owner: str, ttl_seconds: float) -> bool:
+        return await self._if_lease_owner(
+            job_id, owner, lambda pipe, key: pipe.pexpire(key, int(ttl_seconds * 1000))
+        )
+
+    async def release_lease(self, job_id: str, owner: str) -> None:
+        await self._if_lease_owner(job_id, owner, lambda pipe, key: pipe.delete(key))
+
+    async def warm_up(self, connections: int = 1) -> None:
+        # Concurrent pings each check out a connection of their own.
+        await asyncio.gather(
+            *(_resolved(self._client.ping()) for _ in range(connections))
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _if_lease_owner(
+        self,
+        job_id: str,
+        owner: str,
+        command: Callable[[Pipeline, str], object],
+    ) -> bool:
+        """Runs ``command`` on the lease key only while ``owner`` holds it."""
+        key = self._key(job_id, "lease")
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != owner.encode("utf-8"):
+                    return False
+                pipe.multi()
+                command(pipe, key)
+                await pipe.execute()
+            except redis.WatchError:
+                # Expired and taken over in between.
+                return False
+        return True
+
+    @property
+    def _unfinished_key(self) -> str:
+        return f"{self._key_prefix}unfinished"
+
+    def _key(self, job_id: str, suffix: str | None = None) -> str:
+        if suffix is None:
+            return f"{self._key_prefix}{job_id}"
+        return f"{self._key_prefix}{job_id}:{suffix}"
@@ -0,0 +1,315 @@
+import math
+import re
+import sys
+from array import array
+
+from app.domain.entities import IdPage, SearchHit, SearchPage, Summary
+from app.ports.summary_repository import SummaryRepository
+
+_TOKEN = re.compile(r"[^\W_]+")
+# Too common to rank anything, and their postings would be the longest.
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because
+    been before being below between both but by can could did do does doing down
+    during each few for from further had has have having he her here hers herself
+    him himself his how i if in into is it its itself just me more most my myself
+    no nor not now of off on once only or other our ours ourselves out over own
+    same she should so some such than that the their theirs them themselves then
+    there these they this those through to too under until up very was we were
+    what when where which while who whom why will with would you your yours
+    yourself yourselves
+    """.split()
+)
+
+# The BM25 term-frequency factor lies in (0, k1 + 1]; it is quantized into
+# this many levels and every posting is filed under its level ("impact
+# ordering"), so that the best matches of a term are read first.
+IMPACT_LEVELS = 16
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token for token in _TOKEN.findall(text.casefold()) if token not in STOPWORDS
+    ]
+
+
+class InvertedIndex:
+    """
+    In-memory BM25 index over summary content and CTAs.
+
+    Documents get increasing numbers, and each term keeps one array of
+    document numbers per impact level, so postings cost 4 bytes each and stay
+    sorted by document number. Scores use BM25 (k1, b) with the
+    term-frequency factor quantized to ``IMPACT_LEVELS`` levels against the
+    average length at indexing time.
+
+    Queries read postings from the highest contribution down, newest
+    documents first within a level, and stop after ``max_postings`` of them
+    (at least four per requested result). Results are exact when the query
+    terms have fewer postings than that; otherwise the documents that were
+    not reached score lowest, which bounds the cost of a query whatever the
+    number of matching documents.
+
+    Re-indexing or removing an id leaves a tombstone behind; the postings are
+    rewritten once tombstones outnumber a quarter of the live documents.
+    """
+
+    def __init__(
+        self, k1: float = 1.2, b: float = 0.75, max_postings: int = 2048
+    ) -> None:
+        self._k1 = k1
+        self._b = b
+        self._max_postings = max_postings
+        self._postings: dict[str, dict[int, array]] = {}
+        self._ids: list[str | None] = []
+        self._numbers: dict[str, int] = {}
+        self._lengths = array("I")
+        self._total_length = 0
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def add(self, id: str, text: str) -> None:
+        if id in self._numbers:
+            self.remove(id)
+        tokens = tokenize(text)
+        number = len(self._ids)
+        self._ids.append(id)
+        self._numbers[id] = number
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        average_length = self._total_length / len(self._numbers)
+        if average_length:
+            norm = self._k1 * (1 - self._b + self._b * len(tokens) / average_length)
+        else:
+            # Only empty (or stopword-only) documents so far; this one has no
+            # terms to file anyway.
+            norm = self._k1
+        frequencies: dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for term, frequency in frequencies.items():
+            factor = frequency * (self._k1 + 1) / (frequency + norm)
+            level = min(
+                IMPACT_LEVELS, math.ceil(factor / (self._k1 + 1) * IMPACT_LEVELS)
+            )
+            levels = self._postings.get(term)
+            if levels is None:
+                levels = self._postings[term] = {}
+            postings = levels.get(level)
+            if postings is None:
+                postings = levels[level] = array("I")
+            postings.append(number)
+
+    def remove(self, id: str) -> None:
+        number = self._numbers.pop(id, None)
+        if number is None:
+            return
+        self._ids[number] = None
+        self._total_length -= self._lengths[number]
+        self._removed += 1
+        if self._removed > max(1_000, len(self._numbers) // 4):
+            self._compact()
+
+    def search(self, query: str, offset: int, limit: int) -> list[tuple[str, float]]:
+        """Returns up to ``limit`` ``(id, score)`` pairs after the first ``offset``."""
+        wanted = offset + limit
+        streams = []
+        for term in dict.fromkeys(tokenize(query)):
+            levels = self._postings.get(term)
+            if levels is None:
+                continue
+            frequency = sum(len(postings) for postings in levels.values())
+            idf = math.log(
+                1 + (len(self._numbers) - frequency + 0.5) / (frequency + 0.5)
+            )
+            streams.append(
+                [
+                    (idf * self._level_factor(level), levels[level])
+                    for level in sorted(levels, reverse=True)
+                ]
+            )
+        if not streams or wanted <= 0:
+            return []
+        if len(streams) == 1:
+            ranked = self._read_single_term(streams[0], wanted)
+        else:
+            ranked = self._read_terms(streams, wanted)
+        return ranked[offset:]
+
+    def memory_bytes(self) -> int:
+        """Estimated size of the index structures, excluding the id strings."""
+        size = sys.getsizeof(self._postings) + sys.getsizeof(self._ids)
+        size += sys.getsizeof(self._numbers) + sys.getsizeof(self._lengths)
+        for term, levels in self._postings.items():
+            size += sys.getsizeof(term) + sys.getsizeof(levels)
+            size += sum(sys.getsizeof(postings) for postings in levels.values())
+        return size
+
+    def _level_factor(self, level: int) -> float:
+        return level * (self._k1 + 1) / IMPACT_LEVELS
+
+    def _read_single_term(
+        self, segments: list[tuple[float, array]], wanted: int
+    ) -> list[tuple[str, float]]:
+        ranked: list[tuple[str, float]] = []
+        for contribution, postings in segments:
+            # Newest first within a level, as in the multi-term ranking.
+            for number in reversed(postings):
+                id = self._ids[number]
+                if id is None:
+                    continue
+                ranked.append((id, contribution))
+                if len(ranked) == wanted:
+                    return ranked
+        return ranked
+
+    def _read_terms(
+        self, streams: list[list[tuple[float, array]]], wanted: int
+    ) -> list[tuple[str, float]]:
+        # Score-at-a-time: the segments of every term in decreasing
+        # contribution order, until the postings budget is spent.
+        segments = sorted(
+            (segment for segments in streams for segment in segments),
+            key=lambda segment: segment[0],
+            reverse=True,
+        )
+        budget = max(self._max_postings, 4 * wanted)
+        scores: dict[int, float] = {}
+        for contribution, postings in segments:
+            if len(postings) > budget:
+                postings = postings[len(postings) - budget :]
+            budget -= len(postings)
+            # Built and merged by dict operations, so that only the documents
+            # already scored for another segment are summed in Python. Newest
+            # first, which the stable sort below keeps among equal scores.
+            fresh = dict.fromkeys(reversed(postings), contribution)
+            for number in fresh.keys() & scores.keys():
+                fresh[number] += scores[number]
+            scores.update(fresh)
+            if not budget:
+                break
+        ranked = []
+        for number in sorted(scores, key=scores.__getitem__, reverse=True):
+            id = self._ids[number]
+            if id is not None:
+                ranked.append((id, scores[number]))
+                if len(ranked) == wanted:
+                    break
+        return ranked
+
+    def _compact(self) -> None:
+        renumbered: dict[int, int] = {}
+        ids: list[str | None] = []
+        numbers: dict[str, int] = {}
+        lengths = array("I")
+        for number, id in enumerate(self._ids):
+            if id is not None:
+                renumbered[number] = numbers[id] = len(ids)
+                ids.append(id)
+                lengths.append(self._lengths[number])
+        for term in list(self._postings):
+            levels = self._postings[term]
+            for level in list(levels):
+                kept = array(
+                    "I",
+                    (renumbered[n] for n in levels[level] if n in renumbered),
+                )
+                if kept:
+                    levels[level] = kept
+                else:
+                    del levels[level]
+            if not levels:
+                del self._postings[term]
+        self._ids = ids
+        self._numbers = numbers
+        self._lengths = lengths
+        self._removed = 0
+
+
+def _parse_offset(cursor: str | None) -> int:
+    if cursor is None:
+        return 0
+    offset = int(cursor)
+    if offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return offset
+
+
+class IndexedSummaryRepository(SummaryRepository):
+    """
+    Adds full-text search to another SummaryRepository.
+
+    Every summary saved through it is indexed in process (content and CTAs),
+    and search hits are read back from the wrapped repository. The index only
+    covers summaries saved by this process, so it only suits per-process
+    stores. Hits the repository no longer has (evicted or expired) are dropped
+    from the index when found; a store that reports its removals, such as
+    BoundedInMemorySummaryRepository's ``on_remove``, can drop them as they go.
+    """
+
+    def __init__(
+        self, repository: SummaryRepository, index: InvertedIndex | None = None
+    ) -> None:
+        self._repository = repository
+        self._index = InvertedIndex() if index is None else index
+
+    @property
+    def index(self) -> InvertedIndex:
+        return self._index
+
+    @property
+    def supports_search(self) -> bool:
+        return True
+
+    async def save(self, summary: Summary) -> None:
+        await self._repository.save(summary)
+        self._add(summary)
+
+    async def save_many(self, summaries: list[Summary]) -> None:
+        await self._repository.save_many(summaries)
+        for summary in summaries:
+            self._add(summary)
+
+    async def get_by_id(self, id: str) -> Summary | None:
+        return await self._repository.get_by_id(id)
+
+    async def exists(self, id: str) -> bool:
+        return await self._repository.exists(id)
+
+    async def get_many(self, ids: list[str]) -> list[Summary]:
+        return await self._repository.get_many(ids)
+
+    async def list_ids(self, cursor: str | None = None, limit: int = 1000) -> IdPage:
+        return await self._repository.list_ids(cursor, limit)
+
+    async def search(
+        self, query: str, cursor: str | None = None, limit: int = 20
+    ) -> SearchPage:
+        offset = _parse_offset(cursor)
+        # One extra hit tells whether there is a next page.
+        ranked = self._index.search(query, offset, limit + 1)
+        page, more = ranked[:limit], len(ranked) > limit
+        summaries = {
+            summary.id: summary
+            for summary in await self._repository.get_many([id for id, _ in page])
+        }
+        hits = []
+        for id, score in page:
+            summary = summaries.get(id)
+            if summary is None:
+                self._index.remove(id)
+            else:
+                hits.append(SearchHit(summary=summary, score=round(score, 4)))
+        return SearchPage(hits=hits, next_cursor=str(offset + limit) if more else None)
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await self._repository.warm_up(connections)
+
+    async def aclose(self) -> None:
+        await self._repository.aclose()
+
+    def _add(self, summary: Summary) -> None:
+        self._index.add(str(summary.id), "\n".join([summary.content, *summary.ctas]))
@@ -1,7 +1,18 @@
-from fastapi import APIRouter, Depends
+from dataclasses import asdict
 
-from app.dependencies import get_summary_repository
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+
+from app.adapters.cached import CachedLLm
+from app.dependencies import get_llm_cache, get_summary_repository
+from app.domain.entities import Summary
 from app.ports.summary_repository import SummaryRepository
+from app.schemas.responses import (
+    LlmCacheStatsResponse,
+    SummaryIdPageResponse,
+    SummaryResponse,
+    SummarySearchHit,
+    SummarySearchResponse,
+)
 
 router = APIRouter(prefix="/extras", tags=["extras"])
 
@@ -12,10 +23,109 @@ router = APIRouter(prefix="/extras", tags=["extras"])
     summary="Retrieve list of all summary IDs",
     description=(
         "Fetches a list containing the unique IDs of all summaries that have been generated and stored "
-        "in the repository. This endpoint provides a simple way to enumerate all available summaries for later retrieval."
+        "in the repository. This endpoint provides a simple way to enumerate all available summaries for later retrieval. "
+        "Deprecated: the response grows with the store, use `/extras/list_summaries_ids` instead."
     ),
+    deprecated=True,
 )
 async def get_summaries_ids(
     repository: SummaryRepository = Depends(get_summary_repository),
 ) -> list[str]:
-    return repository.list_ids()
+    ids: list[str] = []
+    page = await repository.list_ids()
+    ids.extend(page.ids)
+    while page.next_cursor is not None:
+        page = await repository.list_ids(cursor=page.next_cursor)
+        ids.extend(page.ids)
+    return ids
+
+
+@router.get(
+    "/list_summaries_ids",
+    response_model=SummaryIdPageResponse,
+    summary="Page through summary IDs",
+    description=(
+        "Returns one page of stored summary IDs. Omit `cursor` for the first page and pass the returned "
+        "`next_cursor` to get the next one; `next_cursor` is null on the last page. Cursors are opaque and "
+        "stay valid while new summaries are being stored."
+    ),
+)
+async def list_summaries_ids(
+    cursor: str | None = Query(
+        None, description="Cursor returned by the previous page"
+    ),
+    limit: int = Query(1000, ge=1, le=10_000),
+    repository: SummaryRepository = Depends(get_summary_repository),
+) -> SummaryIdPageResponse:
+    try:
+        page = await repository.list_ids(cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return SummaryIdPageResponse(ids=page.ids, next_cursor=page.next_cursor)
+
+
+@router.get(
+    "/search_summaries",
+    response_model=SummarySearchResponse,
+    summary="Search stored summaries",
+    description=(
+        "Full-text search over the content and CTAs of the stored summaries, ranked by BM25. Words are matched "
+        "case-insensitively and common English words are ignored. Omit `cursor` for the best matches and pass "
+        "the returned `next_cursor` for the following ones; `next_cursor` is null on the last page. "
+        "Search covers the summaries kept in this process, so it is not available with the redis backend."
+    ),
+)
+async def search_summaries(
+    query: str = Query(..., min_length=1, max_length=1000, examples=["pricing"]),
+    cursor: str | None = Query(
+        None, description="Cursor returned by the previous page"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    repository: SummaryRepository = Depends(get_summary_repository),
+) -> SummarySearchResponse:
+    if not repository.supports_search:
+        raise HTTPException(status_code=501, detail="Search is not enabled")
+    try:
+        page = await repository.search(query, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return SummarySearchResponse(
+        items=[
+            SummarySearchHit(
+                summary=SummaryResponse.from_entity(hit.summary), score=hit.score
+            )
+            for hit in page.hits
+        ],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post(
+    "/get_summaries_by_ids",
+    response_model=list[Summary],
+    summary="Retrieve several summaries in one call",
+    description=(
+        "Fetches the summaries and CTAs for a list of IDs in a single round trip to the repository. "
+        "Results keep the order of the requested IDs; IDs that do not exist are left out."
+    ),
+)
+async def get_summaries_by_ids(
+    ids: list[str] = Body(..., max_length=1000),
+    repository: SummaryRepository = Depends(get_summary_repository),
+) -> list[Summary]:
+    return await repository.get_many(ids)
+
+
+@router.get(
+    "/llm_cache_stats",
+    response_model=LlmCacheStatsResponse,
+    summary="Retrieve LLM cache counters",
+    description=(
+        "Returns hit, miss and coalesced counts of the summary cache placed in front of the LLM service, "
+        "together with its current size. Coalesced calls are concurrent duplicates that shared one in-flight completion."
+    ),
+)
+async def get_llm_cache_stats(
+    cache: CachedLLm = Depends(get_llm_cache),
+) -> LlmCacheStatsResponse:
+    return LlmCacheStatsResponse(**asdict(cache.stats()))
@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.dependencies import (
+    get_job_repository,
+    get_job_worker_pool,
+    get_summary_repository,
+)
+from app.metrics import BATCH_SIZE
+from app.ports.job_repository import JobRepository
+from app.ports.summary_repository import SummaryRepository
+from app.schemas.requests import TextToSummary
+from app.schemas.responses import (
+    JobResultItem,
+    JobResultsResponse,
+    JobStatusResponse,
+    SummaryResponse,
+)
+from app.services.jobs import JobWorkerPool
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+_BATCH_SIZE = BATCH_SIZE.labels("jobs_submit")
+
+
+@router.post(
+    "/submit",
+    response_model=JobStatusResponse,
+    status_code=202,
+    summary="Submit a batch of texts to be summarized in the background.",
+    description=(
+        "Queues a list of texts for background summarization and returns the job right away. "
+        "Use the returned ID to follow progress with `/jobs/get_status` and to page through results "
+        "with `/jobs/get_results`. Suited for batches too large to wait for within one HTTP request."
+    ),
+)
+async def submit_job(
+    list_of_texts_to_summarize: list[TextToSummary],
+    pool: JobWorkerPool = Depends(get_job_worker_pool),
+) -> JobStatusResponse:
+    _BATCH_SIZE.observe(len(list_of_texts_to_summarize))
+    job = await pool.submit([str(item) for item in list_of_texts_to_summarize])
+    return JobStatusResponse.from_entity(job)
+
+
+@router.get(
+    "/get_status",
+    response_model=JobStatusResponse,
+    summary="Retrieve the status and progress counters of a job.",
+    description=(
+        "Returns the status of a background job (`pending`, `running` or `completed`) together with the number "
+        "of inputs, and how many of them have completed or failed so far."
+    ),
+)
+async def get_job_status(
+    job_id: str, job_repository: JobRepository = Depends(get_job_repository)
+) -> JobStatusResponse:
+    job = await job_repository.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatusResponse.from_entity(job)
+
+
+@router.get(
+    "/get_results",
+    response_model=JobResultsResponse,
+    summary="Page through the results of a job.",
+    description=(
+        "Returns the results for the inputs at positions `[offset, offset + limit)`. Results are available as soon "
+        "as each input finishes, so this endpoint can be polled while the job is running; inputs still in progress "
+        "are left out of the page. `next_offset` is null on the last page."
+    ),
+)
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    job_repository: JobRepository = Depends(get_job_repository),
+    repository: SummaryRepository = Depends(get_summary_repository),
+) -> JobResultsResponse:
+    job = await job_repository.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    results = await job_repository.list_results(job_id, offset, limit)
+    summaries = await repository.get_many(
+        [result.summary_id for result in results if result.summary_id is not None]
+    )
+    summaries_by_id = {summary.id: summary for summary in summaries}
+
+    items = []
+    for result in results:
+        summary = summaries_by_id.get(result.summary_id or "")
+        items.append(
+            JobResultItem(
+                index=result.index,
+                summary=None
+                if summary is None
+                else SummaryResponse.from_entity(summary),
+                error=result.error,
+            )
+        )
+    next_offset = offset + limit if offset + limit < job.total else None
+    return JobResultsResponse(items=items, next_offset=next_offset)
@@ -1,23 +1,85 @@
 import asyncio
-from uuid import uuid4
+from contextlib import aclosing
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import pydantic
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 
-from app.dependencies import get_llm_service_openai, get_summary_repository
-from app.domain.entities import Summary
-from app.ports.llm import LLm
+from app.dependencies import (
+    get_llm_scheduler,
+    get_summarizer,
+    get_summary_repository,
+    get_summary_response_cache,
+    use_batch_lane,
+    use_interactive_lane,
+)
+from app.domain.entities import Summary, SummaryDelta
+from app.metrics import BATCH_SIZE
 from app.ports.summary_repository import SummaryRepository
-from app.prompts import RAW_USER_PROMPT, SYSTEM_PROMPT
-from app.schemas.llm_responses import SummaryLLMOutput
-from app.schemas.requests import TextToSummary
+from app.schemas.requests import SummaryRequest, TextToSummary
 from app.schemas.responses import (
     BatchSummaryItem,
     BatchSummaryResponse,
+    BatchSummaryStreamItem,
+    ModelResponse,
     SummaryResponse,
+    SummaryStreamEvent,
 )
+from app.services.scheduler import LLMScheduler, current_call_context
+from app.services.summarizer import TranscriptSummarizer
+from app.services.summary_responses import SummaryResponseCache, etag_matches
 
 router = APIRouter(prefix="/summary_maker", tags=["summary_maker"])
 
+_BATCH_SIZE = BATCH_SIZE.labels("async_get_summary_and_ctas")
+_STREAM_BATCH_SIZE = BATCH_SIZE.labels("async_get_summary_and_ctas_stream")
+
+_STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+_TEXT_TO_SUMMARY: pydantic.TypeAdapter[TextToSummary] = pydantic.TypeAdapter(
+    TextToSummary
+)
+
+
+def _stream_line(payload: str, output_format: Literal["ndjson", "sse"]) -> str:
+    return f"data: {payload}\n\n" if output_format == "sse" else f"{payload}\n"
+
+
+async def _transcript_from_body(request: Request) -> str:
+    """Reads the transcript from a JSON SummaryRequest or a UTF-8 text/plain body."""
+    content_type = request.headers.get("content-type", "application/json")
+    media_type = content_type.partition(";")[0].strip().lower()
+    body = await request.body()
+    try:
+        if media_type == "text/plain":
+            try:
+                text = body.decode("utf-8")
+            except UnicodeDecodeError:
+                raise HTTPException(400, "Body is not valid UTF-8") from None
+            return _TEXT_TO_SUMMARY.validate_python(text)
+        if media_type == "application/json":
+            return SummaryRequest.model_validate_json(body).text_to_summary
+    except pydantic.ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors()]
+        ) from None
+    raise HTTPException(415, "Send application/json or text/plain")
+
+
+async def _summarize_and_store(
+    transcript: str,
+    summarizer: TranscriptSummarizer,
+    repository: SummaryRepository,
+) -> ModelResponse:
+    summary_entity = await summarizer.summarize(transcript)
+
+    await repository.save(summary_entity)
+
+    return ModelResponse(SummaryResponse.from_entity(summary_entity))
+
 
 @router.get(
     "/get_summary_and_ctas",
@@ -30,6 +92,7 @@ router = APIRouter(prefix="/summary_maker", tags=["summary_maker"])
         "The summary is designed to encapsulate the key ideas, while the CTAs are actionable recommendations "
         "or next steps derived from the content."
     ),
+    dependencies=[Depends(use_interactive_lane)],
 )
 async def get_summary_and_ctas(
     text_to_summary: TextToSummary = Query(
@@ -37,22 +100,106 @@ async def get_summary_and_ctas(
         description="The transcript text to analyze",
         example="This is a sample transcript discussing project goals...",
     ),
-    llm: LLm = Depends(get_llm_service_openai),
+    summarizer: TranscriptSummarizer = Depends(get_summarizer),
     repository: SummaryRepository = Depends(get_summary_repository),
-) -> SummaryResponse:
-    llm_result = llm.run_completion(
-        SYSTEM_PROMPT,
-        RAW_USER_PROMPT.format(transcript=str(text_to_summary)),
-        dto=SummaryLLMOutput,
-    )
+) -> ModelResponse:
+    return await _summarize_and_store(str(text_to_summary), summarizer, repository)
 
-    summary_entity = Summary(
-        id=str(uuid4()), content=llm_result.content, ctas=llm_result.ctas
-    )
 
-    repository.save(summary_entity)
+@router.post(
+    "/get_summary_and_ctas",
+    response_model=SummaryResponse,
+    summary="Gets the summary and CTAs for a text sent in the request body.",
+    description=(
+        "Same as the GET endpoint, with the transcript in the body instead of the URL, so that long transcripts "
+        "are not cut by URL length limits or written to access logs. Send either a JSON `SummaryRequest` or the "
+        "raw transcript as `text/plain`. The body may be compressed with `Content-Encoding: gzip` (or `zstd` "
+        "when the server has the zstandard package)."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": SummaryRequest.model_json_schema()},
+                "text/plain": {"schema": {"type": "string", "minLength": 10}},
+            },
+        }
+    },
+    dependencies=[Depends(use_interactive_lane)],
+)
+async def post_summary_and_ctas(
+    transcript: str = Depends(_transcript_from_body),
+    summarizer: TranscriptSummarizer = Depends(get_summarizer),
+    repository: SummaryRepository = Depends(get_summary_repository),
+) -> ModelResponse:
+    return await _summarize_and_store(transcript, summarizer, repository)
+
+
+@router.get(
+    "/get_summary_and_ctas/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in _STREAM_MEDIA_TYPES.values()},
+            "description": "SummaryStreamEvent items, ending with a summary or an error.",
+        }
+    },
+    summary="Stream the summary and CTAs for a given text while they are generated.",
+    description=(
+        "Streaming variant of `get_summary_and_ctas`. The summary text is sent in `content` events as the LLM "
+        "writes it and each CTA in a `cta` event as soon as it is complete, either as newline-delimited JSON "
+        "(`format=ndjson`) or as Server-Sent Events (`format=sse`). The last event is the stored `summary`, "
+        "with its ID, or an `error`. Closing the connection cancels the LLM call."
+    ),
+    dependencies=[Depends(use_interactive_lane)],
+)
+async def stream_summary_and_ctas(
+    text_to_summary: TextToSummary = Query(
+        ...,
+        description="The transcript text to analyze",
+        example="This is a sample transcript discussing project goals...",
+    ),
+    output_format: Literal["ndjson", "sse"] = Query("ndjson", alias="format"),
+    summarizer: TranscriptSummarizer = Depends(get_summarizer),
+    repository: SummaryRepository = Depends(get_summary_repository),
+    scheduler: LLMScheduler | None = Depends(get_llm_scheduler),
+) -> StreamingResponse:
+    # Shed before the response starts, while a status code can still say so.
+    if scheduler is not None:
+        scheduler.admit(current_call_context())
+
+    async def stream_events():
+        ctas = 0
+        try:
+            async with aclosing(
+                summarizer.summarize_stream(str(text_to_summary))
+            ) as pieces:
+                async for piece in pieces:
+                    if isinstance(piece, SummaryDelta):
+                        if piece.cta is None:
+                            event = SummaryStreamEvent(
+                                type="content", content=piece.content
+                            )
+                        else:
+                            event = SummaryStreamEvent(
+                                type="cta", cta=piece.cta, index=ctas
+                            )
+                            ctas += 1
+                    else:
+                        await repository.save(piece)
+                        event = SummaryStreamEvent(
+                            type="summary", summary=SummaryResponse.from_entity(piece)
+                        )
+                    yield _stream_line(
+                        event.model_dump_json(exclude_none=True), output_format
+                    )
+        except Exception as exc:
+            event = SummaryStreamEvent(type="error", error=str(exc))
+            yield _stream_line(event.model_dump_json(exclude_none=True), output_format)
 
-    return SummaryResponse.from_entity(summary_entity)
+    return StreamingResponse(
+        stream_events(), media_type=_STREAM_MEDIA_TYPES[output_format]
+    )
 
 
 @router.get(
@@ -62,17 +209,26 @@ async def get_summary_and_ctas(
     description=(
         "Fetches a previously generated summary and its associated calls to action (CTAs) "
         "using the provided summary ID. This endpoint allows consumers to retrieve the summary content "
-        "and actionable CTAs for a specific document or text that was processed earlier and stored in the repository."
+        "and actionable CTAs for a specific document or text that was processed earlier and stored in the repository. "
+        "Summaries never change once stored, so responses carry a strong ETag and a long-lived Cache-Control header; "
+        "send the ETag back in If-None-Match to get a 304 without the body."
     ),
+    responses={304: {"description": "The summary matches the If-None-Match ETag"}},
 )
 async def get_summary_and_ctas_by_id(
-    id: str, repository: SummaryRepository = Depends(get_summary_repository)
-) -> Summary:
-    summary = repository.get_by_id(id)
+    id: str,
+    request: Request,
+    repository: SummaryRepository = Depends(get_summary_repository),
+    cache: SummaryResponseCache = Depends(get_summary_response_cache),
+) -> Response:
+    rendered = await cache.get(id, repository)
 
-    if summary is None:
+    if rendered is None:
         raise HTTPException(status_code=404, detail="Summary not found")
-    return summary
+    headers = {"ETag": rendered.etag, "Cache-Control": cache.cache_control}
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(rendered.body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -84,29 +240,24 @@ async def get_summary_and_ctas_by_id(
         "using the LLM service. Instead of handling requests one by one, this endpoint allows multiple texts to be summarized in parallel, "
         "returning a list of structured summary responses. Each response contains the summary and associated CTAs for the corresponding input text."
     ),
+    dependencies=[Depends(use_batch_lane)],
 )
 async def async_single_get_summary_and_ctas(
     list_of_texts_to_summarize: list[TextToSummary],
-    llm: LLm = Depends(get_llm_service_openai),
+    summarizer: TranscriptSummarizer = Depends(get_summarizer),
     repository: SummaryRepository = Depends(get_summary_repository),
-) -> BatchSummaryResponse:
-    async def process_one_request(text_to_summarize: TextToSummary) -> Summary:
-        llm_result = await llm.run_completion_async(
-            SYSTEM_PROMPT,
-            RAW_USER_PROMPT.format(transcript=str(text_to_summarize)),
-            dto=SummaryLLMOutput,
-        )
-
-        summary_entity = Summary(
-            id=str(uuid4()), content=llm_result.content, ctas=llm_result.ctas
-        )
-
-        repository.save(summary_entity)
-
-        return summary_entity
-
-    tasks = [process_one_request(item) for item in list_of_texts_to_summarize]
+    scheduler: LLMScheduler | None = Depends(get_llm_scheduler),
+) -> ModelResponse:
+    _BATCH_SIZE.observe(len(list_of_texts_to_summarize))
+    # Shed the whole batch up front rather than failing its items one by one.
+    if scheduler is not None:
+        scheduler.admit(current_call_context(), len(list_of_texts_to_summarize))
+    tasks = [summarizer.summarize(str(item)) for item in list_of_texts_to_summarize]
     raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+    # One round trip for the whole batch on backends that support pipelining.
+    await repository.save_many(
+        [result for result in raw_results if isinstance(result, Summary)]
+    )
     items: list[BatchSummaryItem] = []
     for result in raw_results:
         if isinstance(result, BaseException):
@@ -114,4 +265,65 @@ async def async_single_get_summary_and_ctas(
         else:
             items.append(BatchSummaryItem(summary=SummaryResponse.from_entity(result)))
 
-    return BatchSummaryResponse(items=items)
+    return ModelResponse(BatchSummaryResponse(items=items))
+
+
+@router.post(
+    "/async_get_summary_and_ctas/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in _STREAM_MEDIA_TYPES.values()},
+            "description": "One BatchSummaryStreamItem per input, in completion order.",
+        }
+    },
+    summary="Stream summaries and CTAs for a batch of texts as each one completes.",
+    description=(
+        "Streaming variant of the batch endpoint. Every input is processed concurrently and each result is written "
+        "as soon as it is ready, either as newline-delimited JSON (`format=ndjson`) or as Server-Sent Events "
+        "(`format=sse`). Results arrive in completion order and carry the `index` of their input text. "
+        "Summaries are stored as they complete, and closing the connection cancels the remaining work."
+    ),
+    dependencies=[Depends(use_batch_lane)],
+)
+async def stream_get_summary_and_ctas(
+    list_of_texts_to_summarize: list[TextToSummary],
+    output_format: Literal["ndjson", "sse"] = Query("ndjson", alias="format"),
+    summarizer: TranscriptSummarizer = Depends(get_summarizer),
+    repository: SummaryRepository = Depends(get_summary_repository),
+    scheduler: LLMScheduler | None = Depends(get_llm_scheduler),
+) -> StreamingResponse:
+    _STREAM_BATCH_SIZE.observe(len(list_of_texts_to_summarize))
+    if scheduler is not None:
+        scheduler.admit(current_call_context(), len(list_of_texts_to_summarize))
+
+    async def process_one_request(
+        index: int, text_to_summarize: str
+    ) -> BatchSummaryStreamItem:
+        try:
+            summary_entity = await summarizer.summarize(text_to_summarize)
+            await repository.save(summary_entity)
+        except Exception as exc:
+            return BatchSummaryStreamItem(index=index, error=str(exc))
+        return BatchSummaryStreamItem(
+            index=index, summary=SummaryResponse.from_entity(summary_entity)
+        )
+
+    async def stream_items():
+        tasks = [
+            asyncio.create_task(process_one_request(index, str(item)))
+            for index, item in enumerate(list_of_texts_to_summarize)
+        ]
+        try:
+            for next_item in asyncio.as_completed(tasks):
+                payload = (await next_item).model_dump_json()
+                yield _stream_line(payload, output_format)
+        finally:
+            # Runs when the client disconnects as well: stop paying for results
+            # nobody will read.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        stream_items(), media_type=_STREAM_MEDIA_TYPES[output_format]
+    )
@@ -6,3 +6,13 @@ class SummaryLLMOutput(BaseModel):
     ctas: list[str] = Field(
         examples=["1) First call to action 2) Second call to action"]
     )
+
+
+class PackedSummaryLLMOutput(SummaryLLMOutput):
+    transcript_id: int = Field(examples=[1])
+
+
+class PackedSummariesLLMOutput(BaseModel):
+    """Several transcripts summarized in one call, one item per transcript."""
+
+    items: list[PackedSummaryLLMOutput]
@@ -1,5 +1,11 @@
 from typing import Annotated
 
-from pydantic import StringConstraints
+from pydantic import BaseModel, Field, StringConstraints
 
 TextToSummary = Annotated[str, StringConstraints(strip_whitespace=True, min_length=10)]
+
+
+class SummaryRequest(BaseModel):
+    text_to_summary: TextToSummary = Field(
+        examples=["This is a sample transcript discussing project goals..."]
+    )
@@ -1,6 +1,32 @@
+import time
+from typing import Any, Literal
+
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from app.domain.entities import Summary
+from app.domain.entities import Job, JobStatus, Summary
+from app.metrics import STAGE_DURATION
+
+_FROM_ENTITY_STAGE = STAGE_DURATION.labels("summary_response_from_entity")
+_RENDER_STAGE = STAGE_DURATION.labels("response_render")
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core straight from a response model.
+
+    Returning it skips FastAPI's validation of the model against
+    ``response_model`` and its round trip through Python dicts and
+    ``json.dumps``, which dominate the CPU time of large batch responses.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if not isinstance(content, BaseModel):
+            return super().render(content)
+        started = time.perf_counter()
+        body = content.model_dump_json().encode("utf-8")
+        _RENDER_STAGE.observe(time.perf_counter() - started)
+        return body
 
 
 class SummaryResponse(BaseModel):
@@ -12,7 +38,46 @@ class SummaryResponse(BaseModel):
 
     @classmethod
     def from_entity(cls, entity: Summary):
-        return cls(id=entity.id, summary=entity.content, ctas=entity.ctas)
+        started = time.perf_counter()
+        response = cls(id=entity.id, summary=entity.content, ctas=entity.ctas)
+        _FROM_ENTITY_STAGE.observe(time.perf_counter() - started)
+        return response
+
+
+class SummaryStreamEvent(BaseModel):
+    """
+    One event of a streamed summary.
+
+    ``content`` events carry the next piece of the summary text and ``cta``
+    events one whole CTA with its ``index``. The stream ends with either a
+    ``summary`` event holding the stored summary or an ``error`` event.
+    """
+
+    type: Literal["content", "cta", "summary", "error"]
+    content: str | None = None
+    cta: str | None = None
+    index: int | None = None
+    summary: SummaryResponse | None = None
+    error: str | None = None
+
+
+class SummaryIdPageResponse(BaseModel):
+    """One page of summary IDs; ``next_cursor`` is null on the last page."""
+
+    ids: list[str] = Field(examples=[["123-abc", "456-def"]])
+    next_cursor: str | None = Field(examples=["1000"])
+
+
+class SummarySearchHit(BaseModel):
+    summary: SummaryResponse
+    score: float = Field(examples=[7.42])
+
+
+class SummarySearchResponse(BaseModel):
+    """One page of search hits, best first; ``next_cursor`` is null on the last page."""
+
+    items: list[SummarySearchHit]
+    next_cursor: str | None = Field(examples=["20"])
 
 
 class BatchSummaryItem(BaseModel):
@@ -22,6 +87,58 @@ class BatchSummaryItem(BaseModel):
     error: str | None = None
 
 
+class BatchSummaryStreamItem(BatchSummaryItem):
+    """Streamed batch item, tagged with the position of its input text."""
+
+    index: int = Field(examples=[0])
+
+
+class JobStatusResponse(BaseModel):
+    """Progress of a background summarization job."""
+
+    id: str = Field(examples=["123-abc"])
+    status: JobStatus = Field(examples=[JobStatus.RUNNING])
+    total: int = Field(examples=[1000])
+    completed: int = Field(examples=[420])
+    failed: int = Field(examples=[3])
+
+    @classmethod
+    def from_entity(cls, entity: Job):
+        return cls(
+            id=entity.id,
+            status=entity.status,
+            total=entity.total,
+            completed=entity.completed,
+            failed=entity.failed,
+        )
+
+
+class JobResultItem(BaseModel):
+    """Result of one job input, either a stored summary or an error."""
+
+    index: int = Field(examples=[0])
+    summary: SummaryResponse | None = None
+    error: str | None = None
+
+
+class JobResultsResponse(BaseModel):
+    """One page of job results; inputs still being processed are omitted."""
+
+    items: list[JobResultItem]
+    next_offset: int | None = Field(examples=[100])
+
+
+class LlmCacheStatsResponse(BaseModel):
+    """Counters of the content-addressed LLM cache since process start."""
+
+    hits: int = Field(examples=[42])
+    misses: int = Field(examples=[10])
+    coalesced: int = Field(examples=[3])
+    evictions: int = Field(examples=[0])
+    entries: int = Field(examples=[10])
+    bytes: int = Field(examples=[20480])
+
+
 class BatchSummaryResponse(BaseModel):
     """Batch response with one entry per input, preserving order."""
 
@@ -0,0 +1,159 @@
+import asyncio
+import contextlib
+import logging
+import time
+from uuid import uuid4
+
+from app.domain.entities import Job, JobItemResult, JobStatus
+from app.ports.job_repository import JobRepository
+from app.ports.summary_repository import SummaryRepository
+from app.services.scheduler import CallContext, set_call_context
+from app.services.summarizer import TranscriptSummarizer
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """
+    Processes submitted transcript batches in the background.
+
+    Jobs are queued by id and picked up by ``workers`` long-lived tasks; each
+    job runs at most ``item_concurrency`` LLM calls at a time. Every finished
+    item is saved to the summary repository and recorded on the job right
+    away, so partial results are readable while the job runs. On start, and
+    every ``lease_seconds`` after that, unfinished jobs are queued again and
+    only their items without a recorded result are processed.
+
+    A job only runs under a lease: the repository grants it to one worker at
+    a time, and the worker renews it every third of ``lease_seconds`` while
+    the job runs. Replicas sharing a repository thus resume each interrupted
+    job once, and pick up those of a replica that died once its lease ran
+    out. A job whose lease was lost is stopped.
+    """
+
+    def __init__(
+        self,
+        summarizer: TranscriptSummarizer,
+        job_repository: JobRepository,
+        summary_repository: SummaryRepository,
+        workers: int = 2,
+        item_concurrency: int = 8,
+        lease_seconds: float = 30.0,
+    ) -> None:
+        self._summarizer = summarizer
+        self._job_repository = job_repository
+        self._summary_repository = summary_repository
+        self._workers = workers
+        self._item_concurrency = item_concurrency
+        self._lease_seconds = lease_seconds
+        self._owner = str(uuid4())
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        # Jobs queued or running in this process.
+        self._local: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        await self._queue_unfinished()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._reclaim()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def submit(self, transcripts: list[str]) -> Job:
+        job = Job(id=str(uuid4()), total=len(transcripts), created_at=time.time())
+        await self._job_repository.create(job, transcripts)
+        self._enqueue(job.id)
+        return job
+
+    async def join(self) -> None:
+        """Waits until every queued job has been processed."""
+        await self._queue.join()
+
+    def _enqueue(self, job_id: str) -> None:
+        self._local.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def _queue_unfinished(self) -> None:
+        for job_id in await self._job_repository.list_unfinished():
+            if job_id not in self._local:
+                self._enqueue(job_id)
+
+    async def _reclaim(self) -> None:
+        while True:
+            await asyncio.sleep(self._lease_seconds)
+            try:
+                await self._queue_unfinished()
+            except Exception:
+                logger.exception("Could not list unfinished jobs")
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_leased(job_id)
+            except Exception:
+                # The job stays unfinished and is queued again later.
+                logger.exception("Job %s failed", job_id)
+            finally:
+                self._local.discard(job_id)
+                self._queue.task_done()
+
+    async def _run_leased(self, job_id: str) -> None:
+        repository = self._job_repository
+        if not await repository.acquire_lease(job_id, self._owner, self._lease_seconds):
+            logger.info("Job %s is leased by another worker", job_id)
+            return
+        run = asyncio.create_task(self._run_job(job_id))
+        try:
+            while not run.done():
+                await asyncio.wait({run}, timeout=self._lease_seconds / 3)
+                if run.done() or await repository.renew_lease(
+                    job_id, self._owner, self._lease_seconds
+                ):
+                    continue
+                logger.warning("Lost the lease on job %s, stopping it", job_id)
+                run.cancel()
+                await asyncio.wait({run})
+                return
+            await run
+        finally:
+            run.cancel()
+            await repository.release_lease(job_id, self._owner)
+
+    async def _run_job(self, job_id: str) -> None:
+        await self._job_repository.set_status(job_id, JobStatus.RUNNING)
+        # Jobs bound their own concurrency, so their calls queue rather than
+        # being shed, each job as its own client of the batch lane.
+        set_call_context(
+            CallContext(lane="batch", client=f"job:{job_id}", sheddable=False)
+        )
+        pending = iter(await self._job_repository.pending_items(job_id))
+
+        async def consume() -> None:
+            # Consumers share one iterator, so at most item_concurrency items
+            # of this job are in flight and no task is created per item.
+            for index, transcript in pending:
+                await self._process_item(job_id, index, transcript)
+
+        # A task group, so that a consumer failing to record a result stops
+        # the others before the lease is released.
+        async with asyncio.TaskGroup() as group:
+            for _ in range(self._item_concurrency):
+                group.create_task(consume())
+        await self._job_repository.set_status(job_id, JobStatus.COMPLETED)
+
+    async def _process_item(self, job_id: str, index: int, transcript: str) -> None:
+        try:
+            summary = await self._summarizer.summarize(transcript)
+            await self._summary_repository.save(summary)
+        except Exception as exc:
+            result = JobItemResult(index=index, error=str(exc))
+        else:
+            result = JobItemResult(index=index, summary_id=summary.id)
+        await self._job_repository.record_result(job_id, result)
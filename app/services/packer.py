@@ -0,0 +1,231 @@
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from typing import cast
+
+from app.adapters.cached import CachedLLm
+from app.metrics import PACKED_BATCH_SIZE, PACKED_ITEM_RETRIES
+from app.ports.llm import LLm
+from app.prompts import (
+    PACKED_TRANSCRIPT,
+    RAW_PACKED_USER_PROMPT,
+    RAW_USER_PROMPT,
+    SYSTEM_PROMPT,
+)
+from app.schemas.llm_responses import PackedSummariesLLMOutput, SummaryLLMOutput
+from app.services.scheduler import (
+    CallContext,
+    Lane,
+    current_call_context,
+    set_call_context,
+)
+
+_PACKED_BATCH_SIZE = PACKED_BATCH_SIZE.labels()
+_PACKED_ITEM_RETRIES = PACKED_ITEM_RETRIES.labels()
+
+
+@dataclass
+class _PendingTranscript:
+    transcript: str
+    tokens: int
+    future: asyncio.Future = field(repr=False)
+
+
+@dataclass
+class _Queue:
+    """Transcripts waiting to be packed, all for the same ``context``."""
+
+    context: CallContext
+    pending: list[_PendingTranscript] = field(default_factory=list)
+    tokens: int = 0
+    flush_handle: asyncio.TimerHandle | None = None
+
+
+class TranscriptPacker:
+    """
+    Packs short transcripts that arrive close together into one LLM call.
+
+    A transcript waits at most ``window_seconds`` for others to join it; the
+    batch is sent earlier once it holds ``max_transcripts`` transcripts or
+    ``max_prompt_tokens`` estimated tokens. The system prompt and the per-call
+    overhead are then paid once per batch instead of once per transcript, at
+    the cost of up to one window of added latency. Items the model leaves
+    out, duplicates or returns empty are summarized again one by one. A batch
+    of one is sent with the regular single-transcript prompt.
+
+    Transcripts are only packed with others of the same scheduler lane and
+    sheddability, and each batch is sent under a CallContext of its own for
+    that lane, not that of whichever request happened to send it.
+
+    With a ``cache``, each transcript is looked up and its summary stored
+    under the key of its single-transcript prompt, so packed and unpacked
+    calls share cached summaries. Calls then go to ``llm`` directly, meant to
+    be the LLm behind the cache: packed prompts are never asked twice.
+
+    Meant to be created once per process, so that concurrent requests share
+    batches.
+    """
+
+    def __init__(
+        self,
+        llm: LLm,
+        window_seconds: float = 0.02,
+        max_transcripts: int = 16,
+        max_prompt_tokens: int = 6_000,
+        max_transcript_chars: int = 4_000,
+        chars_per_token: float = 4.0,
+        cache: CachedLLm | None = None,
+    ) -> None:
+        self._llm = llm
+        self._cache = cache
+        self._window_seconds = window_seconds
+        self._max_transcripts = max_transcripts
+        self._max_prompt_tokens = max_prompt_tokens
+        self._max_transcript_chars = max_transcript_chars
+        self._chars_per_token = chars_per_token
+        self._queues: dict[tuple[Lane, bool], _Queue] = {}
+        self._batches: set[asyncio.Task] = set()
+
+    def accepts(self, transcript: str) -> bool:
+        """Whether ``transcript`` is short enough to be packed with others."""
+        return len(transcript) <= self._max_transcript_chars
+
+    async def summarize(self, transcript: str) -> SummaryLLMOutput:
+        if self._cache is not None:
+            cached = self._cache.lookup(
+                SYSTEM_PROMPT,
+                RAW_USER_PROMPT.format(transcript=transcript),
+                SummaryLLMOutput,
+            )
+            if cached is not None:
+                return cast(SummaryLLMOutput, cached)
+        tokens = int(len(transcript) / self._chars_per_token) + 1
+        queue = self._queue(current_call_context())
+        if queue.pending and (queue.tokens + tokens > self._max_prompt_tokens):
+            self._flush(queue)
+        pending = _PendingTranscript(
+            transcript, tokens, asyncio.get_running_loop().create_future()
+        )
+        queue.pending.append(pending)
+        queue.tokens += tokens
+        if len(queue.pending) >= self._max_transcripts:
+            self._flush(queue)
+        elif queue.flush_handle is None:
+            queue.flush_handle = asyncio.get_running_loop().call_later(
+                self._window_seconds, self._flush, queue
+            )
+        return await pending.future
+
+    async def aclose(self) -> None:
+        """Sends whatever is still waiting and lets running batches finish."""
+        for queue in self._queues.values():
+            self._flush(queue)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    def _queue(self, context: CallContext) -> _Queue:
+        key = (context.lane, context.sheddable)
+        queue = self._queues.get(key)
+        if queue is None:
+            # A packed call carries transcripts of several clients.
+            queue = self._queues[key] = _Queue(
+                CallContext(
+                    lane=context.lane, client="packer", sheddable=context.sheddable
+                )
+            )
+        return queue
+
+    def _flush(self, queue: _Queue) -> None:
+        if queue.flush_handle is not None:
+            queue.flush_handle.cancel()
+            queue.flush_handle = None
+        batch = [pending for pending in queue.pending if not pending.future.done()]
+        queue.pending = []
+        queue.tokens = 0
+        if not batch:
+            return
+        context = contextvars.copy_context()
+        context.run(set_call_context, queue.context)
+        task = asyncio.create_task(self._run_batch(batch), context=context)
+        # The loop only keeps weak references to tasks.
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: list[_PendingTranscript]) -> None:
+        _PACKED_BATCH_SIZE.observe(len(batch))
+        if len(batch) == 1:
+            await self._run_single(batch[0])
+            return
+
+        try:
+            packed = await self._llm.run_completion_async(
+                SYSTEM_PROMPT,
+                RAW_PACKED_USER_PROMPT.format(
+                    transcripts="\n\n".join(
+                        PACKED_TRANSCRIPT.format(
+                            transcript_id=transcript_id, transcript=pending.transcript
+                        )
+                        for transcript_id, pending in enumerate(batch, start=1)
+                    )
+                ),
+                dto=PackedSummariesLLMOutput,
+            )
+        except Exception as exc:
+            for pending in batch:
+                _set_exception(pending.future, exc)
+            return
+
+        items: dict[int, SummaryLLMOutput] = {}
+        duplicated: set[int] = set()
+        for item in cast(PackedSummariesLLMOutput, packed).items:
+            if item.transcript_id in items:
+                duplicated.add(item.transcript_id)
+            items[item.transcript_id] = SummaryLLMOutput(
+                content=item.content, ctas=item.ctas
+            )
+
+        retries = []
+        for transcript_id, pending in enumerate(batch, start=1):
+            summary = items.get(transcript_id)
+            if (
+                summary is None
+                or transcript_id in duplicated
+                or not summary.content.strip()
+            ):
+                retries.append(pending)
+            else:
+                self._resolve(pending, summary)
+        if retries:
+            _PACKED_ITEM_RETRIES.inc(len(retries))
+            await asyncio.gather(*(self._run_single(pending) for pending in retries))
+
+    async def _run_single(self, pending: _PendingTranscript) -> None:
+        if pending.future.done():
+            return
+        try:
+            result = await self._llm.run_completion_async(
+                SYSTEM_PROMPT,
+                RAW_USER_PROMPT.format(transcript=pending.transcript),
+                dto=SummaryLLMOutput,
+            )
+        except Exception as exc:
+            _set_exception(pending.future, exc)
+        else:
+            self._resolve(pending, cast(SummaryLLMOutput, result))
+
+    def _resolve(self, pending: _PendingTranscript, summary: SummaryLLMOutput) -> None:
+        if self._cache is not None:
+            self._cache.store(
+                SYSTEM_PROMPT,
+                RAW_USER_PROMPT.format(transcript=pending.transcript),
+                SummaryLLMOutput,
+                summary,
+            )
+        if not pending.future.done():
+            pending.future.set_result(summary)
+
+
+def _set_exception(future: asyncio.Future, exc: Exception) -> None:
+    # The caller may have been cancelled, e.g. by a client disconnect.
+    if not future.done():
+        future.set_exception(exc)
@@ -0,0 +1,307 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from contextlib import aclosing, asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Literal
+
+import pydantic
+
+from app.metrics import (
+    LLM_QUEUE_DEPTH,
+    LLM_QUEUE_WAIT,
+    LLM_SCHEDULER_IN_FLIGHT,
+    LLM_SHED,
+)
+from app.ports.llm import LLm
+
+Lane = Literal["interactive", "batch"]
+
+
+@dataclass(frozen=True)
+class CallContext:
+    """
+    Who an LLM call is made for, read by ScheduledLLm.
+
+    Calls that are not ``sheddable`` wait in their lane however long the
+    queue is; background work that bounds its own concurrency uses it.
+    """
+
+    lane: Lane = "interactive"
+    client: str = "anonymous"
+    sheddable: bool = True
+
+
+_CALL_CONTEXT: ContextVar[CallContext] = ContextVar(
+    "llm_call_context", default=CallContext()
+)
+
+
+def current_call_context() -> CallContext:
+    return _CALL_CONTEXT.get()
+
+
+def set_call_context(context: CallContext) -> None:
+    """Applies to the current task and to the tasks it creates afterwards."""
+    _CALL_CONTEXT.set(context)
+
+
+class OverloadedError(Exception):
+    """
+    A call or batch was turned away before queueing.
+
+    ``status_code`` is 429 when the client alone holds too much of its lane
+    and 503 when the lane as a whole is full; ``retry_after`` is the
+    estimated wait in seconds.
+    """
+
+    def __init__(self, status_code: int, retry_after: float, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class _Lane:
+    """Waiters of one lane, one FIFO per client, served round robin."""
+
+    def __init__(self, name: Lane, max_queue: int, max_wait: float) -> None:
+        self.name = name
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.size = 0
+        self._clients: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._depth = LLM_QUEUE_DEPTH.labels(name)
+        self._depth.set(0)
+        self.wait = LLM_QUEUE_WAIT.labels(name)
+
+    def queued(self, client: str) -> int:
+        waiters = self._clients.get(client)
+        return len(waiters) if waiters else 0
+
+    def push(self, client: str, waiter: asyncio.Future) -> None:
+        waiters = self._clients.get(client)
+        if waiters is None:
+            waiters = self._clients[client] = deque()
+        waiters.append(waiter)
+        self._resize(1)
+
+    def pop(self) -> asyncio.Future:
+        # The client served goes to the back of the rotation.
+        client, waiters = next(iter(self._clients.items()))
+        waiter = waiters.popleft()
+        if waiters:
+            self._clients.move_to_end(client)
+        else:
+            del self._clients[client]
+        self._resize(-1)
+        return waiter
+
+    def discard(self, client: str, waiter: asyncio.Future) -> None:
+        waiters = self._clients.get(client)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del self._clients[client]
+        self._resize(-1)
+
+    def _resize(self, change: int) -> None:
+        self.size += change
+        self._depth.set(self.size)
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls.
+
+    At most ``max_concurrency`` calls hold a slot at a time. Calls beyond
+    that wait in the interactive or the batch lane; when both have waiters,
+    slots go to ``interactive_weight`` interactive calls for each batch one,
+    so batch work slows down but never stops. Within a lane, clients are
+    served round robin, so a client queueing thousands of calls delays
+    others by one call each turn rather than by its whole backlog.
+
+    A call or batch is shed instead of queued when its lane would exceed
+    ``max_queue`` calls or an estimated wait of ``max_wait`` seconds (503),
+    or when its client would hold more than ``max_queued_per_client`` of the
+    lane (429). The estimate is the queue ahead times the moving average of
+    slot hold times, divided by the slots the lane can count on.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        interactive_weight: int = 4,
+        interactive_max_queue: int = 256,
+        batch_max_queue: int = 4096,
+        interactive_max_wait: float = 10.0,
+        batch_max_wait: float = 300.0,
+        max_queued_per_client: int = 1024,
+        initial_service_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._interactive_weight = interactive_weight
+        self._max_queued_per_client = max_queued_per_client
+        self._service_seconds = initial_service_seconds
+        self._clock = clock
+        self._lanes: dict[Lane, _Lane] = {
+            "interactive": _Lane(
+                "interactive", interactive_max_queue, interactive_max_wait
+            ),
+            "batch": _Lane("batch", batch_max_queue, batch_max_wait),
+        }
+        self._in_flight = 0
+        self._interactive_streak = 0
+        self._in_flight_gauge = LLM_SCHEDULER_IN_FLIGHT.labels()
+        self._in_flight_gauge.set(0)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def queue_depth(self, lane: Lane) -> int:
+        return self._lanes[lane].size
+
+    def estimated_wait(self, lane: Lane, calls: int = 1) -> float:
+        """Seconds the last of ``calls`` new calls in ``lane`` would wait."""
+        own = self._lanes[lane]
+        other = self._lanes["batch" if lane == "interactive" else "interactive"]
+        # Slots are only ever free while both lanes are empty.
+        ahead = own.size + calls - max(0, self._max_concurrency - self._in_flight)
+        if ahead <= 0:
+            return 0.0
+        slots = float(self._max_concurrency)
+        if other.size:
+            weight = self._interactive_weight
+            slots *= (
+                weight / (weight + 1) if lane == "interactive" else 1 / (weight + 1)
+            )
+        return ahead * self._service_seconds / slots
+
+    def admit(self, context: CallContext, calls: int = 1) -> None:
+        """Raises OverloadedError when ``calls`` new calls should be shed."""
+        lane = self._lanes[context.lane]
+        wait = self.estimated_wait(context.lane, calls)
+        if wait == 0.0:
+            return
+        retry_after = max(1.0, wait)
+        if lane.queued(context.client) + calls > self._max_queued_per_client:
+            LLM_SHED.labels(lane.name, "client").inc()
+            raise OverloadedError(
+                429, retry_after, "Too many queued requests for this client."
+            )
+        if lane.size + calls > lane.max_queue:
+            LLM_SHED.labels(lane.name, "queue_full").inc()
+            raise OverloadedError(503, retry_after, "Server overloaded.")
+        if wait > lane.max_wait:
+            LLM_SHED.labels(lane.name, "wait").inc()
+            raise OverloadedError(503, retry_after, "Server overloaded.")
+
+    @asynccontextmanager
+    async def slot(self, context: CallContext) -> AsyncIterator[None]:
+        await self.acquire(context)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.release(self._clock() - started)
+
+    async def acquire(self, context: CallContext) -> None:
+        """Waits for a slot; every successful call needs a matching release."""
+        lane = self._lanes[context.lane]
+        if self._in_flight < self._max_concurrency and not self._waiting():
+            self._grant()
+            lane.wait.observe(0.0)
+            return
+        if context.sheddable:
+            self.admit(context)
+        waiter = asyncio.get_running_loop().create_future()
+        lane.push(context.client, waiter)
+        queued_at = self._clock()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation landed.
+                self.release()
+            else:
+                lane.discard(context.client, waiter)
+            raise
+        lane.wait.observe(self._clock() - queued_at)
+
+    def release(self, service_seconds: float | None = None) -> None:
+        """``service_seconds`` is how long the slot was held, if it was used."""
+        if service_seconds is not None:
+            self._service_seconds += 0.1 * (service_seconds - self._service_seconds)
+        self._in_flight -= 1
+        self._in_flight_gauge.set(self._in_flight)
+        self._dispatch()
+
+    def _grant(self) -> None:
+        self._in_flight += 1
+        self._in_flight_gauge.set(self._in_flight)
+
+    def _waiting(self) -> bool:
+        return any(lane.size for lane in self._lanes.values())
+
+    def _dispatch(self) -> None:
+        interactive, batch = self._lanes["interactive"], self._lanes["batch"]
+        while self._in_flight < self._max_concurrency:
+            if interactive.size and (
+                not batch.size or self._interactive_streak < self._interactive_weight
+            ):
+                waiter = interactive.pop()
+                self._interactive_streak += 1
+            elif batch.size:
+                waiter = batch.pop()
+                self._interactive_streak = 0
+            else:
+                return
+            if not waiter.done():
+                self._grant()
+                waiter.set_result(None)
+
+
+class ScheduledLLm(LLm):
+    """
+    Admits the async completions of another LLm through an LLMScheduler.
+
+    The lane and client come from the CallContext of the calling task, and a
+    streamed call holds its slot until the last chunk. The synchronous path
+    is passed through untouched.
+    """
+
+    def __init__(self, llm: LLm, scheduler: LLMScheduler) -> None:
+        self._llm = llm
+        self._scheduler = scheduler
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        return self._llm.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        async with self._scheduler.slot(current_call_context()):
+            return await self._llm.run_completion_async(system_prompt, user_prompt, dto)
+
+    async def stream_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> AsyncGenerator[str, None]:
+        async with self._scheduler.slot(current_call_context()):
+            async with aclosing(
+                self._llm.stream_completion(system_prompt, user_prompt, dto)
+            ) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+
+    async def warm_up(self, connections: int = 1) -> None:
+        await self._llm.warm_up(connections)
+
+    async def aclose(self) -> None:
+        await self._llm.aclose()
@@ -0,0 +1,123 @@
+import json
+import re
+from dataclasses import dataclass
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+@dataclass(frozen=True)
+class StreamedField:
+    """A new piece of a top-level string field, or one whole item of a list field."""
+
+    field: str
+    text: str
+
+
+class StructuredOutputReader:
+    """
+    Reads the JSON object of a structured completion while it is streamed.
+
+    Text of top-level string fields is reported as soon as it arrives, and
+    each string item of a top-level list once its closing quote does. Any
+    other value is skipped. The reader does not validate: the joined chunks
+    are still parsed as a whole once the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._containers: list[str] = []
+        self._expect_key = False
+        self._field: str | None = None
+        self._in_string = False
+        self._string_role: str | None = None
+        self._raw = ""
+        self._escaping = False
+        self._escape_start: int | None = None
+        self._decoded = 0
+
+    def feed(self, chunk: str) -> list[StreamedField]:
+        events: list[StreamedField] = []
+        index, length = 0, len(chunk)
+        while index < length:
+            if self._in_string:
+                if self._escaping:
+                    self._raw += chunk[index]
+                    self._escaping = False
+                    index += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, index)
+                end = length if match is None else match.start()
+                self._raw += chunk[index:end]
+                index = end
+                if match is None:
+                    break
+                index += 1
+                if match.group() == "\\":
+                    self._escape_start = len(self._raw)
+                    self._raw += "\\"
+                    self._escaping = True
+                else:
+                    self._end_string(events)
+                continue
+
+            char = chunk[index]
+            index += 1
+            if char == '"':
+                self._start_string()
+            elif char in "{[":
+                self._containers.append(char)
+                self._expect_key = char == "{" and len(self._containers) == 1
+            elif char in "}]":
+                self._containers.pop()
+            elif char == ":":
+                self._expect_key = False
+            elif char == "," and self._containers == ["{"]:
+                self._expect_key = True
+
+        if self._in_string and self._string_role == "value":
+            self._report_text(events, final=False)
+        return events
+
+    def _start_string(self) -> None:
+        self._in_string = True
+        self._raw = ""
+        self._escape_start = None
+        self._decoded = 0
+        if self._containers == ["{"]:
+            self._string_role = "key" if self._expect_key else "value"
+        elif len(self._containers) == 2 and self._containers[-1] == "[":
+            self._string_role = "item"
+        else:
+            self._string_role = None
+
+    def _end_string(self, events: list[StreamedField]) -> None:
+        self._in_string = False
+        if self._string_role == "key":
+            self._field = self._decode(self._raw)
+        elif self._string_role == "value":
+            self._report_text(events, final=True)
+        elif self._string_role == "item" and self._field is not None:
+            events.append(StreamedField(self._field, self._decode(self._raw)))
+
+    def _report_text(self, events: list[StreamedField], final: bool) -> None:
+        end = len(self._raw)
+        start = self._escape_start
+        if not final and start is not None and start >= self._decoded:
+            # Hold back an escape sequence that is still being streamed.
+            escape = self._raw[start:]
+            if len(escape) < (6 if escape[1:2] == "u" else 2):
+                end = start
+        if end <= self._decoded:
+            return
+        text = self._decode(self._raw[self._decoded : end])
+        if not final and "\ud800" <= text[-1:] <= "\udbff":
+            # The first half of a surrogate pair waits for the second: both
+            # have to be decoded together. Its escape is the last 6 chars.
+            text = text[:-1]
+            end -= 6
+        if text and self._field is not None:
+            events.append(StreamedField(self._field, text))
+        self._decoded = end
+
+    @staticmethod
+    def _decode(raw: str) -> str:
+        return json.loads(f'"{raw}"')
@@ -0,0 +1,201 @@
+import asyncio
+import re
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from typing import cast
+from uuid import uuid4
+
+from app.domain.entities import Summary, SummaryDelta
+from app.ports.llm import LLm
+from app.prompts import (
+    RAW_CHUNK_USER_PROMPT,
+    RAW_REDUCE_USER_PROMPT,
+    RAW_USER_PROMPT,
+    SYSTEM_PROMPT,
+)
+from app.schemas.llm_responses import SummaryLLMOutput
+from app.services.packer import TranscriptPacker
+from app.services.structured_stream import StructuredOutputReader
+
+# "Mark Foster | MCC, ACTC: Hey there..." starts a new speaker turn.
+_SPEAKER_TURN = re.compile(r"^[^\n:]{1,80}:\s")
+
+
+def split_transcript(transcript: str, max_chars: int) -> list[str]:
+    """
+    Splits a transcript into chunks of at most ``max_chars`` characters.
+
+    Chunks are cut on speaker turns (lines starting with ``Speaker:``), so a
+    turn is only broken up when it alone is longer than ``max_chars``; in that
+    case it is cut on whitespace.
+    """
+    turns: list[str] = []
+    for line in transcript.splitlines():
+        if not line.strip():
+            continue
+        if turns and not _SPEAKER_TURN.match(line):
+            turns[-1] = f"{turns[-1]}\n{line}"
+        else:
+            turns.append(line)
+
+    chunks: list[str] = []
+    current = ""
+    for turn in turns:
+        for piece in _split_long_turn(turn, max_chars):
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if len(candidate) <= max_chars:
+                current = candidate
+                continue
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_long_turn(turn: str, max_chars: int) -> list[str]:
+    pieces = []
+    while len(turn) > max_chars:
+        cut = turn.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(turn[:cut].rstrip())
+        turn = turn[cut:].lstrip()
+    pieces.append(turn)
+    return pieces
+
+
+def deduplicate_ctas(ctas: list[str]) -> list[str]:
+    """Drops repeated CTAs, comparing case- and whitespace-insensitively."""
+    seen: set[str] = set()
+    unique = []
+    for cta in ctas:
+        key = " ".join(cta.lower().split()).rstrip(".")
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(cta)
+    return unique
+
+
+class EmptyTranscriptError(ValueError):
+    """The transcript holds nothing but whitespace."""
+
+
+class TranscriptSummarizer:
+    """
+    Turns a transcript into a Summary through the LLM.
+
+    Transcripts longer than ``long_transcript_chars`` go through map-reduce:
+    they are split into chunks of ``chunk_chars`` on speaker turns, the chunks
+    are summarized concurrently, and one last call merges the partial
+    summaries. Latency then follows the slowest chunk instead of the total
+    transcript length. With a ``packer``, short transcripts are instead
+    summarized together with others that arrive at the same time.
+    """
+
+    def __init__(
+        self,
+        llm: LLm,
+        long_transcript_chars: int | None = None,
+        chunk_chars: int = 16_000,
+        packer: TranscriptPacker | None = None,
+    ) -> None:
+        self._llm = llm
+        self._long_transcript_chars = long_transcript_chars
+        self._chunk_chars = chunk_chars
+        self._packer = packer
+
+    async def summarize(self, transcript: str) -> Summary:
+        if (
+            self._long_transcript_chars is not None
+            and len(transcript) > self._long_transcript_chars
+        ):
+            llm_result = await self._map_reduce(transcript)
+        elif self._packer is not None and self._packer.accepts(transcript):
+            llm_result = await self._packer.summarize(transcript)
+        else:
+            llm_result = await self._complete(
+                RAW_USER_PROMPT.format(transcript=transcript)
+            )
+
+        return Summary(
+            id=str(uuid4()), content=llm_result.content, ctas=llm_result.ctas
+        )
+
+    async def summarize_stream(
+        self, transcript: str
+    ) -> AsyncGenerator[SummaryDelta | Summary, None]:
+        """
+        Yields the summary in SummaryDelta pieces as the LLM writes it, then the Summary.
+
+        Long transcripts go through map-reduce and arrive in one piece. Packing
+        is skipped: waiting for other transcripts would delay the first piece.
+        """
+        if (
+            self._long_transcript_chars is not None
+            and len(transcript) > self._long_transcript_chars
+        ):
+            llm_result = await self._map_reduce(transcript)
+            yield SummaryDelta(content=llm_result.content)
+            for cta in llm_result.ctas:
+                yield SummaryDelta(cta=cta)
+        else:
+            reader = StructuredOutputReader()
+            chunks: list[str] = []
+            async with aclosing(
+                self._llm.stream_completion(
+                    SYSTEM_PROMPT,
+                    RAW_USER_PROMPT.format(transcript=transcript),
+                    dto=SummaryLLMOutput,
+                )
+            ) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    for field in reader.feed(chunk):
+                        if field.field == "content":
+                            yield SummaryDelta(content=field.text)
+                        elif field.field == "ctas":
+                            yield SummaryDelta(cta=field.text)
+            llm_result = SummaryLLMOutput.model_validate_json("".join(chunks))
+
+        yield Summary(id=str(uuid4()), content=llm_result.content, ctas=llm_result.ctas)
+
+    async def _map_reduce(self, transcript: str) -> SummaryLLMOutput:
+        chunks = split_transcript(transcript, self._chunk_chars)
+        if not chunks:
+            raise EmptyTranscriptError("The transcript has no text to summarize.")
+        partials = await asyncio.gather(
+            *(
+                self._complete(
+                    RAW_CHUNK_USER_PROMPT.format(
+                        part=part, parts=len(chunks), transcript=chunk
+                    )
+                )
+                for part, chunk in enumerate(chunks, start=1)
+            )
+        )
+        if len(partials) == 1:
+            return partials[0]
+
+        candidate_ctas = deduplicate_ctas(
+            [cta for partial in partials for cta in partial.ctas]
+        )
+        reduced = await self._complete(
+            RAW_REDUCE_USER_PROMPT.format(
+                summaries="\n\n".join(
+                    f"Part {part}: {partial.content}"
+                    for part, partial in enumerate(partials, start=1)
+                ),
+                ctas="\n".join(f"- {cta}" for cta in candidate_ctas),
+            )
+        )
+        return SummaryLLMOutput(
+            content=reduced.content, ctas=deduplicate_ctas(reduced.ctas)
+        )
+
+    async def _complete(self, user_prompt: str) -> SummaryLLMOutput:
+        result = await self._llm.run_completion_async(
+            SYSTEM_PROMPT, user_prompt, dto=SummaryLLMOutput
+        )
+        # LLm implementations return an instance of the requested dto.
+        return cast(SummaryLLMOutput, result)
@@ -0,0 +1,129 @@
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+
+import pydantic
+
+from app.domain.entities import Summary
+from app.metrics import STAGE_DURATION, SUMMARY_RESPONSE_CACHE_LOOKUPS
+from app.ports.summary_repository import SummaryRepository
+
+_SUMMARY_JSON: pydantic.TypeAdapter[Summary] = pydantic.TypeAdapter(Summary)
+_RENDER_STAGE = STAGE_DURATION.labels("summary_render")
+_HITS = SUMMARY_RESPONSE_CACHE_LOOKUPS.labels("hit")
+_MISSES = SUMMARY_RESPONSE_CACHE_LOOKUPS.labels("miss")
+# Rough per-entry bookkeeping cost (key, tuple, OrderedDict node, ETag) added
+# on top of the body size when enforcing the memory bound.
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+@dataclass(frozen=True)
+class RenderedSummary:
+    """A summary serialized as its JSON response body, with a strong ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float | None = None
+
+
+def render_summary(summary: Summary) -> RenderedSummary:
+    started = time.perf_counter()
+    body = _SUMMARY_JSON.dump_json(summary)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    _RENDER_STAGE.observe(time.perf_counter() - started)
+    return RenderedSummary(body=body, etag=etag)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class SummaryResponseCache:
+    """
+    LRU of rendered summary responses by id, in front of the repository.
+
+    A saved summary never changes, so its rendered body and ETag stay valid
+    for as long as the repository keeps it. Every hit is confirmed with the
+    repository's ``exists``, which is cheaper than a read and a render, so
+    summaries the repository has evicted or expired are never served; with
+    ``ttl_seconds`` (the repository's TTL) an entry is also dropped at most
+    that long after it was rendered. Beyond ``max_entries`` or ``max_bytes``
+    the least recently read entries are evicted. ``max_entries=0`` renders
+    every read.
+
+    ``cache_control`` is sent with every response and 304, so clients and
+    proxies keep summaries for ``max_age_seconds`` without asking again.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float | None = None,
+        max_age_seconds: int = 365 * 24 * 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, RenderedSummary] = OrderedDict()
+        self._bytes = 0
+        if ttl_seconds is not None:
+            max_age_seconds = min(max_age_seconds, int(ttl_seconds))
+        self.cache_control = f"public, max-age={max_age_seconds}, immutable"
+
+    async def get(
+        self, id: str, repository: SummaryRepository
+    ) -> RenderedSummary | None:
+        """The rendered summary ``id``, or None when the repository has no such id."""
+        rendered = self._entries.get(id)
+        if rendered is not None:
+            if (
+                rendered.expires_at is None or rendered.expires_at > self._clock()
+            ) and await repository.exists(id):
+                # Read again: a concurrent call may have removed it meanwhile.
+                if id in self._entries:
+                    self._entries.move_to_end(id)
+                _HITS.inc()
+                return rendered
+            if self._entries.get(id) is rendered:
+                self._remove(id)
+        _MISSES.inc()
+        summary = await repository.get_by_id(id)
+        if summary is None:
+            return None
+        rendered = render_summary(summary)
+        if self._max_entries > 0:
+            if self._ttl_seconds is not None:
+                rendered = replace(
+                    rendered, expires_at=self._clock() + self._ttl_seconds
+                )
+            self._store(id, rendered)
+        return rendered
+
+    def _store(self, id: str, rendered: RenderedSummary) -> None:
+        # A concurrent miss for the same id may have stored it meanwhile.
+        if id in self._entries:
+            self._remove(id)
+        self._entries[id] = rendered
+        self._bytes += len(rendered.body) + _ENTRY_OVERHEAD_BYTES
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, id: str) -> None:
+        rendered = self._entries.pop(id)
+        self._bytes -= len(rendered.body) + _ENTRY_OVERHEAD_BYTES
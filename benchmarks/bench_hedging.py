@@ -0,0 +1,106 @@
+"""
+Tail latency and extra calls of hedging against a heavy-tailed LLM backend.
+
+Sends ``--calls`` completions, ``--concurrency`` at a time, to two simulated
+backends with lognormal latency, once through the primary alone and once
+through HedgedLLm, which duplicates a call to the secondary when the primary
+has not answered by ``--percentile`` of its recent latencies. Run with:
+
+    python -m benchmarks.bench_hedging --calls 2000 --percentile 95
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import pydantic
+
+from app.adapters.fake import FakeLLMAdapter
+from app.adapters.hedged import HedgedLLm
+from app.ports.llm import LLm
+from app.schemas.llm_responses import SummaryLLMOutput
+
+
+class CallCounter(LLm):
+    """Counts the calls sent to the wrapped LLm, including cancelled ones."""
+
+    def __init__(self, llm: LLm) -> None:
+        self._llm = llm
+        self.calls = 0
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        self.calls += 1
+        return self._llm.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        self.calls += 1
+        return await self._llm.run_completion_async(system_prompt, user_prompt, dto)
+
+
+def backend(args: argparse.Namespace, seed: int) -> CallCounter:
+    return CallCounter(
+        FakeLLMAdapter(
+            latency_ms=args.median_ms,
+            latency_distribution="lognormal",
+            latency_spread=args.spread,
+            seed=seed,
+        )
+    )
+
+
+async def run(args: argparse.Namespace, llm: LLm, calls: list[CallCounter]) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await llm.run_completion_async("system", f"call {index}", SummaryLLMOutput)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(index) for index in range(args.calls)))
+    cuts = statistics.quantiles(latencies, n=1000)
+    return {
+        "backend_calls": sum(counter.calls for counter in calls),
+        "p50_ms": round(cuts[499] * 1000, 1),
+        "p99_ms": round(cuts[989] * 1000, 1),
+        "p999_ms": round(cuts[998] * 1000, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    primary = backend(args, seed=0)
+    single = await run(args, primary, [primary])
+
+    primary, secondary = backend(args, seed=0), backend(args, seed=1)
+    hedged_llm = HedgedLLm(
+        {"primary": primary, "secondary": secondary},
+        hedge_percentile=args.percentile,
+        hedge_min_delay=0.0,
+        hedge_max_delay=10 * args.median_ms / 1000,
+    )
+    hedged = await run(args, hedged_llm, [primary, secondary])
+    return {
+        "parameters": vars(args),
+        "single": single,
+        "hedged": hedged,
+        "extra_calls_percent": round(
+            100 * (hedged["backend_calls"] - args.calls) / args.calls, 1
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--median-ms", type=float, default=50)
+    parser.add_argument("--spread", type=float, default=0.8)
+    parser.add_argument("--percentile", type=float, default=95)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
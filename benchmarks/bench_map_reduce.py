@@ -0,0 +1,65 @@
+"""
+Wall-clock comparison of single-call and map-reduce summarization.
+
+The LLM is simulated: each call takes a fixed overhead plus a cost per prompt
+character, which is how a long prompt slows a real completion down. Run with:
+
+    python -m benchmarks.bench_map_reduce --transcript-chars 200000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.adapters.fake import FakeLLMAdapter
+from app.services.summarizer import TranscriptSummarizer, split_transcript
+from benchmarks.sample_transcript import TRANSCRIPT
+
+
+def build_transcript(chars: int) -> str:
+    repeats = chars // len(TRANSCRIPT) + 1
+    return "\n\n".join([TRANSCRIPT] * repeats)[:chars]
+
+
+async def measure(summarizer: TranscriptSummarizer, transcript: str) -> float:
+    started = time.perf_counter()
+    await summarizer.summarize(transcript)
+    return time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> dict:
+    transcript = build_transcript(args.transcript_chars)
+    single_llm = FakeLLMAdapter(
+        latency_ms=args.base_latency_ms, ms_per_prompt_char=args.ms_per_prompt_char
+    )
+    map_reduce_llm = FakeLLMAdapter(
+        latency_ms=args.base_latency_ms, ms_per_prompt_char=args.ms_per_prompt_char
+    )
+
+    single = await measure(TranscriptSummarizer(single_llm), transcript)
+    map_reduce = await measure(
+        TranscriptSummarizer(
+            map_reduce_llm, long_transcript_chars=0, chunk_chars=args.chunk_chars
+        ),
+        transcript,
+    )
+
+    return {
+        "transcript_chars": len(transcript),
+        "chunk_chars": args.chunk_chars,
+        "chunks": len(split_transcript(transcript, args.chunk_chars)),
+        "single_call_seconds": round(single, 4),
+        "map_reduce_seconds": round(map_reduce, 4),
+        "map_reduce_llm_calls": map_reduce_llm.calls,
+        "speedup": round(single / map_reduce, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transcript-chars", type=int, default=200_000)
+    parser.add_argument("--chunk-chars", type=int, default=16_000)
+    parser.add_argument("--base-latency-ms", type=float, default=500)
+    parser.add_argument("--ms-per-prompt-char", type=float, default=0.02)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -0,0 +1,119 @@
+"""
+Bytes per summary and get_by_id latency of the in-memory summary stores.
+
+Stores ``--summaries`` realistic summaries in the unbounded repository and in
+the bounded one with and without compression, measuring the memory they
+retain with tracemalloc, then times random reads. Run with:
+
+    python -m benchmarks.bench_memory_repository --summaries 20000
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from typing import Any
+
+from app.domain.entities import Summary
+from app.ports.summary_repository import SummaryRepository
+from app.repositories.in_memory import (
+    BoundedInMemorySummaryRepository,
+    InMemorySummaryRepository,
+)
+
+WORDS = (
+    "client coach goal quarter hiring roadmap feedback delegate team priority "
+    "deadline stakeholder budget review plan confidence meeting growth"
+).split()
+
+
+def build_summary(rng: random.Random, content_words: int) -> Summary:
+    content = " ".join(rng.choice(WORDS) for _ in range(content_words)) + "."
+    ctas = [
+        " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+        for _ in range(5)
+    ]
+    return Summary(
+        id=str(uuid.UUID(int=rng.getrandbits(128))), content=content, ctas=ctas
+    )
+
+
+async def measure(
+    name: str, repository: SummaryRepository, summaries: list[Summary], reads: int
+) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for summary in summaries:
+        # Copies, so that the repository owns every object it retains.
+        await repository.save(
+            Summary(
+                id=summary.id[:],
+                content=summary.content.encode().decode(),
+                ctas=[cta.encode().decode() for cta in summary.ctas],
+            )
+        )
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    ids = [random.choice(summaries).id for _ in range(reads)]
+    latencies = []
+    for id in ids:
+        started = time.perf_counter_ns()
+        await repository.get_by_id(id)
+        latencies.append(time.perf_counter_ns() - started)
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "repository": name,
+        "bytes_per_summary": round(retained / len(summaries)),
+        "get_by_id_p50_us": round(cuts[49] / 1000, 2),
+        "get_by_id_p99_us": round(cuts[98] / 1000, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    rng = random.Random(0)
+    summaries = [build_summary(rng, args.content_words) for _ in range(args.summaries)]
+    raw_bytes = statistics.mean(
+        len(json.dumps([s.content, s.ctas]).encode()) for s in summaries
+    )
+    unbounded_caps: dict[str, Any] = {"max_entries": None, "max_bytes": None}
+    candidates = {
+        "InMemorySummaryRepository": InMemorySummaryRepository(),
+        "Bounded, no compression": BoundedInMemorySummaryRepository(
+            compression="none", **unbounded_caps
+        ),
+        "Bounded, zlib": BoundedInMemorySummaryRepository(
+            compression="zlib", **unbounded_caps
+        ),
+    }
+    try:
+        candidates["Bounded, zstd"] = BoundedInMemorySummaryRepository(
+            compression="zstd", **unbounded_caps
+        )
+    except ValueError:
+        pass  # zstandard is not installed.
+
+    results = [
+        await measure(name, repository, summaries, args.reads)
+        for name, repository in candidates.items()
+    ]
+    return {
+        "summaries": args.summaries,
+        "serialized_bytes_per_summary": round(raw_bytes),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--summaries", type=int, default=20_000)
+    parser.add_argument("--content-words", type=int, default=150)
+    parser.add_argument("--reads", type=int, default=20_000)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
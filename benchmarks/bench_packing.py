@@ -0,0 +1,133 @@
+"""
+Throughput, cost and latency of packing short transcripts into shared calls.
+
+Short transcripts arrive at ``--arrival-rate`` per second and are summarized
+twice, with one call each and through TranscriptPacker, against the simulated
+LLM (fixed overhead plus a cost per prompt character). Prompt characters sent
+stand in for input-token cost; LLM calls are what the RPM quota counts. Run:
+
+    python -m benchmarks.bench_packing --transcripts 500 --arrival-rate 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import pydantic
+
+from app.adapters.fake import FakeLLMAdapter
+from app.adapters.rate_limited import RateLimitedLLm
+from app.ports.llm import LLm
+from app.services.packer import TranscriptPacker
+from app.services.summarizer import TranscriptSummarizer
+
+TRANSCRIPT = (
+    "Coach: What is the one thing you want from this session? "
+    "Client: A plan for the hiring backlog. Coach: What is blocking it? "
+    "Client: Interview loops take three weeks."
+)
+
+
+class PromptMeter(LLm):
+    """Counts calls and prompt characters sent to the wrapped LLm."""
+
+    def __init__(self, llm: LLm) -> None:
+        self._llm = llm
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        self.calls += 1
+        self.prompt_chars += len(system_prompt) + len(user_prompt)
+        return self._llm.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        self.calls += 1
+        self.prompt_chars += len(system_prompt) + len(user_prompt)
+        return await self._llm.run_completion_async(system_prompt, user_prompt, dto)
+
+
+async def run(args: argparse.Namespace, packing: bool) -> dict:
+    backend = FakeLLMAdapter(
+        latency_ms=args.base_latency_ms,
+        ms_per_prompt_char=args.ms_per_prompt_char,
+        packed_item_drop_rate=args.drop_rate,
+    )
+    meter = PromptMeter(backend)
+    llm = RateLimitedLLm(
+        meter,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=10**12,
+        initial_concurrency=args.concurrency,
+        max_concurrency=args.concurrency,
+    )
+    packer = (
+        TranscriptPacker(
+            llm,
+            window_seconds=args.window_ms / 1000,
+            max_transcripts=args.max_transcripts,
+        )
+        if packing
+        else None
+    )
+    summarizer = TranscriptSummarizer(llm, packer=packer)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        started = time.perf_counter()
+        await summarizer.summarize(f"{TRANSCRIPT} (session {index})")
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    tasks = []
+    for index in range(args.transcripts):
+        tasks.append(asyncio.create_task(one(index)))
+        await asyncio.sleep(1 / args.arrival_rate)
+    await asyncio.gather(*tasks)
+    duration = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "packing": packing,
+        "duration_seconds": round(duration, 3),
+        "throughput_per_second": round(args.transcripts / duration, 1),
+        "llm_calls": meter.calls,
+        "prompt_chars": meter.prompt_chars,
+        "prompt_chars_per_transcript": round(meter.prompt_chars / args.transcripts),
+        "latency_p50_ms": round(cuts[49] * 1000, 1),
+        "latency_p99_ms": round(cuts[98] * 1000, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    single = await run(args, packing=False)
+    packed = await run(args, packing=True)
+    return {
+        "parameters": vars(args),
+        "single": single,
+        "packed": packed,
+        "call_reduction": round(single["llm_calls"] / packed["llm_calls"], 2),
+        "prompt_chars_reduction": round(
+            single["prompt_chars"] / packed["prompt_chars"], 2
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transcripts", type=int, default=500)
+    parser.add_argument("--arrival-rate", type=float, default=200)
+    parser.add_argument("--window-ms", type=float, default=20)
+    parser.add_argument("--max-transcripts", type=int, default=16)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests-per-minute", type=int, default=3000)
+    parser.add_argument("--base-latency-ms", type=float, default=500)
+    parser.add_argument("--ms-per-prompt-char", type=float, default=0.02)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -0,0 +1,113 @@
+"""
+Interactive latency next to a bulk client, with and without priority lanes.
+
+A bulk client queues ``--bulk-calls`` batch-lane calls at once while
+interactive calls arrive at ``--interactive-rate`` per second, all sharing
+``--concurrency`` slots in front of a simulated LLM. The baseline serves
+everything first come, first served (a semaphore); the other run goes
+through LLMScheduler. Run with:
+
+    python -m benchmarks.bench_scheduler --bulk-calls 2000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import pydantic
+
+from app.adapters.fake import FakeLLMAdapter
+from app.ports.llm import LLm
+from app.schemas.llm_responses import SummaryLLMOutput
+from app.services.scheduler import (
+    CallContext,
+    LLMScheduler,
+    ScheduledLLm,
+    set_call_context,
+)
+
+
+class FifoLLm(LLm):
+    """The baseline: one first-come, first-served concurrency limit."""
+
+    def __init__(self, llm: LLm, concurrency: int) -> None:
+        self._llm = llm
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        return self._llm.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        async with self._semaphore:
+            return await self._llm.run_completion_async(system_prompt, user_prompt, dto)
+
+
+async def run(args: argparse.Namespace, scheduled: bool) -> dict:
+    backend = FakeLLMAdapter(
+        latency_ms=args.latency_ms, latency_distribution="lognormal", seed=0
+    )
+    llm = (
+        ScheduledLLm(
+            backend,
+            LLMScheduler(
+                max_concurrency=args.concurrency,
+                batch_max_queue=10**6,
+                batch_max_wait=10**6,
+                max_queued_per_client=10**6,
+            ),
+        )
+        if scheduled
+        else FifoLLm(backend, args.concurrency)
+    )
+
+    async def call(context: CallContext, index: int) -> float:
+        set_call_context(context)
+        started = time.perf_counter()
+        await llm.run_completion_async("system", f"{index}", SummaryLLMOutput)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    bulk = asyncio.gather(
+        *(call(CallContext("batch", "bulk"), i) for i in range(args.bulk_calls))
+    )
+    interactive = []
+    for index in range(args.interactive_calls):
+        interactive.append(
+            asyncio.ensure_future(
+                call(CallContext("interactive", f"user{index}"), index)
+            )
+        )
+        await asyncio.sleep(1 / args.interactive_rate)
+    latencies = await asyncio.gather(*interactive)
+    await bulk
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "scheduled": scheduled,
+        "interactive_p50_ms": round(cuts[49] * 1000, 1),
+        "interactive_p99_ms": round(cuts[98] * 1000, 1),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    return {
+        "parameters": vars(args),
+        "fifo": await run(args, scheduled=False),
+        "lanes": await run(args, scheduled=True),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulk-calls", type=int, default=2000)
+    parser.add_argument("--interactive-calls", type=int, default=100)
+    parser.add_argument("--interactive-rate", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
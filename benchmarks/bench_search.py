@@ -0,0 +1,83 @@
+"""
+Query latency and memory of the full-text summary index.
+
+Indexes ``--summaries`` synthetic summaries whose words follow a Zipf
+distribution over ``--vocabulary`` words, like natural text does, measuring
+the memory the index retains with tracemalloc, then times first-page queries
+of one to three words drawn from the same distribution. Run with:
+
+    python -m benchmarks.bench_search --summaries 1000000
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.repositories.search_index import InvertedIndex
+
+
+def build_words(rng: random.Random, vocabulary: int) -> tuple[list[str], list[float]]:
+    words = [
+        "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))
+        )
+        for _ in range(vocabulary)
+    ]
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary + 1)))
+    return words, weights
+
+
+def main(args: argparse.Namespace) -> dict:
+    rng = random.Random(0)
+    words, weights = build_words(rng, args.vocabulary)
+
+    def text(length: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=weights, k=length))
+
+    index = InvertedIndex()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for number in range(args.summaries):
+        index.add(f"{number:032x}", text(args.words_per_summary))
+    indexing_seconds = time.perf_counter() - started
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    results = {}
+    for terms in (1, 2, 3):
+        latencies = []
+        for _ in range(args.queries):
+            query = text(terms)
+            started = time.perf_counter_ns()
+            index.search(query, 0, args.limit + 1)
+            latencies.append(time.perf_counter_ns() - started)
+        cuts = statistics.quantiles(latencies, n=100)
+        results[f"{terms}_term_queries"] = {
+            "p50_us": round(cuts[49] / 1000, 1),
+            "p99_us": round(cuts[98] / 1000, 1),
+        }
+    return {
+        "parameters": vars(args),
+        "indexed_per_second": round(args.summaries / indexing_seconds),
+        "index_bytes_per_summary": round(retained / args.summaries),
+        "index_megabytes": round(retained / 2**20, 1),
+        **results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--summaries", type=int, default=100_000)
+    parser.add_argument("--words-per-summary", type=int, default=210)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=20)
+    print(json.dumps(main(parser.parse_args()), indent=2))
@@ -0,0 +1,201 @@
+"""
+Cold-start cost of a replica: import time, time to ready and first requests.
+
+Starts ``--runs`` fresh interpreters per variant, each serving the app
+in-process against a local OpenAI-compatible stub. The stub holds every new
+connection for ``--connection-setup-ms``, standing in for the TCP and TLS
+handshakes with the real API, and answers completions after
+``--completion-ms``. Each run reports how long ``import app.main`` took, the
+time from process spawn to ``/ready`` answering 200, and the latency of the
+first and second summary requests; medians are printed per variant, with
+STARTUP_WARMUP_ENABLED off and on. Run with:
+
+    python -m benchmarks.bench_startup --runs 5 --connection-setup-ms 150
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import MutableMapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+TRANSCRIPT = "Coach: How did the sprint go?\nClient: Better than expected."
+
+
+def stub_server(
+    connection_setup_ms: float, completion_ms: float
+) -> ThreadingHTTPServer:
+    content = json.dumps(
+        {"content": "The sprint went well.", "ctas": ["Plan the next sprint"]}
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            time.sleep(connection_setup_ms / 1000)
+            super().setup()
+
+        def _reply(self, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            model = self.path.rsplit("/", 1)[-1]
+            self._reply({"id": model, "object": "model", "created": 0, "owned_by": "x"})
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(completion_ms / 1000)
+            self._reply(
+                {
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "gpt-4o-mini",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": content},
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 100,
+                        "completion_tokens": 20,
+                        "total_tokens": 120,
+                    },
+                }
+            )
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def child(spawned_at: float) -> dict:
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+
+    async def get(path: str, query: str = "") -> int:
+        status = 0
+
+        async def receive() -> MutableMapping[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: MutableMapping[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [],
+            "client": ("127.0.0.1", 12345),
+            "server": ("testserver", 80),
+        }
+        await app(scope, receive, send)
+        return status
+
+    async def summarize(index: int) -> float:
+        query = f"text_to_summary={TRANSCRIPT.replace(' ', '+')}+{index}"
+        request_started = time.perf_counter()
+        status = await get("/summary_maker/get_summary_and_ctas", query)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        return (time.perf_counter() - request_started) * 1000
+
+    async with app.router.lifespan_context(app):
+        while await get("/ready") != 200:
+            await asyncio.sleep(0.001)
+        ready = time.perf_counter()
+        spawn_to_ready = time.time() - spawned_at
+        first = await summarize(1)
+        second = await summarize(2)
+    return {
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (ready - imported) * 1000,
+        "spawn_to_ready_ms": spawn_to_ready * 1000,
+        "first_request_ms": first,
+        "second_request_ms": second,
+    }
+
+
+def run(args: argparse.Namespace, base_url: str, warm_up: bool) -> dict:
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": base_url,
+        "LLM_BACKEND": "openai",
+        "LLM_CACHE_ENABLED": "false",
+        "STARTUP_WARMUP_ENABLED": str(warm_up).lower(),
+    }
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_startup",
+                "--child",
+                str(time.time()),
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(output.stdout.splitlines()[-1]))
+    return {
+        name: round(statistics.median(run[name] for run in runs), 1) for name in runs[0]
+    }
+
+
+def main(args: argparse.Namespace) -> dict:
+    server = stub_server(args.connection_setup_ms, args.completion_ms)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    try:
+        return {
+            "parameters": vars(args),
+            "no_warm_up": run(args, base_url, warm_up=False),
+            "warm_up": run(args, base_url, warm_up=True),
+        }
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--connection-setup-ms", type=float, default=150)
+    parser.add_argument("--completion-ms", type=float, default=50)
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        print(json.dumps(asyncio.run(child(args.child))))
+    else:
+        print(json.dumps(main(args), indent=2))
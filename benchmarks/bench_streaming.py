@@ -0,0 +1,131 @@
+"""
+Time to first content of streamed summaries versus blocking ones.
+
+Summarizes ``--calls`` transcripts, ``--concurrency`` at a time, through a
+simulated LLM whose completions take ``--latency-ms`` (lognormal) and start
+streaming after ``--first-chunk-share`` of that time. The blocking run waits
+for the whole completion; the streaming run records when the first piece of
+content, the first CTA and the whole summary arrive. The CPU time of reading
+a streamed completion with StructuredOutputReader is measured on its own.
+Run with:
+
+    python -m benchmarks.bench_streaming --calls 200 --latency-ms 3000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from app.adapters.fake import FakeLLMAdapter
+from app.domain.entities import SummaryDelta
+from app.schemas.llm_responses import SummaryLLMOutput
+from app.services.structured_stream import StructuredOutputReader
+from app.services.summarizer import TranscriptSummarizer
+
+TRANSCRIPT = "Coach: How did the sprint go?\nClient: Better than expected."
+
+
+def percentiles(values: list[float]) -> dict:
+    cuts = statistics.quantiles(values, n=100)
+    return {"p50_ms": round(cuts[49] * 1000, 1), "p99_ms": round(cuts[98] * 1000, 1)}
+
+
+async def run_calls(
+    args: argparse.Namespace, one: Callable[[int], Awaitable[None]]
+) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(index: int) -> None:
+        async with semaphore:
+            await one(index)
+
+    await asyncio.gather(*(limited(index) for index in range(args.calls)))
+
+
+def reader_microseconds(chunk_chars: int, repeat: int = 1000) -> float:
+    completion = SummaryLLMOutput(
+        content=" ".join(["The client reported better sprint results."] * 20),
+        ctas=[f"Follow up on action item {i}" for i in range(5)],
+    ).model_dump_json()
+    chunks = [
+        completion[start : start + chunk_chars]
+        for start in range(0, len(completion), chunk_chars)
+    ]
+    started = time.process_time()
+    for _ in range(repeat):
+        reader = StructuredOutputReader()
+        for chunk in chunks:
+            reader.feed(chunk)
+    return (time.process_time() - started) / repeat * 1e6
+
+
+async def main(args: argparse.Namespace) -> dict:
+    def summarizer() -> TranscriptSummarizer:
+        return TranscriptSummarizer(
+            FakeLLMAdapter(
+                latency_ms=args.latency_ms,
+                latency_distribution="lognormal",
+                stream_chunk_chars=args.chunk_chars,
+                stream_first_chunk_share=args.first_chunk_share,
+                seed=0,
+            )
+        )
+
+    blocking_summarizer = summarizer()
+    complete: list[float] = []
+
+    async def blocking(index: int) -> None:
+        started = time.perf_counter()
+        await blocking_summarizer.summarize(f"{TRANSCRIPT} #{index}")
+        complete.append(time.perf_counter() - started)
+
+    await run_calls(args, blocking)
+
+    streaming_summarizer = summarizer()
+    first_content: list[float] = []
+    first_cta: list[float] = []
+    streamed: list[float] = []
+
+    async def streaming(index: int) -> None:
+        started = time.perf_counter()
+        content_at = cta_at = None
+        transcript = f"{TRANSCRIPT} #{index}"
+        async for piece in streaming_summarizer.summarize_stream(transcript):
+            now = time.perf_counter() - started
+            if isinstance(piece, SummaryDelta):
+                if piece.cta is None and content_at is None:
+                    content_at = now
+                if piece.cta is not None and cta_at is None:
+                    cta_at = now
+        assert content_at is not None and cta_at is not None
+        first_content.append(content_at)
+        first_cta.append(cta_at)
+        streamed.append(time.perf_counter() - started)
+
+    await run_calls(args, streaming)
+
+    return {
+        "parameters": vars(args),
+        "blocking": {"complete": percentiles(complete)},
+        "streaming": {
+            "first_content": percentiles(first_content),
+            "first_cta": percentiles(first_cta),
+            "complete": percentiles(streamed),
+            "reader_cpu_us_per_summary": round(
+                reader_microseconds(args.chunk_chars), 1
+            ),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=3000)
+    parser.add_argument("--first-chunk-share", type=float, default=0.15)
+    parser.add_argument("--chunk-chars", type=int, default=4)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
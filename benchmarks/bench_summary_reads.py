@@ -0,0 +1,173 @@
+"""
+Requests per second of repeated get-by-id reads of stored summaries.
+
+Stores ``--summaries`` summaries of about ``--summary-chars`` characters and
+reads them ``--reads`` times in random order, through the ASGI app in-process
+(no HTTP client work is measured). The variants are the previous endpoint
+(FastAPI validating and serializing the Summary dataclass), the current one
+with the response cache disabled and enabled, and conditional reads that
+send the ETag back and get 304. Rendering one summary response is also timed on
+its own. Run with:
+
+    python -m benchmarks.bench_summary_reads --summaries 1000 --reads 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+import pydantic  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from starlette.types import Message  # noqa: E402
+
+from app.dependencies import (  # noqa: E402
+    get_summary_repository,
+    set_summary_response_cache,
+)
+from app.domain.entities import Summary  # noqa: E402
+from app.main import app  # noqa: E402
+from app.ports.summary_repository import SummaryRepository  # noqa: E402
+from app.routers.summary import router  # noqa: E402
+from app.services.summary_responses import (  # noqa: E402
+    SummaryResponseCache,
+    render_summary,
+)
+
+PATH = "/summary_maker/get_summary_and_ctas_by_id"
+BASELINE_PATH = "/summary_maker/get_summary_and_ctas_by_id_baseline"
+_SUMMARY: pydantic.TypeAdapter[Summary] = pydantic.TypeAdapter(Summary)
+
+
+@router.get("/get_summary_and_ctas_by_id_baseline", response_model=Summary)
+async def baseline_get_by_id(
+    id: str, repository: SummaryRepository = Depends(get_summary_repository)
+) -> Summary | None:
+    """The endpoint as it was before the response cache."""
+    return await repository.get_by_id(id)
+
+
+app.include_router(router)
+
+
+async def call(path: str, id: str, etag: str | None = None) -> tuple[int, str]:
+    """Returns the status and ETag of one GET."""
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": f"id={id}".encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    response_headers = dict(sent[0]["headers"])
+    return sent[0]["status"], response_headers.get(b"etag", b"").decode()
+
+
+async def measure(ids: list[str], path: str, etags: dict | None = None) -> dict:
+    expected = 304 if etags else 200
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for id in ids:
+        status, _ = await call(path, id, etags[id] if etags else None)
+        if status != expected:
+            raise RuntimeError(f"{path}: HTTP {status}")
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": round(len(ids) / elapsed),
+        "cpu_us_per_request": round(
+            (time.process_time() - cpu_started) / len(ids) * 1e6, 1
+        ),
+    }
+
+
+def microseconds(render, repeat: int = 2000) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        render()
+    return round((time.process_time() - started) / repeat * 1e6, 1)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    rng = random.Random(0)
+    ids = [f"summary-{index}" for index in range(args.summaries)]
+    reads = [rng.choice(ids) for _ in range(args.reads)]
+    results: dict[str, dict] = {}
+    async with app.router.lifespan_context(app):
+        repository = get_summary_repository()
+        words = ["sprint", "billing", "revamp", "hiring", "engineers", "quarter"]
+        await repository.save_many(
+            [
+                Summary(
+                    id=id,
+                    content=" ".join(
+                        rng.choice(words) for _ in range(args.summary_chars // 7)
+                    ),
+                    ctas=[f"Follow up on item {step}" for step in range(3)],
+                )
+                for id in ids
+            ]
+        )
+        uncached = SummaryResponseCache(max_entries=0)
+        cached = SummaryResponseCache()
+        set_summary_response_cache(cached)
+        etags = {id: (await call(PATH, id))[1] for id in ids}
+        variants = {
+            "baseline": (None, BASELINE_PATH, None),
+            "uncached": (uncached, PATH, None),
+            "cached": (cached, PATH, None),
+            "not_modified": (cached, PATH, etags),
+        }
+        # Interleaved rounds, best kept, to even out noise from other processes.
+        for _ in range(args.rounds):
+            for name, (cache, path, variant_etags) in variants.items():
+                if cache is not None:
+                    set_summary_response_cache(cache)
+                result = await measure(reads, path, variant_etags)
+                best = results.get(name)
+                if (
+                    best is None
+                    or result["requests_per_second"] > best["requests_per_second"]
+                ):
+                    results[name] = result
+        summary = await repository.get_by_id(ids[0])
+        assert summary is not None
+    render = {
+        "fastapi_default_us": microseconds(
+            lambda: JSONResponse(jsonable_encoder(_SUMMARY.validate_python(summary)))
+        ),
+        "render_summary_us": microseconds(lambda: render_summary(summary)),
+    }
+    return {"parameters": vars(args), "results": results, "render": render}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--summaries", type=int, default=1000)
+    parser.add_argument("--summary-chars", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=3)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -0,0 +1,224 @@
+"""
+Bytes on the wire and server CPU per request for each way of sending a transcript.
+
+Drives the ASGI app in-process with raw ASGI messages, so that no HTTP client
+work is measured, against the fake LLM backend with no latency and no cache.
+A transcript of ``--transcript-chars`` is sent as a GET query parameter and
+as a POST body (JSON, text, gzip and, when the zstandard package is there,
+zstd); a batch of ``--batch-size`` is fetched with and without compressed
+responses. For each variant it reports request and response bytes, and the
+process CPU time per request. Rendering one batch response with FastAPI's
+default JSON path and with ModelResponse is timed separately. Run with:
+
+    python -m benchmarks.bench_wire --transcript-chars 20000 --batch-size 50
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+from urllib.parse import urlencode
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "0")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "100000000")
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "100000000000")
+os.environ.setdefault("LONG_TRANSCRIPT_CHARS", "1000000")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from starlette.types import Message  # noqa: E402
+
+from app.compression import zstandard  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas.responses import (  # noqa: E402
+    BatchSummaryItem,
+    BatchSummaryResponse,
+    ModelResponse,
+    SummaryResponse,
+)
+
+TURN = (
+    "Coach: What would make this quarter a success for you? "
+    "Client: Shipping the billing revamp and hiring two engineers.\n"
+)
+
+
+def transcript(chars: int, index: int) -> str:
+    return (f"Session {index}.\n" + TURN * (chars // len(TURN) + 1))[:chars]
+
+
+async def call(
+    method: str, path: str, query: str = "", body: bytes = b"", headers=()
+) -> tuple[int, int, int]:
+    """Returns the status, request bytes and response bytes of one request."""
+    sent: list[Message] = []
+    received = False
+
+    async def receive() -> Message:
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in headers]
+    raw_headers.append((b"content-length", str(len(body)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    request_line = f"{method} {path}{'?' + query if query else ''} HTTP/1.1\r\n"
+    request_bytes = (
+        len(request_line)
+        + sum(len(name) + len(value) + 4 for name, value in raw_headers)
+        + len(body)
+    )
+    start = sent[0]
+    response_bytes = sum(len(message.get("body", b"")) for message in sent[1:])
+    response_bytes += sum(
+        len(name) + len(value) + 4 for name, value in start["headers"]
+    )
+    return start["status"], request_bytes, response_bytes
+
+
+async def measure(name: str, requests: int, make_call) -> dict:
+    request_bytes = response_bytes = 0
+    started = time.process_time()
+    for index in range(requests):
+        status, sent, received = await make_call(index)
+        if status != 200:
+            raise RuntimeError(f"{name}: HTTP {status}")
+        request_bytes += sent
+        response_bytes += received
+    cpu = time.process_time() - started
+    return {
+        "variant": name,
+        "request_bytes": request_bytes // requests,
+        "response_bytes": response_bytes // requests,
+        "server_cpu_ms": round(cpu / requests * 1000, 2),
+    }
+
+
+def single_variants(chars: int) -> dict:
+    path = "/summary_maker/get_summary_and_ctas"
+    variants = {
+        "get_query": lambda i: call(
+            "GET", path, urlencode({"text_to_summary": transcript(chars, i)})
+        ),
+        "post_json": lambda i: call(
+            "POST",
+            path,
+            body=json.dumps({"text_to_summary": transcript(chars, i)}).encode(),
+            headers=[("Content-Type", "application/json")],
+        ),
+        "post_text": lambda i: call(
+            "POST",
+            path,
+            body=transcript(chars, i).encode(),
+            headers=[("Content-Type", "text/plain")],
+        ),
+        "post_text_gzip": lambda i: call(
+            "POST",
+            path,
+            body=gzip.compress(transcript(chars, i).encode(), 6),
+            headers=[("Content-Type", "text/plain"), ("Content-Encoding", "gzip")],
+        ),
+    }
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        variants["post_text_zstd"] = lambda i: call(
+            "POST",
+            path,
+            body=compressor.compress(transcript(chars, i).encode()),
+            headers=[("Content-Type", "text/plain"), ("Content-Encoding", "zstd")],
+        )
+    return variants
+
+
+def batch_variants(size: int) -> dict:
+    path = "/summary_maker/async_get_summary_and_ctas"
+
+    def batch(accept_encoding: str):
+        def make_call(index: int):
+            texts = [f"{TURN} Batch {index}, item {item}." for item in range(size)]
+            headers = [("Content-Type", "application/json")]
+            if accept_encoding:
+                headers.append(("Accept-Encoding", accept_encoding))
+            return call("POST", path, body=json.dumps(texts).encode(), headers=headers)
+
+        return make_call
+
+    variants = {"batch": batch(""), "batch_gzip_response": batch("gzip")}
+    if zstandard is not None:
+        variants["batch_zstd_response"] = batch("zstd")
+    return variants
+
+
+def render_microseconds(size: int, repeat: int = 200) -> dict:
+    response = BatchSummaryResponse(
+        items=[
+            BatchSummaryItem(
+                summary=SummaryResponse(
+                    id=f"summary-{index}",
+                    summary="The client wants to ship the billing revamp. " * 8,
+                    ctas=[f"Follow up on hiring step {step}" for step in range(3)],
+                )
+            )
+            for index in range(size)
+        ]
+    )
+    timings = {}
+    for name, render in (
+        ("fastapi_default", lambda: JSONResponse(jsonable_encoder(response))),
+        ("model_response", lambda: ModelResponse(response)),
+    ):
+        started = time.process_time()
+        for _ in range(repeat):
+            render()
+        timings[name] = round((time.process_time() - started) / repeat * 1e6, 1)
+    return timings
+
+
+async def main(args: argparse.Namespace) -> dict:
+    results = []
+    async with app.router.lifespan_context(app):
+        for variants, requests in (
+            (single_variants(args.transcript_chars), args.requests),
+            (batch_variants(args.batch_size), max(1, args.requests // 10)),
+        ):
+            for name, make_call in variants.items():
+                await measure(name, 3, make_call)  # warm-up
+                results.append(await measure(name, requests, make_call))
+    return {
+        "parameters": vars(args),
+        "zstd_available": zstandard is not None,
+        "results": results,
+        "batch_render_us": render_microseconds(args.batch_size),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transcript-chars", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
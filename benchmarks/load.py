@@ -0,0 +1,374 @@
+"""
+End-to-end load benchmark of every API endpoint against the fake LLM backend.
+
+Each scenario is driven by a closed loop of ``concurrency`` clients at every
+requested concurrency level, and reports throughput, latency percentiles,
+event-loop lag and memory. By default the app runs in-process through an ASGI
+transport, so the numbers are the service's own overhead plus the simulated
+LLM latency, with no network in between; client and server then share the
+event loop, so the lag figure includes the client's work. Pass ``--base-url``
+to load a server started separately (e.g. ``LLM_BACKEND=fake uvicorn
+app.main:app``); lag and memory are then the client's own.
+
+    python -m benchmarks.load --concurrency 1 8 32 --requests 200
+
+Results are written as JSON (``--output``) so that runs can be compared. The
+run refuses to start while an endpoint of the app has no scenario.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import resource
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastapi.routing import APIRoute
+
+# The in-process app reads its settings at import time: point it at the fake
+# backend and lift the provider quotas, which would otherwise be measured.
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "50")
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "100000000")
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "100000000000")
+os.environ.setdefault("LLM_INITIAL_CONCURRENCY", "1024")
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "1024")
+
+from app.main import app  # noqa: E402
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+TRANSCRIPT = (
+    "Coach: What would make this quarter a success for you? "
+    "Client: Shipping the billing revamp and hiring two engineers. "
+    "Coach: What is blocking the hiring? Client: Interview loops take too long."
+)
+
+
+SEARCH_QUERIES = ["hiring", "billing revamp", "interview loops", "quarter"]
+
+_sessions = itertools.count()
+
+
+def _transcript() -> str:
+    # Unique across the whole run, so that the LLM cache does not turn it into
+    # a cache benchmark.
+    return f"{TRANSCRIPT} (session {next(_sessions)})"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    method: str
+    path: str
+    request: Request
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_seconds: float
+    throughput_rps: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    latency_max_ms: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+    rss_mb: float | None
+    max_rss_mb: float
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def current_rss_mb() -> float | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (2**20 if platform.system() == "Darwin" else 2**10)
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires, i.e. how long the loop is blocked."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        assert self._task is not None
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    request: Request,
+    concurrency: int,
+    total_requests: int,
+) -> ScenarioResult:
+    sequence = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (index := next(sequence)) < total_requests:
+            started = time.perf_counter()
+            try:
+                response = await request(client, index)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    async with LoopLagMonitor() as monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+
+    latencies.sort()
+    lags = sorted(monitor.lags)
+    rss = current_rss_mb()
+    return ScenarioResult(
+        scenario=name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_seconds=round(duration, 4),
+        throughput_rps=round(len(latencies) / duration, 2),
+        latency_p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        latency_p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        latency_p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        latency_max_ms=round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        loop_lag_p99_ms=round(percentile(lags, 0.99) * 1000, 2),
+        loop_lag_max_ms=round(lags[-1] * 1000, 2) if lags else 0.0,
+        rss_mb=None if rss is None else round(rss, 1),
+        max_rss_mb=round(max_rss_mb(), 1),
+    )
+
+
+async def seed(client: httpx.AsyncClient, count: int) -> tuple[list[str], str]:
+    """Stores a few summaries and one job for the read-only scenarios."""
+    response = await client.post(
+        "/summary_maker/async_get_summary_and_ctas",
+        json=[_transcript() for _ in range(count)],
+    )
+    response.raise_for_status()
+    ids = [item["summary"]["id"] for item in response.json()["items"]]
+    job = await client.post("/jobs/submit", json=[_transcript()])
+    job.raise_for_status()
+    return ids, job.json()["id"]
+
+
+def build_scenarios(
+    ids: list[str], job_id: str, batch_size: int
+) -> dict[str, Scenario]:
+    def batch() -> list[str]:
+        return [_transcript() for _ in range(batch_size)]
+
+    def get(path: str, params: Callable[[int], dict] | None = None) -> Scenario:
+        async def request(client: httpx.AsyncClient, index: int) -> httpx.Response:
+            return await client.get(path, params=params(index) if params else None)
+
+        return Scenario("GET", path, request)
+
+    def post(path: str, **body: Callable[[int], Any]) -> Scenario:
+        async def request(client: httpx.AsyncClient, index: int) -> httpx.Response:
+            return await client.post(
+                path, **{key: value(index) for key, value in body.items()}
+            )
+
+        return Scenario("POST", path, request)
+
+    def stream(method: str, path: str, **body: Callable[[int], Any]) -> Scenario:
+        async def request(client: httpx.AsyncClient, index: int) -> httpx.Response:
+            async with client.stream(
+                method, path, **{key: value(index) for key, value in body.items()}
+            ) as response:
+                await response.aread()
+                return response
+
+        return Scenario(method, path, request)
+
+    return {
+        "root": get("/"),
+        "ready": get("/ready"),
+        "metrics": get("/metrics"),
+        "get_summary_and_ctas": get(
+            "/summary_maker/get_summary_and_ctas",
+            lambda index: {"text_to_summary": _transcript()},
+        ),
+        "post_summary_and_ctas_json": post(
+            "/summary_maker/get_summary_and_ctas",
+            json=lambda index: {"text_to_summary": _transcript()},
+        ),
+        "post_summary_and_ctas_text": post(
+            "/summary_maker/get_summary_and_ctas",
+            content=lambda index: _transcript(),
+            headers=lambda index: {"content-type": "text/plain; charset=utf-8"},
+        ),
+        "get_summary_and_ctas_stream": stream(
+            "GET",
+            "/summary_maker/get_summary_and_ctas/stream",
+            params=lambda index: {"text_to_summary": _transcript()},
+        ),
+        "get_summary_and_ctas_by_id": get(
+            "/summary_maker/get_summary_and_ctas_by_id",
+            lambda index: {"id": ids[index % len(ids)]},
+        ),
+        "async_get_summary_and_ctas": post(
+            "/summary_maker/async_get_summary_and_ctas", json=lambda index: batch()
+        ),
+        "async_get_summary_and_ctas_stream": stream(
+            "POST",
+            "/summary_maker/async_get_summary_and_ctas/stream",
+            json=lambda index: batch(),
+        ),
+        "jobs_submit": post("/jobs/submit", json=lambda index: batch()),
+        "jobs_get_status": get("/jobs/get_status", lambda index: {"job_id": job_id}),
+        "jobs_get_results": get("/jobs/get_results", lambda index: {"job_id": job_id}),
+        "get_summaries_ids": get("/extras/get_summaries_ids"),
+        "list_summaries_ids": get(
+            "/extras/list_summaries_ids", lambda index: {"limit": 100}
+        ),
+        "search_summaries": get(
+            "/extras/search_summaries",
+            lambda index: {"query": SEARCH_QUERIES[index % len(SEARCH_QUERIES)]},
+        ),
+        "get_summaries_by_ids": post(
+            "/extras/get_summaries_by_ids", json=lambda index: ids[:100]
+        ),
+        "llm_cache_stats": get("/extras/llm_cache_stats"),
+    }
+
+
+def uncovered_endpoints(scenarios: dict[str, Scenario]) -> set[tuple[str, str]]:
+    """The (method, path) pairs the app serves that no scenario requests."""
+    endpoints = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    return endpoints - {
+        (scenario.method, scenario.path) for scenario in scenarios.values()
+    }
+
+
+@contextlib.asynccontextmanager
+async def open_client(base_url: str | None):
+    timeout = httpx.Timeout(120.0)
+    if base_url is not None:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+            yield client
+        return
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=timeout
+        ) as client:
+            yield client
+
+
+async def main(args: argparse.Namespace) -> dict:
+    results: list[ScenarioResult] = []
+    uncovered = uncovered_endpoints(build_scenarios([], "", args.batch_size))
+    if uncovered:
+        raise SystemExit(
+            "No load scenario for "
+            + ", ".join(f"{method} {path}" for method, path in sorted(uncovered))
+        )
+    async with open_client(args.base_url) as client:
+        ids, job_id = await seed(client, args.seed_summaries)
+        scenarios = build_scenarios(ids, job_id, args.batch_size)
+        selected = args.scenarios or list(scenarios)
+        for name in selected:
+            for concurrency in args.concurrency:
+                result = await run_scenario(
+                    client, name, scenarios[name].request, concurrency, args.requests
+                )
+                results.append(result)
+                print(
+                    f"{name:<36} c={concurrency:<4} {result.throughput_rps:>9.1f} rps"
+                    f"  p50={result.latency_p50_ms:>8.1f}ms"
+                    f"  p99={result.latency_p99_ms:>8.1f}ms"
+                    f"  lag_p99={result.loop_lag_p99_ms:>6.1f}ms"
+                    f"  errors={result.errors}"
+                )
+
+    return {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "target": args.base_url or "in-process",
+        "settings": {
+            key: value
+            for key, value in os.environ.items()
+            if key.startswith(("LLM_", "FAKE_LLM_"))
+        },
+        "parameters": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "batch_size": args.batch_size,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--seed-summaries", type=int, default=100)
+    parser.add_argument("--scenarios", nargs="*", help="Subset of scenario names")
+    parser.add_argument("--base-url", help="Load a running server instead")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results")
+        / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json",
+    )
+    arguments = parser.parse_args()
+    report = asyncio.run(main(arguments))
+    arguments.output.parent.mkdir(parents=True, exist_ok=True)
+    arguments.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {arguments.output}")
@@ -0,0 +1,140 @@
+import asyncio
+
+import pydantic
+
+from app.adapters.cached import CachedLLm
+from app.schemas.llm_responses import SummaryLLMOutput
+from tests.fakes import FakeLLm
+
+SYSTEM_PROMPT = "You are a coach."
+
+
+class OtherOutput(pydantic.BaseModel):
+    summary: str
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalized_duplicates_hit_the_cache() -> None:
+    fake = FakeLLm()
+    cache = CachedLLm(fake, model="gpt-test")
+
+    async def scenario() -> None:
+        await cache.run_completion_async(
+            SYSTEM_PROMPT, "Transcript:\n  hello   world", SummaryLLMOutput
+        )
+        await cache.run_completion_async(
+            SYSTEM_PROMPT, "Transcript: hello world", SummaryLLMOutput
+        )
+
+    asyncio.run(scenario())
+
+    stats = cache.stats()
+    assert fake.async_calls == 1
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_concurrent_identical_calls_share_one_completion() -> None:
+    fake = FakeLLm(latency=0.05)
+    cache = CachedLLm(fake, model="gpt-test")
+
+    async def scenario() -> list[pydantic.BaseModel]:
+        return await asyncio.gather(
+            *(
+                cache.run_completion_async(SYSTEM_PROMPT, "same", SummaryLLMOutput)
+                for _ in range(10)
+            )
+        )
+
+    results = asyncio.run(scenario())
+
+    assert fake.async_calls == 1
+    assert cache.stats().coalesced == 9
+    assert len({id(result) for result in results}) == 10
+
+
+def test_shared_completion_is_cancelled_when_its_last_caller_leaves() -> None:
+    fake = FakeLLm(latency=10)
+    cache = CachedLLm(fake, model="gpt-test")
+
+    async def scenario() -> tuple[int, int]:
+        callers = [
+            asyncio.create_task(
+                cache.run_completion_async(SYSTEM_PROMPT, "same", SummaryLLMOutput)
+            )
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        callers[0].cancel()
+        await asyncio.sleep(0.01)
+        still_running = fake.in_flight
+        callers[1].cancel()
+        await asyncio.sleep(0.01)
+        return still_running, fake.in_flight
+
+    still_running, after_last = asyncio.run(scenario())
+
+    assert still_running == 1
+    assert after_last == 0
+    assert fake.async_calls == 1
+
+
+def test_model_and_dto_are_part_of_the_key() -> None:
+    fake = FakeLLm()
+    first = CachedLLm(fake, model="gpt-a")
+    second = CachedLLm(fake, model="gpt-b")
+
+    assert first._key(SYSTEM_PROMPT, "x", SummaryLLMOutput) != second._key(
+        SYSTEM_PROMPT, "x", SummaryLLMOutput
+    )
+    assert first._key(SYSTEM_PROMPT, "x", SummaryLLMOutput) != first._key(
+        SYSTEM_PROMPT, "x", OtherOutput
+    )
+
+
+def test_entries_expire_and_lru_is_evicted() -> None:
+    clock = FakeClock()
+    fake = FakeLLm()
+    cache = CachedLLm(
+        fake, model="gpt-test", max_entries=2, ttl_seconds=10, clock=clock
+    )
+
+    async def call(prompt: str) -> None:
+        await cache.run_completion_async(SYSTEM_PROMPT, prompt, SummaryLLMOutput)
+
+    async def scenario() -> None:
+        await call("a")
+        await call("b")
+        await call("a")
+        await call("c")  # evicts "b", the least recently used entry
+        await call("a")
+        clock.now = 11
+        await call("a")
+
+    asyncio.run(scenario())
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert fake.async_calls == 4
+    assert stats.hits == 2
+
+
+def test_streamed_completions_are_stored_and_replayed() -> None:
+    fake = FakeLLm()
+    cache = CachedLLm(fake, model="gpt-test")
+
+    async def collect() -> str:
+        chunks = cache.stream_completion(SYSTEM_PROMPT, "hello", SummaryLLMOutput)
+        return "".join([chunk async for chunk in chunks])
+
+    first, second = asyncio.run(collect()), asyncio.run(collect())
+
+    assert first == second
+    assert fake.async_calls == 1
+    assert cache.stats().hits == 1
@@ -0,0 +1,86 @@
+import asyncio
+
+import openai
+import pydantic
+import pytest
+
+from app.adapters.fake import FakeLLMAdapter
+from app.adapters.rate_limited import retry_after_seconds
+from app.schemas.llm_responses import SummaryLLMOutput
+from tests.adapters import mock_data
+
+
+class Response(pydantic.BaseModel):
+    summary: str
+    action_items: list[str]
+
+
+def test_responses_are_deterministic_and_follow_the_dto() -> None:
+    first = FakeLLMAdapter().run_completion("system", mock_data.TRANSCRIPT, Response)
+    second = FakeLLMAdapter().run_completion("system", mock_data.TRANSCRIPT, Response)
+    other = FakeLLMAdapter().run_completion("system", "another", Response)
+
+    assert first == second != other
+    assert isinstance(first, Response) and len(first.action_items) == 3
+
+
+def test_latency_distribution_is_applied() -> None:
+    llm = FakeLLMAdapter(latency_ms=20, latency_distribution="uniform")
+
+    async def scenario() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await llm.run_completion_async("system", "user", SummaryLLMOutput)
+        return loop.time() - started
+
+    assert 0.009 < asyncio.run(scenario()) < 0.1
+
+
+def test_injected_failures_use_openai_exceptions() -> None:
+    rate_limited = FakeLLMAdapter(rate_limit_rate=1.0, retry_after_seconds=2)
+    failing = FakeLLMAdapter(error_rate=1.0)
+
+    with pytest.raises(openai.RateLimitError) as exc_info:
+        rate_limited.run_completion("system", "user", SummaryLLMOutput)
+    assert retry_after_seconds(exc_info.value) == 2
+    with pytest.raises(openai.InternalServerError):
+        failing.run_completion("system", "user", SummaryLLMOutput)
+
+
+def test_error_rate_is_seeded() -> None:
+    def outcomes() -> list[bool]:
+        llm = FakeLLMAdapter(error_rate=0.3, seed=7)
+        results = []
+        for _ in range(50):
+            try:
+                llm.run_completion("system", "user", SummaryLLMOutput)
+                results.append(True)
+            except openai.InternalServerError:
+                results.append(False)
+        return results
+
+    assert outcomes() == outcomes()
+    assert 5 < outcomes().count(False) < 25
+
+
+def test_streamed_chunks_join_into_the_same_response() -> None:
+    llm = FakeLLMAdapter(latency_ms=100, stream_chunk_chars=8)
+
+    async def scenario() -> tuple[list[str], float, float]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        chunks: list[str] = []
+        first_chunk_after: float | None = None
+        async for chunk in llm.stream_completion("system", "user", SummaryLLMOutput):
+            first_chunk_after = first_chunk_after or loop.time() - started
+            chunks.append(chunk)
+        assert first_chunk_after is not None
+        return chunks, first_chunk_after, loop.time() - started
+
+    chunks, first_chunk_after, total = asyncio.run(scenario())
+
+    assert all(len(chunk) <= 8 for chunk in chunks)
+    assert SummaryLLMOutput.model_validate_json("".join(chunks)) == (
+        FakeLLMAdapter().run_completion("system", "user", SummaryLLMOutput)
+    )
+    assert first_chunk_after < 0.06 < total
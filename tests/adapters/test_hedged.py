@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pydantic
+import pytest
+
+from app.adapters.fake import server_error
+from app.adapters.hedged import DeadlineExceededError, HedgedLLm
+from app.schemas.llm_responses import SummaryLLMOutput
+from tests.fakes import FakeLLm
+
+
+def _call(llm: HedgedLLm) -> pydantic.BaseModel:
+    return asyncio.run(llm.run_completion_async("system", "user", SummaryLLMOutput))
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled() -> None:
+    primary, secondary = FakeLLm(latency=1.0), FakeLLm(latency=0.01)
+    llm = HedgedLLm(
+        {"primary": primary, "secondary": secondary},
+        hedge_max_delay=0.05,
+    )
+
+    started = time.perf_counter()
+    result = _call(llm)
+
+    assert isinstance(result, SummaryLLMOutput)
+    assert time.perf_counter() - started < 0.5
+    assert (primary.async_calls, secondary.async_calls) == (1, 1)
+    assert primary.in_flight == 0
+
+
+def test_hedge_delay_follows_the_tracked_latency_percentile() -> None:
+    primary, secondary = FakeLLm(latency=0.002), FakeLLm()
+    llm = HedgedLLm(
+        {"primary": primary, "secondary": secondary},
+        hedge_min_delay=0.0,
+        hedge_max_delay=1.0,
+        min_latency_samples=20,
+    )
+
+    async def scenario() -> None:
+        for _ in range(20):
+            await llm.run_completion_async("system", "user", SummaryLLMOutput)
+
+    asyncio.run(scenario())
+    # Until enough latencies are known, the maximum delay applies.
+    assert secondary.async_calls == 0
+
+    primary._latency = 0.3
+    started = time.perf_counter()
+    _call(llm)
+
+    assert time.perf_counter() - started < 0.2
+    assert secondary.async_calls == 1
+
+
+def test_failures_fail_over_and_open_the_circuit() -> None:
+    now = [0.0]
+    primary = FakeLLm(errors=[server_error(), server_error()])
+    secondary = FakeLLm()
+    llm = HedgedLLm(
+        {"primary": primary, "secondary": secondary},
+        failure_threshold=2,
+        reset_seconds=10.0,
+        clock=lambda: now[0],
+    )
+
+    for _ in range(3):
+        assert isinstance(_call(llm), SummaryLLMOutput)
+
+    # The third call skipped the open primary.
+    assert (primary.async_calls, secondary.async_calls) == (2, 3)
+    assert llm.breaker("primary").is_open
+
+    now[0] = 10.0
+    _call(llm)
+
+    # The probe after the reset period succeeded and closed the circuit.
+    assert primary.async_calls == 3
+    assert not llm.breaker("primary").is_open
+
+
+def test_deadline_abandons_the_call() -> None:
+    primary, secondary = FakeLLm(latency=1.0), FakeLLm(latency=1.0)
+    llm = HedgedLLm(
+        {"primary": primary, "secondary": secondary},
+        deadline_seconds=0.05,
+        hedge_max_delay=0.01,
+    )
+
+    with pytest.raises(openai.APITimeoutError) as info:
+        _call(llm)
+
+    assert isinstance(info.value, DeadlineExceededError)
+    assert primary.in_flight == secondary.in_flight == 0
+
+
+def test_client_errors_are_not_failed_over() -> None:
+    request = httpx.Request("POST", "https://llm.local")
+    error = openai.BadRequestError(
+        "bad", response=httpx.Response(400, request=request), body=None
+    )
+    primary, secondary = FakeLLm(errors=[error]), FakeLLm()
+    llm = HedgedLLm({"primary": primary, "secondary": secondary})
+
+    with pytest.raises(openai.BadRequestError):
+        _call(llm)
+
+    assert secondary.async_calls == 0
+    assert not llm.breaker("primary").is_open
+
+
+def test_streams_fail_over_until_the_first_chunk() -> None:
+    primary, secondary = FakeLLm(errors=[server_error()]), FakeLLm()
+    llm = HedgedLLm({"primary": primary, "secondary": secondary})
+
+    async def collect() -> list[str]:
+        return [
+            chunk
+            async for chunk in llm.stream_completion("system", "user", SummaryLLMOutput)
+        ]
+
+    chunks = asyncio.run(collect())
+
+    assert SummaryLLMOutput.model_validate_json("".join(chunks)).content == (
+        "fake summary"
+    )
+    assert (primary.async_calls, secondary.async_calls) == (1, 1)
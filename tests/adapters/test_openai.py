@@ -1,7 +1,12 @@
+import asyncio
+import json
+
+import httpx
 import pydantic
 
 from app import configurations
 from app.adapters import openai
+from app.metrics import REGISTRY
 from tests.adapters import mock_data
 
 
@@ -31,3 +36,120 @@ def test_openai_adapter() -> None:
     print(serialized_response)
     assert "summary" in serialized_response.keys()
     assert "action_items" in serialized_response.keys()
+
+
+def test_async_completion_records_tokens_and_parse_time() -> None:
+    completion = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-test",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {
+                    "role": "assistant",
+                    "content": '{"summary": "ok", "action_items": ["a"]}',
+                },
+            }
+        ],
+        "usage": {"prompt_tokens": 11, "completion_tokens": 7, "total_tokens": 18},
+    }
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json=completion)
+    )
+    adapter = openai.OpenAIAdapter("sk-test", "gpt-test", max_retries=0)
+    adapter._aclient = openai.openai.AsyncOpenAI(
+        api_key="sk-test", http_client=httpx.AsyncClient(transport=transport)
+    )
+    before = REGISTRY.render()
+
+    response = asyncio.run(adapter.run_completion_async("system", "user", Response))
+
+    after = REGISTRY.render()
+    assert response == Response(summary="ok", action_items=["a"])
+    assert _sample(after, 'llm_tokens_total{type="prompt"}') == (
+        _sample(before, 'llm_tokens_total{type="prompt"}') + 11
+    )
+    assert _sample(after, 'llm_tokens_total{type="completion"}') == (
+        _sample(before, 'llm_tokens_total{type="completion"}') + 7
+    )
+    assert _sample(after, 'stage_duration_seconds_count{stage="llm_parse"}') == (
+        _sample(before, 'stage_duration_seconds_count{stage="llm_parse"}') + 1
+    )
+
+
+def test_stream_completion_yields_json_deltas() -> None:
+    def chunk(delta: dict, finish_reason: str | None = None, usage=None) -> str:
+        body = {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-test",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    pieces = ['{"summary": "o', 'k", "action', '_items": ["a"]}']
+    stream = "".join(
+        [
+            chunk({"role": "assistant", "content": ""}),
+            *(chunk({"content": piece}) for piece in pieces),
+            chunk({}, "stop", {"prompt_tokens": 5, "completion_tokens": 3}),
+            "data: [DONE]\n\n",
+        ]
+    )
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, text=stream, headers={"content-type": "text/event-stream"}
+        )
+    )
+    adapter = openai.OpenAIAdapter("sk-test", "gpt-test", max_retries=0)
+    adapter._aclient = openai.openai.AsyncOpenAI(
+        api_key="sk-test", http_client=httpx.AsyncClient(transport=transport)
+    )
+    before = REGISTRY.render()
+
+    async def collect() -> list[str]:
+        return [
+            delta
+            async for delta in adapter.stream_completion("system", "user", Response)
+        ]
+
+    deltas = asyncio.run(collect())
+
+    assert deltas == pieces
+    assert _sample(REGISTRY.render(), 'llm_tokens_total{type="completion"}') == (
+        _sample(before, 'llm_tokens_total{type="completion"}') + 3
+    )
+
+
+def _sample(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_warm_up_opens_connections_and_builds_no_sync_client() -> None:
+    paths: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        model = {"id": "gpt-test", "object": "model", "created": 0, "owned_by": "x"}
+        return httpx.Response(200, json=model)
+
+    adapter = openai.OpenAIAdapter("sk-test", "gpt-test", max_keepalive_connections=2)
+    adapter._aclient = openai.openai.AsyncOpenAI(
+        api_key="sk-test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+    )
+
+    asyncio.run(adapter.warm_up(connections=4))
+    asyncio.run(adapter.aclose())
+
+    # Capped at the connections the pool keeps alive.
+    assert paths == ["/v1/models/gpt-test"] * 2
+    assert "_client" not in adapter.__dict__
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any
+
+import openai
+import pytest
+
+from app.adapters.fake import rate_limit_error
+from app.adapters.rate_limited import RateLimitedLLm, retry_after_seconds
+from app.schemas.llm_responses import SummaryLLMOutput
+from tests.fakes import FakeLLm
+
+SYSTEM_PROMPT = "You are a coach."
+
+
+def _limited(fake: FakeLLm, **kwargs) -> RateLimitedLLm:
+    options: dict[str, Any] = dict(
+        max_concurrency=8,
+        initial_concurrency=4,
+        requests_per_minute=60_000,
+        tokens_per_minute=10_000_000,
+        base_delay=0.001,
+        max_delay=0.01,
+    )
+    options.update(kwargs)
+    return RateLimitedLLm(fake, **options)
+
+
+def _run_batch(llm: RateLimitedLLm, size: int) -> list[object]:
+    async def scenario() -> list[object]:
+        return await asyncio.gather(
+            *(
+                llm.run_completion_async(SYSTEM_PROMPT, f"t{i}", SummaryLLMOutput)
+                for i in range(size)
+            ),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(scenario())
+
+
+def test_retry_after_header_is_parsed() -> None:
+    assert retry_after_seconds(rate_limit_error("1.5")) == 1.5
+    assert retry_after_seconds(rate_limit_error()) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_concurrency_never_exceeds_the_limit() -> None:
+    fake = FakeLLm(latency=0.01)
+    llm = _limited(fake, initial_concurrency=3, max_concurrency=3)
+
+    results = _run_batch(llm, 20)
+
+    assert all(isinstance(result, SummaryLLMOutput) for result in results)
+    assert fake.max_in_flight == 3
+
+
+def test_rate_limits_are_retried_and_shrink_the_limit() -> None:
+    fake = FakeLLm(latency=0.005, errors=[rate_limit_error("0.01")] * 3)
+    llm = _limited(fake, initial_concurrency=8)
+
+    results = _run_batch(llm, 8)
+
+    assert all(isinstance(result, SummaryLLMOutput) for result in results)
+    assert fake.async_calls == 11
+    assert llm.concurrency_limit < 8
+
+
+def test_limit_ramps_up_after_successes() -> None:
+    fake = FakeLLm()
+    llm = _limited(fake, initial_concurrency=2, max_concurrency=6)
+
+    _run_batch(llm, 50)
+
+    assert llm.concurrency_limit == 6
+
+
+def test_retries_are_bounded_and_other_errors_are_not_retried() -> None:
+    fake = FakeLLm(errors=[rate_limit_error()] * 5)
+    llm = _limited(fake, max_retries=2)
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(llm.run_completion_async(SYSTEM_PROMPT, "t", SummaryLLMOutput))
+    assert fake.async_calls == 3
+
+    fake = FakeLLm(errors=[ValueError("bad")])
+    llm = _limited(fake)
+    with pytest.raises(ValueError):
+        asyncio.run(llm.run_completion_async(SYSTEM_PROMPT, "t", SummaryLLMOutput))
+    assert fake.async_calls == 1
+
+
+def test_token_budget_spaces_out_calls() -> None:
+    fake = FakeLLm()
+    # Three calls of 20_100 estimated tokens overdraw a 60_000 tokens/minute
+    # budget by 300 tokens, i.e. 0.3s of refill at 1_000 tokens/second.
+    llm = _limited(fake, tokens_per_minute=60_000, completion_tokens_estimate=0)
+    user_prompt = "x" * 80_400
+
+    async def scenario() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(3):
+            await llm.run_completion_async("", user_prompt, SummaryLLMOutput)
+        return loop.time() - started
+
+    assert llm.estimate_tokens("", user_prompt) == 20_100
+    assert asyncio.run(scenario()) == pytest.approx(0.3, abs=0.1)
+
+
+def test_streams_are_retried_only_before_the_first_chunk() -> None:
+    class BreaksMidStream(FakeLLm):
+        async def stream_completion(self, system_prompt, user_prompt, dto):
+            self.async_calls += 1
+            yield '{"content": "'
+            raise openai.APIConnectionError(request=None)
+
+    async def collect(llm: RateLimitedLLm) -> list[str]:
+        return [
+            chunk
+            async for chunk in llm.stream_completion(
+                SYSTEM_PROMPT, "t", SummaryLLMOutput
+            )
+        ]
+
+    fake = FakeLLm(errors=[rate_limit_error("0.01")])
+    assert len(asyncio.run(collect(_limited(fake)))) == 1
+    assert fake.async_calls == 2
+
+    breaking = BreaksMidStream()
+    with pytest.raises(openai.APIConnectionError):
+        asyncio.run(collect(_limited(breaking)))
+    assert breaking.async_calls == 1
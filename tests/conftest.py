@@ -0,0 +1,5 @@
+import os
+
+# app.configurations builds its settings at import time; router tests never hit
+# OpenAI, so a placeholder key is enough when no .env is present.
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
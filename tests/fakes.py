@@ -0,0 +1,41 @@
+import asyncio
+
+import pydantic
+
+from app.ports.llm import LLm
+from app.schemas.llm_responses import SummaryLLMOutput
+
+
+class FakeLLm(LLm):
+    """Scripted LLm for tests: injected errors in order, call and concurrency counts."""
+
+    def __init__(
+        self, latency: float = 0.0, errors: list[BaseException] | None = None
+    ) -> None:
+        self._latency = latency
+        self._errors = list(errors or [])
+        self.async_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.user_prompts: list[str] = []
+
+    def run_completion(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        raise AssertionError("request handlers must use run_completion_async")
+
+    async def run_completion_async(
+        self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]
+    ) -> pydantic.BaseModel:
+        self.async_calls += 1
+        self.user_prompts.append(user_prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self._latency:
+                await asyncio.sleep(self._latency)
+            if self._errors:
+                raise self._errors.pop(0)
+            return SummaryLLMOutput(content="fake summary", ctas=["first", "second"])
+        finally:
+            self.in_flight -= 1
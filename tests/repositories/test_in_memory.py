@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from app.domain.entities import IdPage, Summary
+from app.repositories.in_memory import (
+    BoundedInMemorySummaryRepository,
+    InMemorySummaryRepository,
+)
+
+
+def _summary(id: str) -> Summary:
+    return Summary(id=id, content=f"summary {id}", ctas=["call"])
+
+
+def test_list_ids_pages_in_insertion_order() -> None:
+    repository = InMemorySummaryRepository()
+
+    async def scenario() -> list[IdPage]:
+        await repository.save_many([_summary(str(i)) for i in range(5)])
+        first = await repository.list_ids(limit=2)
+        # Overwrites and new writes must not shift pages already handed out.
+        await repository.save(_summary("0"))
+        await repository.save(_summary("5"))
+        second = await repository.list_ids(cursor=first.next_cursor, limit=2)
+        last = await repository.list_ids(cursor=second.next_cursor, limit=2)
+        return [first, second, last]
+
+    pages = asyncio.run(scenario())
+
+    assert pages == [
+        IdPage(ids=["0", "1"], next_cursor="2"),
+        IdPage(ids=["2", "3"], next_cursor="4"),
+        IdPage(ids=["4", "5"], next_cursor=None),
+    ]
+
+
+def test_malformed_cursor_is_rejected() -> None:
+    repository = InMemorySummaryRepository()
+
+    with pytest.raises(ValueError):
+        asyncio.run(repository.list_ids(cursor="abc"))
+    with pytest.raises(ValueError):
+        asyncio.run(repository.list_ids(cursor="-1"))
+
+
+def test_get_many_keeps_request_order_and_skips_missing() -> None:
+    repository = InMemorySummaryRepository()
+
+    async def scenario() -> list[Summary]:
+        await repository.save_many([_summary("a"), _summary("b")])
+        return await repository.get_many(["b", "missing", "a"])
+
+    assert asyncio.run(scenario()) == [_summary("b"), _summary("a")]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bounded_repository_round_trips_compressed_and_plain_summaries() -> None:
+    repository = BoundedInMemorySummaryRepository(compress_min_bytes=100)
+    long = Summary(id="long", content="word " * 200, ctas=["ça va", "call"])
+
+    async def scenario() -> list[Summary | None]:
+        await repository.save_many([_summary("short"), long])
+        return [
+            await repository.get_by_id("short"),
+            await repository.get_by_id("long"),
+            await repository.get_by_id("missing"),
+        ]
+
+    assert asyncio.run(scenario()) == [_summary("short"), long, None]
+    stats = repository.stats()
+    assert (stats.entries, stats.compressed_entries) == (2, 1)
+    assert stats.bytes > 0
+
+
+def test_bounded_repository_evicts_least_recently_used() -> None:
+    repository = BoundedInMemorySummaryRepository(max_entries=2)
+
+    async def scenario() -> list[Summary]:
+        await repository.save_many([_summary("a"), _summary("b")])
+        await repository.get_by_id("a")
+        await repository.save(_summary("c"))
+        return await repository.get_many(["a", "b", "c"])
+
+    assert [summary.id for summary in asyncio.run(scenario())] == ["a", "c"]
+    assert repository.stats().evictions == 1
+
+
+def test_bounded_repository_enforces_the_byte_cap() -> None:
+    repository = BoundedInMemorySummaryRepository(max_entries=None, max_bytes=4_000)
+
+    async def scenario() -> None:
+        await repository.save_many([_summary(str(i)) for i in range(100)])
+
+    asyncio.run(scenario())
+
+    stats = repository.stats()
+    assert 0 < stats.entries < 100
+    assert stats.bytes <= 4_000
+
+
+def test_bounded_repository_expires_entries() -> None:
+    clock = FakeClock()
+    repository = BoundedInMemorySummaryRepository(ttl_seconds=10, clock=clock)
+
+    async def scenario() -> tuple[Summary | None, IdPage]:
+        await repository.save_many([_summary("a"), _summary("b")])
+        clock.now = 5
+        await repository.save(_summary("b"))
+        clock.now = 11
+        return await repository.get_by_id("a"), await repository.list_ids()
+
+    missing, page = asyncio.run(scenario())
+
+    assert missing is None
+    assert page == IdPage(ids=["b"], next_cursor=None)
+    assert repository.stats().expirations == 1
+
+
+def test_bounded_repository_pages_stay_stable_under_eviction() -> None:
+    repository = BoundedInMemorySummaryRepository(max_entries=4)
+
+    async def scenario() -> list[IdPage]:
+        await repository.save_many([_summary(str(i)) for i in range(4)])
+        first = await repository.list_ids(limit=2)
+        # Evicts 0, 1 and 2, which are already listed or on the next page.
+        await repository.save_many([_summary(str(i)) for i in range(4, 7)])
+        second = await repository.list_ids(cursor=first.next_cursor, limit=2)
+        last = await repository.list_ids(cursor=second.next_cursor, limit=2)
+        return [first, second, last]
+
+    pages = asyncio.run(scenario())
+
+    assert pages[0] == IdPage(ids=["0", "1"], next_cursor="2")
+    assert pages[1].ids == ["3", "4"]
+    assert pages[2] == IdPage(ids=["5", "6"], next_cursor=None)
+    with pytest.raises(ValueError):
+        asyncio.run(repository.list_ids(cursor="abc"))
@@ -0,0 +1,123 @@
+import asyncio
+
+import fakeredis
+
+from app.domain.entities import Job, JobItemResult, JobStatus, Summary
+from app.repositories.redis import RedisJobRepository, RedisSummaryRepository
+
+
+def _summary(id: str) -> Summary:
+    return Summary(id=id, content=f"Resumen {id} ✓", ctas=["call", "email"])
+
+
+def test_save_and_get_round_trip() -> None:
+    client = fakeredis.FakeAsyncRedis()
+    repository = RedisSummaryRepository(client)
+
+    async def scenario() -> tuple[Summary | None, Summary | None, bytes, list[bool]]:
+        await repository.save(_summary("a"))
+        return (
+            await repository.get_by_id("a"),
+            await repository.get_by_id("missing"),
+            await client.get("summary:a"),
+            [await repository.exists("a"), await repository.exists("missing")],
+        )
+
+    found, missing, raw, exists = asyncio.run(scenario())
+
+    assert found == _summary("a")
+    assert missing is None
+    assert exists == [True, False]
+    assert raw == '["Resumen a ✓",["call","email"]]'.encode()
+
+
+def test_save_many_pipelines_and_applies_ttl() -> None:
+    client = fakeredis.FakeAsyncRedis()
+    repository = RedisSummaryRepository(client, key_prefix="test:", ttl_seconds=60)
+
+    async def scenario() -> tuple[list[str], int]:
+        await repository.save_many([_summary("a"), _summary("b"), _summary("c")])
+        return (await repository.list_ids()).ids, await client.ttl("test:b")
+
+    ids, ttl = asyncio.run(scenario())
+
+    assert sorted(ids) == ["a", "b", "c"]
+    assert 0 < ttl <= 60
+
+
+def test_cursor_pagination_and_bulk_fetch() -> None:
+    repository = RedisSummaryRepository(fakeredis.FakeAsyncRedis())
+
+    async def scenario() -> tuple[list[str], list[Summary]]:
+        await repository.save_many([_summary(str(i)) for i in range(25)])
+        ids: list[str] = []
+        page = await repository.list_ids(limit=10)
+        ids.extend(page.ids)
+        while page.next_cursor is not None:
+            page = await repository.list_ids(cursor=page.next_cursor, limit=10)
+            ids.extend(page.ids)
+        return ids, await repository.get_many(["3", "missing", "1"])
+
+    ids, summaries = asyncio.run(scenario())
+
+    assert sorted(set(ids), key=int) == [str(i) for i in range(25)]
+    assert summaries == [_summary("3"), _summary("1")]
+
+
+def test_job_repository_tracks_progress_and_pending_items() -> None:
+    repository = RedisJobRepository(fakeredis.FakeAsyncRedis())
+    job = Job(id="job-1", total=3, created_at=1.0)
+
+    async def scenario() -> tuple:
+        await repository.create(job, ["a", "b", "c"])
+        await repository.record_result("job-1", JobItemResult(index=1, summary_id="s"))
+        await repository.record_result("job-1", JobItemResult(index=1, error="dup"))
+        await repository.record_result("job-1", JobItemResult(index=2, error="boom"))
+        pending = await repository.pending_items("job-1")
+        unfinished = await repository.list_unfinished()
+        await repository.set_status("job-1", JobStatus.COMPLETED)
+        return (
+            pending,
+            unfinished,
+            await repository.get("job-1"),
+            await repository.list_results("job-1", 0, 10),
+            await repository.list_unfinished(),
+        )
+
+    pending, unfinished, stored, results, unfinished_after = asyncio.run(scenario())
+
+    assert pending == [(0, "a")]
+    assert unfinished == ["job-1"]
+    assert stored == Job(
+        id="job-1",
+        total=3,
+        created_at=1.0,
+        status=JobStatus.COMPLETED,
+        completed=1,
+        failed=1,
+    )
+    assert results == [
+        JobItemResult(index=1, summary_id="s"),
+        JobItemResult(index=2, error="boom"),
+    ]
+    assert unfinished_after == []
+
+
+def test_job_lease_has_one_owner_until_released_or_expired() -> None:
+    repository = RedisJobRepository(fakeredis.FakeAsyncRedis())
+
+    async def scenario() -> list[bool]:
+        outcomes = [
+            await repository.acquire_lease("job-1", "a", 10),
+            await repository.acquire_lease("job-1", "b", 10),
+            await repository.renew_lease("job-1", "b", 10),
+        ]
+        await repository.release_lease("job-1", "b")
+        outcomes.append(await repository.renew_lease("job-1", "a", 10))
+        await repository.release_lease("job-1", "a")
+        outcomes.append(await repository.acquire_lease("job-1", "b", 0.05))
+        await asyncio.sleep(0.1)
+        outcomes.append(await repository.acquire_lease("job-1", "a", 10))
+        return outcomes
+
+    assert asyncio.run(scenario()) == [True, False, False, True, True, True]
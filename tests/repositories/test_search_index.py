@@ -0,0 +1,149 @@
+import asyncio
+
+from app.domain.entities import Summary
+from app.repositories.in_memory import (
+    BoundedInMemorySummaryRepository,
+    InMemorySummaryRepository,
+)
+from app.repositories.search_index import IndexedSummaryRepository, InvertedIndex
+
+
+def test_ranking_prefers_rare_and_repeated_terms() -> None:
+    index = InvertedIndex()
+    index.add("pricing", "Pricing pricing review for the new pricing tiers.")
+    index.add("mention", "Team review, with a short note on pricing.")
+    index.add("other", "Quarterly hiring review.")
+
+    assert [id for id, _ in index.search("PRICING", 0, 10)] == ["pricing", "mention"]
+    assert [id for id, _ in index.search("pricing review", 0, 10)] == [
+        "pricing",
+        "mention",
+        "other",
+    ]
+    assert index.search("the of and", 0, 10) == []
+
+
+def test_reindexed_and_removed_ids_leave_no_stale_hits() -> None:
+    index = InvertedIndex()
+    index.add("a", "budget planning")
+    index.add("b", "budget review")
+    index.add("a", "hiring plan")
+    index.remove("b")
+
+    assert index.search("budget", 0, 10) == []
+    assert [id for id, _ in index.search("hiring budget", 0, 10)] == ["a"]
+    assert len(index) == 1
+
+
+def test_removed_documents_no_longer_count_towards_the_average_length() -> None:
+    fresh = InvertedIndex()
+    fresh.add("a", "budget")
+    fresh.add("b", "pricing")
+    reindexed = InvertedIndex()
+    reindexed.add("a", "budget")
+    reindexed.add("long", "quarterly roadmap " * 50)
+    reindexed.remove("long")
+    reindexed.add("b", "pricing")
+
+    assert reindexed.search("pricing", 0, 10) == fresh.search("pricing", 0, 10)
+
+
+def test_postings_budget_bounds_the_documents_scored() -> None:
+    index = InvertedIndex(max_postings=8)
+    for number in range(100):
+        index.add(str(number), "goal roadmap")
+
+    hits = index.search("goal roadmap", 0, 2)
+
+    # Newest first among equal scores, reading no further than the budget.
+    assert [id for id, _ in hits] == ["99", "98"]
+
+
+def test_search_pages_through_hits_saved_through_the_repository() -> None:
+    repository = IndexedSummaryRepository(InMemorySummaryRepository())
+
+    async def scenario():
+        await repository.save_many(
+            [
+                Summary(id=str(i), content=f"session {i} about pricing", ctas=[])
+                for i in range(3)
+            ]
+        )
+        await repository.save(
+            Summary(id="cta", content="hiring", ctas=["Send the pricing deck."])
+        )
+        first = await repository.search("pricing", limit=3)
+        last = await repository.search("pricing", cursor=first.next_cursor, limit=3)
+        return first, last
+
+    first, last = asyncio.run(scenario())
+
+    ids = [hit.summary.id for hit in first.hits + last.hits]
+    assert sorted(ids) == ["0", "1", "2", "cta"]
+    assert first.next_cursor == "3" and last.next_cursor is None
+    assert all(hit.score > 0 for hit in first.hits)
+
+
+def test_hits_evicted_from_the_store_are_dropped() -> None:
+    repository = IndexedSummaryRepository(
+        BoundedInMemorySummaryRepository(max_entries=1, max_bytes=None)
+    )
+
+    async def scenario():
+        await repository.save(Summary(id="old", content="pricing", ctas=[]))
+        await repository.save(Summary(id="new", content="pricing", ctas=[]))
+        return await repository.search("pricing")
+
+    page = asyncio.run(scenario())
+
+    assert [hit.summary.id for hit in page.hits] == ["new"]
+    assert len(repository.index) == 1
+
+
+def test_summaries_evicted_or_expired_from_the_store_leave_the_index() -> None:
+    class FakeClock:
+        now = 0.0
+
+        def __call__(self) -> float:
+            return self.now
+
+    clock = FakeClock()
+    index = InvertedIndex()
+    repository = IndexedSummaryRepository(
+        BoundedInMemorySummaryRepository(
+            max_entries=100,
+            max_bytes=None,
+            ttl_seconds=60,
+            clock=clock,
+            on_remove=index.remove,
+        ),
+        index,
+    )
+
+    async def scenario():
+        for number in range(2_000):
+            await repository.save(
+                Summary(id=str(number), content=f"pricing {number}", ctas=[])
+            )
+        evicted = len(index)
+        clock.now = 61
+        await repository.save(Summary(id="fresh", content="pricing", ctas=[]))
+        return evicted
+
+    assert asyncio.run(scenario()) == 100
+    assert len(index) == 1
+
+
+def test_empty_summaries_are_indexed_without_terms() -> None:
+    repository = IndexedSummaryRepository(InMemorySummaryRepository())
+
+    async def scenario():
+        await repository.save(Summary(id="x", content="", ctas=[]))
+        await repository.save(Summary(id="y", content="the and of", ctas=[]))
+        await repository.save(Summary(id="z", content="pricing", ctas=[]))
+        return await repository.search("pricing")
+
+    page = asyncio.run(scenario())
+
+    assert [hit.summary.id for hit in page.hits] == ["z"]
+    assert len(repository.index) == 3
@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.domain.entities import Summary
+from app.main import app
+from app.repositories.in_memory import InMemorySummaryRepository
+
+
+def test_llm_cache_stats_are_exposed() -> None:
+    with TestClient(app) as client:
+        response = client.get("/extras/llm_cache_stats")
+
+    assert response.status_code == 200
+    assert response.json()["hits"] == 0
+    assert set(response.json()) >= {"hits", "misses", "coalesced"}
+
+
+def test_paginated_listing_and_bulk_fetch() -> None:
+    with TestClient(app) as client:
+        assert client.portal is not None
+        repository = dependencies.get_summary_repository()
+        client.portal.call(
+            repository.save_many,
+            [Summary(id=str(i), content=f"summary {i}", ctas=[]) for i in range(3)],
+        )
+        first = client.get("/extras/list_summaries_ids", params={"limit": 2}).json()
+        last = client.get(
+            "/extras/list_summaries_ids",
+            params={"cursor": first["next_cursor"], "limit": 2},
+        ).json()
+        invalid = client.get("/extras/list_summaries_ids", params={"cursor": "x"})
+        everything = client.get("/extras/get_summaries_ids").json()
+        bulk = client.post("/extras/get_summaries_by_ids", json=["2", "nope", "0"])
+
+    assert first == {"ids": ["0", "1"], "next_cursor": "2"}
+    assert last == {"ids": ["2"], "next_cursor": None}
+    assert invalid.status_code == 400
+    assert everything == ["0", "1", "2"]
+    assert [summary["id"] for summary in bulk.json()] == ["2", "0"]
+
+
+def test_search_summaries() -> None:
+    with TestClient(app) as client:
+        assert client.portal is not None
+        repository = dependencies.get_summary_repository()
+        client.portal.call(
+            repository.save_many,
+            [
+                Summary(id="p", content="Pricing of the coaching plan", ctas=[]),
+                Summary(id="h", content="Hiring backlog", ctas=["Review pricing"]),
+            ],
+        )
+        found = client.get(
+            "/extras/search_summaries", params={"query": "pricing", "limit": 1}
+        ).json()
+        invalid = client.get(
+            "/extras/search_summaries", params={"query": "pricing", "cursor": "x"}
+        )
+
+    assert [item["summary"]["id"] for item in found["items"]] == ["p"]
+    assert found["next_cursor"] == "1"
+    assert invalid.status_code == 400
+
+
+def test_search_is_not_implemented_without_an_index() -> None:
+    repository = InMemorySummaryRepository()
+    app.dependency_overrides[dependencies.get_summary_repository] = lambda: repository
+    try:
+        with TestClient(app) as client:
+            response = client.get(
+                "/extras/search_summaries", params={"query": "pricing"}
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 501
@@ -0,0 +1,54 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.main import app
+from app.services.jobs import JobWorkerPool
+from app.services.summarizer import TranscriptSummarizer
+from tests.fakes import FakeLLm
+
+TRANSCRIPT = "Coach: How did the sprint go? Client: Better than expected."
+
+
+def test_submit_poll_and_page_results() -> None:
+    with TestClient(app) as client:
+        assert client.portal is not None
+        pool = JobWorkerPool(
+            TranscriptSummarizer(FakeLLm()),
+            dependencies.get_job_repository(),
+            dependencies.get_summary_repository(),
+        )
+        client.portal.call(pool.start)
+        app.dependency_overrides[dependencies.get_job_worker_pool] = lambda: pool
+        try:
+            submitted = client.post(
+                "/jobs/submit", json=[f"{TRANSCRIPT} #{i}" for i in range(5)]
+            )
+            job_id = submitted.json()["id"]
+            deadline = time.monotonic() + 5
+            status = client.get("/jobs/get_status", params={"job_id": job_id})
+            while status.json()["status"] != "completed":
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+                status = client.get("/jobs/get_status", params={"job_id": job_id})
+            first_page = client.get(
+                "/jobs/get_results", params={"job_id": job_id, "limit": 3}
+            ).json()
+            last_page = client.get(
+                "/jobs/get_results",
+                params={"job_id": job_id, "offset": first_page["next_offset"]},
+            ).json()
+            missing = client.get("/jobs/get_status", params={"job_id": "missing"})
+        finally:
+            app.dependency_overrides.clear()
+            client.portal.call(pool.stop)
+
+    assert submitted.status_code == 202
+    assert status.json()["completed"] == 5
+    assert [item["index"] for item in first_page["items"]] == [0, 1, 2]
+    assert first_page["next_offset"] == 3
+    assert [item["index"] for item in last_page["items"]] == [3, 4]
+    assert last_page["next_offset"] is None
+    assert last_page["items"][0]["summary"]["summary"] == "fake summary"
+    assert missing.status_code == 404
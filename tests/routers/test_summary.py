@@ -0,0 +1,363 @@
+import asyncio
+import gzip
+import json
+import time
+from collections.abc import AsyncGenerator
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app import builders, dependencies
+from app.adapters.fake import FakeLLMAdapter
+from app.domain.entities import Summary
+from app.main import app
+from app.ports.llm import LLm
+from app.repositories.in_memory import InMemorySummaryRepository
+from app.routers import summary
+from app.services.packer import TranscriptPacker
+from app.services.summarizer import TranscriptSummarizer
+from tests.fakes import FakeLLm
+
+TRANSCRIPT = "Coach: How did the sprint go? Client: Better than expected."
+
+
+def test_lifespan_shares_one_adapter_and_releases_it() -> None:
+    with TestClient(app):
+        llm = dependencies.get_llm_service()
+        assert isinstance(llm, LLm)
+        assert dependencies.get_llm_service() is llm
+
+    assert dependencies._llm_service is None
+
+
+def test_get_summary_and_ctas_uses_async_completion() -> None:
+    fake = FakeLLm()
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: fake
+    try:
+        with TestClient(app) as client:
+            response = client.get(
+                "/summary_maker/get_summary_and_ctas",
+                params={"text_to_summary": TRANSCRIPT},
+            )
+            stored = client.get(
+                "/summary_maker/get_summary_and_ctas_by_id",
+                params={"id": response.json()["id"]},
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == "fake summary"
+    assert stored.json()["ctas"] == ["first", "second"]
+    assert fake.async_calls == 1
+
+
+def test_get_summary_and_ctas_does_not_block_event_loop() -> None:
+    latency = 0.2
+    fake = FakeLLm(latency=latency)
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: fake
+
+    async def run_concurrently() -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                started = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(
+                        client.get(
+                            "/summary_maker/get_summary_and_ctas",
+                            params={"text_to_summary": TRANSCRIPT},
+                        )
+                        for _ in range(5)
+                    )
+                )
+                elapsed = time.perf_counter() - started
+        assert all(response.status_code == 200 for response in responses)
+        return elapsed
+
+    try:
+        elapsed = asyncio.run(run_concurrently())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert elapsed < latency * 3
+
+
+def test_batch_results_are_stored() -> None:
+    fake = FakeLLm()
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: fake
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/summary_maker/async_get_summary_and_ctas",
+                json=[TRANSCRIPT, TRANSCRIPT + " Again."],
+            )
+            ids = client.get("/extras/get_summaries_ids").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    items = response.json()["items"]
+    assert [item["summary"]["id"] for item in items] == ids
+
+
+def test_batch_is_packed_into_one_call_when_packing_is_enabled() -> None:
+    llm = FakeLLMAdapter()
+    packer = TranscriptPacker(llm, window_seconds=0.01)
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: llm
+    app.dependency_overrides[dependencies.get_transcript_packer] = lambda: packer
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/summary_maker/async_get_summary_and_ctas",
+                json=[f"{TRANSCRIPT} ({index})" for index in range(4)],
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    items = response.json()["items"]
+    assert llm.calls == 1
+    assert len({item["summary"]["summary"] for item in items}) == 4
+
+
+def test_stream_yields_indexed_items_and_stores_them() -> None:
+    fake = FakeLLm()
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: fake
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/summary_maker/async_get_summary_and_ctas/stream",
+                json=[TRANSCRIPT, "too short", TRANSCRIPT + " Again."],
+            )
+            assert response.status_code == 422
+
+            response = client.post(
+                "/summary_maker/async_get_summary_and_ctas/stream",
+                json=[TRANSCRIPT, TRANSCRIPT + " Again."],
+            )
+            ids = client.get("/extras/get_summaries_ids").json()
+            sse = client.post(
+                "/summary_maker/async_get_summary_and_ctas/stream?format=sse",
+                json=[TRANSCRIPT],
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(item["index"] for item in items) == [0, 1]
+    assert sorted(item["summary"]["id"] for item in items) == sorted(ids)
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("data: {") and sse.text.endswith("\n\n")
+
+
+def test_stream_cancels_outstanding_calls_when_closed() -> None:
+    class SlowAfterFirst(FakeLLm):
+        async def run_completion_async(self, system_prompt, user_prompt, dto):
+            if "slow" in user_prompt:
+                self.cancelled = 0
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    raise
+            return await super().run_completion_async(system_prompt, user_prompt, dto)
+
+    fake = SlowAfterFirst()
+
+    async def scenario() -> dict:
+        response = await summary.stream_get_summary_and_ctas(
+            [TRANSCRIPT, "slow " + TRANSCRIPT],
+            output_format="ndjson",
+            summarizer=TranscriptSummarizer(fake),
+            repository=InMemorySummaryRepository(),
+            scheduler=None,
+        )
+        body = response.body_iterator
+        assert isinstance(body, AsyncGenerator)
+        first = await anext(body)
+        await body.aclose()
+        await asyncio.sleep(0)
+        return json.loads(first)
+
+    first = asyncio.run(scenario())
+
+    assert first["index"] == 0
+    assert fake.cancelled == 1
+
+
+def test_stream_cancels_outstanding_calls_through_the_llm_service(
+    monkeypatch,
+) -> None:
+    class SlowBackend(FakeLLm):
+        cancelled = 0
+
+        async def run_completion_async(self, system_prompt, user_prompt, dto):
+            if "slow" in user_prompt:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    raise
+            return await super().run_completion_async(system_prompt, user_prompt, dto)
+
+    backend = SlowBackend()
+    monkeypatch.setattr(builders, "build_llm_backend", lambda *args: backend)
+    monkeypatch.setattr(builders.settings, "LLM_CACHE_ENABLED", True)
+
+    async def scenario() -> int:
+        response = await summary.stream_get_summary_and_ctas(
+            [TRANSCRIPT, "slow " + TRANSCRIPT],
+            output_format="ndjson",
+            summarizer=TranscriptSummarizer(builders.build_llm_service()),
+            repository=InMemorySummaryRepository(),
+            scheduler=None,
+        )
+        body = response.body_iterator
+        assert isinstance(body, AsyncGenerator)
+        await anext(body)
+        await body.aclose()
+        await asyncio.sleep(0.01)
+        # Read before asyncio.run cancels whatever is left on the loop.
+        return backend.cancelled
+
+    cancelled = asyncio.run(scenario())
+
+    assert cancelled == 1
+
+
+def test_single_summary_stream_sends_content_and_ctas_before_the_summary() -> None:
+    llm = FakeLLMAdapter(stream_chunk_chars=4)
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: llm
+    try:
+        with TestClient(app) as client:
+            response = client.get(
+                "/summary_maker/get_summary_and_ctas/stream",
+                params={"text_to_summary": TRANSCRIPT},
+            )
+            final = json.loads(response.text.splitlines()[-1])["summary"]
+            stored = client.get(
+                "/summary_maker/get_summary_and_ctas_by_id",
+                params={"id": final["id"]},
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["type"] for event in events][-4:] == ["cta", "cta", "cta", "summary"]
+    contents = [event["content"] for event in events if event["type"] == "content"]
+    assert len(contents) > 1
+    assert "".join(contents) == final["summary"] == stored.json()["content"]
+    ctas = [event for event in events if event["type"] == "cta"]
+    assert [(cta["index"], cta["cta"]) for cta in ctas] == list(
+        enumerate(final["ctas"])
+    )
+
+
+def test_single_summary_stream_ends_with_an_error_event() -> None:
+    fake = FakeLLm(errors=[RuntimeError("backend down")])
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: fake
+    try:
+        with TestClient(app) as client:
+            response = client.get(
+                "/summary_maker/get_summary_and_ctas/stream",
+                params={"text_to_summary": TRANSCRIPT, "format": "sse"},
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.text == 'data: {"type":"error","error":"backend down"}\n\n'
+
+
+def test_post_summary_accepts_json_text_and_gzip_bodies() -> None:
+    fake = FakeLLm()
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: fake
+    try:
+        with TestClient(app) as client:
+            url = "/summary_maker/get_summary_and_ctas"
+            responses = [
+                client.post(url, json={"text_to_summary": TRANSCRIPT}),
+                client.post(
+                    url, content=TRANSCRIPT, headers={"Content-Type": "text/plain"}
+                ),
+                client.post(
+                    url,
+                    content=gzip.compress(
+                        json.dumps({"text_to_summary": TRANSCRIPT}).encode()
+                    ),
+                    headers={
+                        "Content-Type": "application/json",
+                        "Content-Encoding": "gzip",
+                    },
+                ),
+            ]
+            too_short = client.post(
+                url, content="short", headers={"Content-Type": "text/plain"}
+            )
+            unsupported = client.post(
+                url, content=b"<t/>", headers={"Content-Type": "application/xml"}
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert all(response.json()["summary"] == "fake summary" for response in responses)
+    assert fake.user_prompts[0] == fake.user_prompts[1] == fake.user_prompts[2]
+    assert too_short.status_code == 422
+    assert too_short.json()["detail"][0]["loc"] == ["body"]
+    assert unsupported.status_code == 415
+
+
+def test_summary_by_id_is_cached_and_revalidated_with_its_etag() -> None:
+    class CountingRepository(InMemorySummaryRepository):
+        reads = 0
+
+        async def get_by_id(self, id):
+            self.reads += 1
+            return await super().get_by_id(id)
+
+    repository = CountingRepository()
+    asyncio.run(repository.save(Summary(id="short", content="Sprint", ctas=["a"])))
+    asyncio.run(repository.save(Summary(id="long", content="x" * 4096, ctas=[])))
+    app.dependency_overrides[dependencies.get_summary_repository] = lambda: repository
+    path = "/summary_maker/get_summary_and_ctas_by_id"
+    try:
+        with TestClient(app) as client:
+            first = client.get(path, params={"id": "short"})
+            etag = first.headers["etag"]
+            revalidated = client.get(
+                path, params={"id": "short"}, headers={"If-None-Match": etag}
+            )
+            changed = client.get(
+                path, params={"id": "short"}, headers={"If-None-Match": '"other"'}
+            )
+            missing = client.get(path, params={"id": "missing"})
+            compressed = client.get(
+                path, params={"id": "long"}, headers={"Accept-Encoding": "gzip"}
+            )
+            compressed_revalidated = client.get(
+                path,
+                params={"id": "long"},
+                headers={
+                    "Accept-Encoding": "gzip",
+                    "If-None-Match": compressed.headers["etag"],
+                },
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.json() == {"id": "short", "content": "Sprint", "ctas": ["a"]}
+    assert etag.startswith('"') and "immutable" in first.headers["cache-control"]
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert changed.status_code == 200
+    assert missing.status_code == 404
+    # Compressed bytes only get a weak ETag, which still revalidates.
+    assert compressed.headers["etag"].startswith('W/"')
+    assert compressed_revalidated.status_code == 304
+    # One read each for "short", "missing" and "long"; the rest were cached.
+    assert repository.reads == 3
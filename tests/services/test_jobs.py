@@ -0,0 +1,154 @@
+import asyncio
+
+import fakeredis
+
+from app.domain.entities import Job, JobItemResult, JobStatus
+from app.repositories.in_memory import InMemoryJobRepository, InMemorySummaryRepository
+from app.repositories.redis import RedisJobRepository
+from app.services.jobs import JobWorkerPool
+from app.services.summarizer import TranscriptSummarizer
+from tests.fakes import FakeLLm
+
+
+def test_submitted_job_is_processed_with_bounded_concurrency() -> None:
+    fake = FakeLLm(latency=0.01)
+    jobs = InMemoryJobRepository()
+    summaries = InMemorySummaryRepository()
+    pool = JobWorkerPool(
+        TranscriptSummarizer(fake), jobs, summaries, workers=1, item_concurrency=3
+    )
+
+    async def scenario() -> tuple[Job | None, list[JobItemResult], list[str]]:
+        await pool.start()
+        job = await pool.submit([f"transcript {i}" for i in range(10)])
+        await pool.join()
+        await pool.stop()
+        return (
+            await jobs.get(job.id),
+            await jobs.list_results(job.id, 0, 100),
+            (await summaries.list_ids()).ids,
+        )
+
+    job, results, stored_ids = asyncio.run(scenario())
+
+    assert job is not None
+    assert (job.status, job.completed, job.failed) == (JobStatus.COMPLETED, 10, 0)
+    assert [result.index for result in results] == list(range(10))
+    assert sorted(str(result.summary_id) for result in results) == sorted(stored_ids)
+    assert fake.max_in_flight == 3
+
+
+def test_unfinished_jobs_resume_with_remaining_items_only() -> None:
+    fake = FakeLLm(errors=[ValueError("boom")])
+    jobs = InMemoryJobRepository()
+    job = Job(id="job-1", total=3, created_at=0.0, status=JobStatus.RUNNING)
+
+    async def scenario() -> Job | None:
+        await jobs.create(job, ["first", "second", "third"])
+        await jobs.record_result("job-1", JobItemResult(index=0, summary_id="s-0"))
+        pool = JobWorkerPool(
+            TranscriptSummarizer(fake), jobs, InMemorySummaryRepository()
+        )
+        await pool.start()
+        await pool.join()
+        await pool.stop()
+        return await jobs.get("job-1")
+
+    resumed = asyncio.run(scenario())
+
+    assert fake.async_calls == 2
+    assert "first" not in "".join(fake.user_prompts)
+    assert resumed is not None
+    assert (resumed.status, resumed.completed, resumed.failed) == (
+        JobStatus.COMPLETED,
+        2,
+        1,
+    )
+
+
+def test_replicas_sharing_a_repository_resume_a_job_once() -> None:
+    fake = FakeLLm(latency=0.01)
+    jobs = RedisJobRepository(fakeredis.FakeAsyncRedis())
+    job = Job(id="job-1", total=4, created_at=0.0, status=JobStatus.RUNNING)
+
+    async def scenario() -> Job | None:
+        await jobs.create(job, [f"transcript {i}" for i in range(4)])
+        pools = [
+            JobWorkerPool(TranscriptSummarizer(fake), jobs, InMemorySummaryRepository())
+            for _ in range(2)
+        ]
+        for pool in pools:
+            await pool.start()
+        for pool in pools:
+            await pool.join()
+            await pool.stop()
+        return await jobs.get("job-1")
+
+    resumed = asyncio.run(scenario())
+
+    assert fake.async_calls == 4
+    assert resumed is not None
+    assert (resumed.status, resumed.completed) == (JobStatus.COMPLETED, 4)
+
+
+class ExpiringLeaseJobRepository(InMemoryJobRepository):
+    async def renew_lease(self, job_id: str, owner: str, ttl_seconds: float) -> bool:
+        return False
+
+
+def test_job_stops_when_its_lease_is_lost() -> None:
+    fake = FakeLLm(latency=0.05)
+    jobs = ExpiringLeaseJobRepository()
+    pool = JobWorkerPool(
+        TranscriptSummarizer(fake),
+        jobs,
+        InMemorySummaryRepository(),
+        item_concurrency=1,
+        lease_seconds=0.03,
+    )
+
+    async def scenario() -> Job | None:
+        await pool.start()
+        job = await pool.submit([f"transcript {i}" for i in range(5)])
+        await pool.join()
+        await pool.stop()
+        return await jobs.get(job.id)
+
+    stopped = asyncio.run(scenario())
+
+    assert stopped is not None
+    assert stopped.status is JobStatus.RUNNING
+    assert stopped.completed < 5
+
+
+class FailingRecordJobRepository(InMemoryJobRepository):
+    async def record_result(self, job_id: str, result: JobItemResult) -> None:
+        if result.index == 0:
+            raise ConnectionError("store unavailable")
+        await super().record_result(job_id, result)
+
+
+def test_a_failing_consumer_stops_the_others_of_its_job() -> None:
+    fake = FakeLLm(latency=0.01)
+    jobs = FailingRecordJobRepository()
+    pool = JobWorkerPool(
+        TranscriptSummarizer(fake),
+        jobs,
+        InMemorySummaryRepository(),
+        item_concurrency=2,
+        lease_seconds=60,
+    )
+
+    async def scenario() -> tuple[int, int]:
+        await pool.start()
+        await pool.submit([f"transcript {i}" for i in range(10)])
+        await pool.join()
+        calls_when_released = fake.async_calls
+        await asyncio.sleep(0.05)
+        calls_later = fake.async_calls
+        await pool.stop()
+        return calls_when_released, calls_later
+
+    calls_when_released, calls_later = asyncio.run(scenario())
+
+    assert calls_later == calls_when_released < 10
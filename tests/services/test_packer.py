@@ -0,0 +1,212 @@
+import asyncio
+
+import pydantic
+
+from app.adapters.cached import CachedLLm
+from app.adapters.fake import FakeLLMAdapter
+from app.ports.llm import LLm
+from app.prompts import RAW_USER_PROMPT, SYSTEM_PROMPT
+from app.schemas.llm_responses import (
+    PackedSummariesLLMOutput,
+    PackedSummaryLLMOutput,
+    SummaryLLMOutput,
+)
+from app.services.packer import TranscriptPacker
+from app.services.scheduler import (
+    CallContext,
+    LLMScheduler,
+    ScheduledLLm,
+    current_call_context,
+    set_call_context,
+)
+from app.services.summarizer import TranscriptSummarizer
+from tests.fakes import FakeLLm
+
+TRANSCRIPTS = [f"Coach: How did week {week} go? Client: Fine." for week in range(5)]
+
+
+class ScriptedPackedLLm(LLm):
+    """Answers packed calls with a fixed item list, single calls with the fake."""
+
+    def __init__(self, items: list[PackedSummaryLLMOutput]) -> None:
+        self._items = items
+        self.dtos: list[type[pydantic.BaseModel]] = []
+
+    def run_completion(self, system_prompt, user_prompt, dto):
+        raise AssertionError("the packer must use run_completion_async")
+
+    async def run_completion_async(self, system_prompt, user_prompt, dto):
+        self.dtos.append(dto)
+        if dto is PackedSummariesLLMOutput:
+            return PackedSummariesLLMOutput(items=self._items)
+        return SummaryLLMOutput(content="single", ctas=[])
+
+
+class ContextRecordingLLm(LLm):
+    """Records the CallContext and prompt of every call made through it."""
+
+    def __init__(self, llm: LLm) -> None:
+        self._llm = llm
+        self.calls: list[tuple[CallContext, str]] = []
+
+    def run_completion(self, system_prompt, user_prompt, dto):
+        raise AssertionError("the packer must use run_completion_async")
+
+    async def run_completion_async(self, system_prompt, user_prompt, dto):
+        self.calls.append((current_call_context(), user_prompt))
+        return await self._llm.run_completion_async(system_prompt, user_prompt, dto)
+
+
+async def _summarize_all(packer: TranscriptPacker, transcripts: list[str]) -> list:
+    return await asyncio.gather(*(packer.summarize(t) for t in transcripts))
+
+
+def test_concurrent_transcripts_share_one_call() -> None:
+    llm = FakeLLMAdapter()
+    packer = TranscriptPacker(llm, window_seconds=0.01)
+
+    results = asyncio.run(_summarize_all(packer, TRANSCRIPTS))
+
+    assert llm.calls == 1
+    assert len({result.content for result in results}) == len(TRANSCRIPTS)
+
+
+def test_missing_items_are_retried_alone() -> None:
+    llm = FakeLLMAdapter(packed_item_drop_rate=1.0)
+    packer = TranscriptPacker(llm, window_seconds=0.01)
+
+    results = asyncio.run(_summarize_all(packer, TRANSCRIPTS))
+
+    assert llm.calls == 1 + len(TRANSCRIPTS)
+    assert all(result.content for result in results)
+
+
+def test_duplicated_empty_and_unknown_items_are_retried_alone() -> None:
+    llm = ScriptedPackedLLm(
+        [
+            PackedSummaryLLMOutput(transcript_id=1, content="one", ctas=["a"]),
+            PackedSummaryLLMOutput(transcript_id=2, content="two", ctas=[]),
+            PackedSummaryLLMOutput(transcript_id=2, content="two again", ctas=[]),
+            PackedSummaryLLMOutput(transcript_id=3, content=" ", ctas=[]),
+            PackedSummaryLLMOutput(transcript_id=9, content="unknown", ctas=[]),
+        ]
+    )
+    packer = TranscriptPacker(llm, window_seconds=0.01)
+
+    results = asyncio.run(_summarize_all(packer, TRANSCRIPTS[:4]))
+
+    assert [result.content for result in results] == [
+        "one",
+        "single",
+        "single",
+        "single",
+    ]
+    assert results[0].ctas == ["a"]
+    assert llm.dtos.count(SummaryLLMOutput) == 3
+
+
+def test_batches_are_cut_at_the_token_budget_and_size() -> None:
+    llm = FakeLLMAdapter()
+    tokens_per_transcript = len(TRANSCRIPTS[0]) // 4 + 1
+    by_tokens = TranscriptPacker(
+        llm, window_seconds=0.01, max_prompt_tokens=2 * tokens_per_transcript
+    )
+    asyncio.run(_summarize_all(by_tokens, TRANSCRIPTS[:4]))
+    assert llm.calls == 2
+
+    llm = FakeLLMAdapter()
+    # A full batch is sent right away instead of waiting for the window.
+    by_size = TranscriptPacker(llm, window_seconds=60, max_transcripts=2)
+
+    async def scenario() -> None:
+        await asyncio.wait_for(_summarize_all(by_size, TRANSCRIPTS[:2]), timeout=1)
+
+    asyncio.run(scenario())
+    assert llm.calls == 1
+
+
+def test_packed_call_errors_reach_every_caller() -> None:
+    fake = FakeLLm(errors=[RuntimeError("down")])
+
+    async def scenario() -> list:
+        packer = TranscriptPacker(fake, window_seconds=0.01)
+        return await asyncio.gather(
+            *(packer.summarize(t) for t in TRANSCRIPTS[:3]), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert fake.async_calls == 1
+
+
+def test_summarizer_packs_only_short_transcripts() -> None:
+    llm = FakeLLMAdapter()
+    packer = TranscriptPacker(llm, window_seconds=0.01, max_transcript_chars=100)
+    summarizer = TranscriptSummarizer(llm, packer=packer)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            *(summarizer.summarize(t) for t in TRANSCRIPTS[:3]),
+            summarizer.summarize("Coach: " + "long " * 100),
+        )
+
+    asyncio.run(scenario())
+
+    assert llm.calls == 2
+
+
+def test_batches_keep_to_the_lane_of_their_transcripts() -> None:
+    recording = ContextRecordingLLm(FakeLLMAdapter())
+    llm = ScheduledLLm(recording, LLMScheduler(max_concurrency=1))
+    packer = TranscriptPacker(llm, window_seconds=0.01)
+    job = CallContext(lane="batch", client="job:1", sheddable=False)
+
+    async def summarize(context: CallContext, transcript: str) -> SummaryLLMOutput:
+        set_call_context(context)
+        return await packer.summarize(transcript)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            summarize(CallContext(client="alice"), TRANSCRIPTS[0]),
+            summarize(job, TRANSCRIPTS[1]),
+            summarize(CallContext(client="bob"), TRANSCRIPTS[2]),
+            summarize(job, TRANSCRIPTS[3]),
+        )
+
+    asyncio.run(scenario())
+
+    contexts = {
+        (context.lane, context.sheddable): prompt for context, prompt in recording.calls
+    }
+    assert len(recording.calls) == 2
+    assert all(context.client == "packer" for context, _ in recording.calls)
+    interactive, batch = contexts["interactive", True], contexts["batch", False]
+    assert TRANSCRIPTS[0] in interactive and TRANSCRIPTS[2] in interactive
+    assert TRANSCRIPTS[1] in batch and TRANSCRIPTS[3] in batch
+    assert TRANSCRIPTS[1] not in interactive
+
+
+def test_packed_summaries_share_the_single_transcript_cache() -> None:
+    backend = FakeLLMAdapter()
+    cache = CachedLLm(backend, model="gpt-test")
+    packer = TranscriptPacker(cache.llm, window_seconds=0.01, cache=cache)
+
+    def single(transcript: str):
+        return cache.run_completion_async(
+            SYSTEM_PROMPT,
+            RAW_USER_PROMPT.format(transcript=transcript),
+            SummaryLLMOutput,
+        )
+
+    async def scenario() -> tuple[list, pydantic.BaseModel, pydantic.BaseModel]:
+        alone = await single(TRANSCRIPTS[0])
+        packed = await _summarize_all(packer, TRANSCRIPTS)
+        return packed, alone, await single(TRANSCRIPTS[3])
+
+    packed, alone, later = asyncio.run(scenario())
+
+    # One call on its own, then one packed call for the four others.
+    assert backend.calls == 2
+    assert packed[0] == alone
+    assert later == packed[3]
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.main import app
+from app.schemas.llm_responses import SummaryLLMOutput
+from app.services.scheduler import (
+    CallContext,
+    LLMScheduler,
+    OverloadedError,
+    ScheduledLLm,
+    current_call_context,
+    set_call_context,
+)
+from tests.fakes import FakeLLm
+
+TRANSCRIPT = "Coach: How did the sprint go? Client: Better than expected."
+
+
+def _grant_order(scheduler: LLMScheduler, contexts: list[CallContext]) -> list[str]:
+    """Queues one call per context behind a held slot and records who ran first."""
+    order: list[str] = []
+
+    async def call(context: CallContext) -> None:
+        async with scheduler.slot(context):
+            order.append(f"{context.lane[0]}:{context.client}")
+
+    async def scenario() -> None:
+        async with scheduler.slot(CallContext()):
+            tasks = []
+            for context in contexts:
+                tasks.append(asyncio.create_task(call(context)))
+                await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    return order
+
+
+def test_global_budget_caps_concurrent_calls() -> None:
+    fake = FakeLLm(latency=0.01)
+    llm = ScheduledLLm(fake, LLMScheduler(max_concurrency=2))
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            *(
+                llm.run_completion_async("system", f"t{i}", SummaryLLMOutput)
+                for i in range(6)
+            )
+        )
+
+    asyncio.run(scenario())
+
+    assert fake.async_calls == 6
+    assert fake.max_in_flight == 2
+
+
+def test_interactive_lane_goes_first_without_starving_batch() -> None:
+    scheduler = LLMScheduler(max_concurrency=1, interactive_weight=2)
+    batch = [CallContext("batch", "bulk") for _ in range(3)]
+    interactive = [CallContext("interactive", "user") for _ in range(3)]
+
+    order = _grant_order(scheduler, batch + interactive)
+
+    assert order == ["i:user", "i:user", "b:bulk", "i:user", "b:bulk", "b:bulk"]
+
+
+def test_clients_of_a_lane_are_served_round_robin() -> None:
+    scheduler = LLMScheduler(max_concurrency=1)
+    contexts = [CallContext("batch", "bulk")] * 4 + [CallContext("batch", "small")] * 2
+
+    order = _grant_order(scheduler, contexts)
+
+    assert order == ["b:bulk", "b:small", "b:bulk", "b:small", "b:bulk", "b:bulk"]
+
+
+def test_overload_is_shed_with_an_estimated_wait() -> None:
+    scheduler = LLMScheduler(
+        max_concurrency=1,
+        interactive_max_queue=2,
+        batch_max_wait=5.0,
+        max_queued_per_client=3,
+        initial_service_seconds=2.0,
+    )
+
+    async def scenario() -> dict[str, OverloadedError]:
+        errors = {}
+        async with scheduler.slot(CallContext()):
+            waiting = [
+                asyncio.create_task(scheduler.acquire(CallContext(client=str(i))))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0)
+            for name, context, calls in (
+                ("queue_full", CallContext(client="x"), 1),
+                ("client", CallContext("batch", "bulk"), 4),
+                ("wait", CallContext("batch", "bulk"), 3),
+            ):
+                with pytest.raises(OverloadedError) as info:
+                    scheduler.admit(context, calls)
+                errors[name] = info.value
+            # Background work waits instead of being shed.
+            background = asyncio.create_task(
+                scheduler.acquire(CallContext(client="x", sheddable=False))
+            )
+            await asyncio.sleep(0)
+            assert scheduler.queue_depth("interactive") == 3
+            for task in [*waiting, background]:
+                task.cancel()
+        return errors
+
+    errors = asyncio.run(scenario())
+
+    assert errors["queue_full"].status_code == 503
+    assert errors["client"].status_code == 429
+    assert errors["wait"].status_code == 503
+    # Three batch calls behind two interactive ones, at 2 s per call.
+    assert errors["wait"].retry_after == pytest.approx(30.0)
+
+
+def test_batch_endpoint_is_shed_with_retry_after() -> None:
+    scheduler = LLMScheduler(max_concurrency=1, batch_max_queue=1)
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: FakeLLm()
+    app.dependency_overrides[dependencies.get_llm_scheduler] = lambda: scheduler
+    try:
+        with TestClient(app) as client:
+            assert client.portal is not None
+            client.portal.call(scheduler.acquire, CallContext())
+            response = client.post(
+                "/summary_maker/async_get_summary_and_ctas",
+                json=[TRANSCRIPT, TRANSCRIPT],
+            )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "4"
+
+
+def test_lane_dependencies_set_the_call_context() -> None:
+    seen: list[CallContext] = []
+
+    class RecordingLLm(FakeLLm):
+        async def run_completion_async(self, system_prompt, user_prompt, dto):
+            seen.append(current_call_context())
+            return await super().run_completion_async(system_prompt, user_prompt, dto)
+
+    llm = RecordingLLm()
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: llm
+    try:
+        with TestClient(app) as client:
+            client.get(
+                "/summary_maker/get_summary_and_ctas",
+                params={"text_to_summary": TRANSCRIPT},
+                headers={"X-Client-Id": "alice"},
+            )
+            client.post("/summary_maker/async_get_summary_and_ctas", json=[TRANSCRIPT])
+    finally:
+        app.dependency_overrides.clear()
+        set_call_context(CallContext())
+
+    assert [(c.lane, c.client) for c in seen] == [
+        ("interactive", "alice"),
+        ("batch", "testclient"),
+    ]
@@ -0,0 +1,35 @@
+import json
+
+from app.services.structured_stream import StreamedField, StructuredOutputReader
+
+
+def test_fields_are_read_as_they_stream_whatever_the_chunking() -> None:
+    output = {
+        "content": 'Said "hi" \\ then 😀\nleft.',
+        "meta": {"content": "nested", "ctas": ["ignored"]},
+        "ctas": ["Send the deck, today", "Book a [call]"],
+        "score": 3,
+    }
+    for ensure_ascii in (True, False):
+        text = json.dumps(output, ensure_ascii=ensure_ascii)
+        for size in (1, 2, 3, 7, len(text)):
+            reader = StructuredOutputReader()
+            fields: list[StreamedField] = []
+            for start in range(0, len(text), size):
+                fields.extend(reader.feed(text[start : start + size]))
+
+            content = [field.text for field in fields if field.field == "content"]
+            assert "".join(content) == output["content"]
+            assert [field.text for field in fields if field.field == "ctas"] == (
+                output["ctas"]
+            )
+            assert {field.field for field in fields} == {"content", "ctas"}
+
+
+def test_content_is_reported_before_its_closing_quote() -> None:
+    reader = StructuredOutputReader()
+
+    assert reader.feed('{"content": "Hel') == [StreamedField("content", "Hel")]
+    assert reader.feed("lo\\u00") == [StreamedField("content", "lo")]
+    assert reader.feed('e9", "ctas": ["a') == [StreamedField("content", "é")]
+    assert reader.feed('"]}') == [StreamedField("ctas", "a")]
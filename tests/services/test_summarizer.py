@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.services.summarizer import (
+    EmptyTranscriptError,
+    TranscriptSummarizer,
+    deduplicate_ctas,
+    split_transcript,
+)
+from tests.adapters import mock_data
+from tests.fakes import FakeLLm
+
+
+def test_split_transcript_cuts_on_speaker_turns() -> None:
+    chunks = split_transcript(mock_data.TRANSCRIPT, max_chars=1000)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    for chunk in chunks:
+        assert chunk.startswith(("Mark Foster | MCC, ACTC:", "Liam Garcia:"))
+    assert " ".join(chunks).split() == mock_data.TRANSCRIPT.split()
+
+
+def test_split_transcript_breaks_oversized_turns_on_whitespace() -> None:
+    chunks = split_transcript("Coach: " + "word " * 100, max_chars=50)
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert all(not chunk.endswith(("wor", "wo", "w")) for chunk in chunks)
+
+
+def test_deduplicate_ctas_ignores_case_whitespace_and_final_dot() -> None:
+    ctas = ["Send the deck.", "send  the deck", "Book a call", ""]
+
+    assert deduplicate_ctas(ctas) == ["Send the deck.", "Book a call"]
+
+
+def test_long_transcripts_are_mapped_in_parallel_then_reduced() -> None:
+    fake = FakeLLm(latency=0.05)
+    summarizer = TranscriptSummarizer(
+        fake, long_transcript_chars=2000, chunk_chars=1000
+    )
+
+    async def scenario() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        summary = await summarizer.summarize(mock_data.TRANSCRIPT)
+        assert summary.ctas == ["first", "second"]
+        return loop.time() - started
+
+    elapsed = asyncio.run(scenario())
+
+    chunks = split_transcript(mock_data.TRANSCRIPT, max_chars=1000)
+    assert fake.async_calls == len(chunks) + 1
+    assert fake.max_in_flight == len(chunks)
+    assert "Partial summaries" in fake.user_prompts[-1]
+    assert elapsed < 0.05 * 3
+
+
+def test_short_transcripts_use_a_single_call() -> None:
+    fake = FakeLLm()
+    summarizer = TranscriptSummarizer(fake, long_transcript_chars=10_000)
+
+    asyncio.run(summarizer.summarize(mock_data.TRANSCRIPT))
+
+    assert fake.async_calls == 1
+
+
+def test_blank_long_transcripts_are_refused_without_calling_the_llm() -> None:
+    fake = FakeLLm()
+    summarizer = TranscriptSummarizer(fake, long_transcript_chars=100)
+
+    with pytest.raises(EmptyTranscriptError):
+        asyncio.run(summarizer.summarize(" \n\t " * 100))
+
+    assert fake.async_calls == 0
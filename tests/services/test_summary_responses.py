@@ -0,0 +1,67 @@
+import asyncio
+
+from app.domain.entities import Summary
+from app.repositories.in_memory import (
+    BoundedInMemorySummaryRepository,
+    InMemorySummaryRepository,
+)
+from app.services.summary_responses import (
+    SummaryResponseCache,
+    etag_matches,
+    render_summary,
+)
+
+
+def test_cache_evicts_least_recently_read_and_expires_with_the_repository() -> None:
+    now = [0.0]
+    repository = InMemorySummaryRepository()
+    cache = SummaryResponseCache(max_entries=2, ttl_seconds=60, clock=lambda: now[0])
+
+    async def scenario() -> list[bool]:
+        for id in "abc":
+            await repository.save(Summary(id=id, content=f"summary {id}", ctas=[]))
+        await cache.get("a", repository)
+        await cache.get("b", repository)
+        await cache.get("a", repository)
+        await cache.get("c", repository)
+        cached = ["a" in cache._entries, "b" in cache._entries]
+        now[0] = 61.0
+        await repository.save(Summary(id="a", content="replaced", ctas=[]))
+        rendered = await cache.get("a", repository)
+        return [*cached, rendered is not None and b"replaced" in rendered.body]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert cache.cache_control == "public, max-age=60, immutable"
+
+
+def test_summaries_evicted_or_expired_from_the_repository_are_not_served() -> None:
+    now = [0.0]
+    repository = BoundedInMemorySummaryRepository(
+        max_entries=1, max_bytes=None, ttl_seconds=60, clock=lambda: now[0]
+    )
+    # Rendered 30 seconds after the save: its own TTL runs out later.
+    cache = SummaryResponseCache(ttl_seconds=60, clock=lambda: now[0])
+
+    async def scenario() -> list[bool]:
+        await repository.save(Summary(id="a", content="summary a", ctas=[]))
+        now[0] = 30.0
+        served = [await cache.get("a", repository) is not None]
+        now[0] = 61.0
+        served.append(await cache.get("a", repository) is not None)
+        await repository.save(Summary(id="b", content="summary b", ctas=[]))
+        served.append(await cache.get("b", repository) is not None)
+        await repository.save(Summary(id="c", content="summary c", ctas=[]))
+        served.append(await cache.get("b", repository) is not None)
+        return served
+
+    assert asyncio.run(scenario()) == [True, False, True, False]
+
+
+def test_etag_follows_content_and_matches_weakly() -> None:
+    etag = render_summary(Summary(id="a", content="one", ctas=[])).etag
+
+    assert etag != render_summary(Summary(id="a", content="two", ctas=[])).etag
+    assert etag_matches(f'"x", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"x"', etag)
+    assert not etag_matches(None, etag)
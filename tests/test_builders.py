@@ -0,0 +1,39 @@
+import asyncio
+
+from app import builders
+from app.domain.entities import Summary
+from app.repositories.search_index import InvertedIndex
+
+
+def test_search_is_not_built_in_front_of_the_shared_redis_store(monkeypatch) -> None:
+    monkeypatch.setattr(builders.settings, "SUMMARY_SEARCH_ENABLED", True)
+    monkeypatch.setattr(builders.settings, "SUMMARY_REPOSITORY_BACKEND", "redis")
+
+    repository = builders.build_summary_repository()
+
+    assert not repository.supports_search
+
+
+def test_the_index_keeps_to_the_bounds_of_the_bounded_store(monkeypatch) -> None:
+    built: list[InvertedIndex] = []
+
+    class RecordedIndex(InvertedIndex):
+        def __init__(self, **kwargs) -> None:
+            super().__init__(**kwargs)
+            built.append(self)
+
+    monkeypatch.setattr(builders, "InvertedIndex", RecordedIndex)
+    monkeypatch.setattr(builders.settings, "SUMMARY_SEARCH_ENABLED", True)
+    monkeypatch.setattr(builders.settings, "SUMMARY_REPOSITORY_BACKEND", "bounded")
+    monkeypatch.setattr(builders.settings, "SUMMARY_MEMORY_MAX_ENTRIES", 10)
+
+    repository = builders.build_summary_repository()
+
+    async def scenario() -> None:
+        for number in range(100):
+            await repository.save(Summary(id=str(number), content="pricing", ctas=[]))
+
+    asyncio.run(scenario())
+
+    assert repository.supports_search
+    assert [len(index) for index in built] == [10]
@@ -0,0 +1,158 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+from app import compression
+from app.compression import (
+    RequestDecompressionMiddleware,
+    ResponseCompressionMiddleware,
+)
+
+
+def _app(max_body_bytes: int = 1000, minimum_size: int = 100) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestDecompressionMiddleware, max_body_bytes=max_body_bytes)
+    app.add_middleware(ResponseCompressionMiddleware, minimum_size=minimum_size)
+
+    @app.post("/echo")
+    async def echo(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(await request.body())
+
+    return app
+
+
+def test_request_bodies_are_inflated_within_the_cap() -> None:
+    client = TestClient(_app())
+    gzipped = {"Content-Encoding": "gzip"}
+
+    echoed = client.post(
+        "/echo", content=gzip.compress(b"hello " * 100), headers=gzipped
+    )
+    bomb = client.post(
+        "/echo", content=gzip.compress(b"0" * 10_000_000), headers=gzipped
+    )
+    plain_too_large = client.post("/echo", content=b"x" * 1001)
+    corrupt = client.post("/echo", content=b"not gzip", headers=gzipped)
+    truncated = client.post(
+        "/echo", content=gzip.compress(b"hello " * 100)[:-8], headers=gzipped
+    )
+    unknown = client.post("/echo", content=b"x", headers={"Content-Encoding": "br"})
+
+    assert echoed.status_code == 200
+    assert echoed.text == "hello " * 100
+    assert bomb.status_code == 413
+    assert plain_too_large.status_code == 413
+    assert corrupt.status_code == 400
+    assert truncated.status_code == 400
+    assert unknown.status_code == 415
+    assert "gzip" in unknown.headers["accept-encoding"]
+
+
+def test_large_responses_are_compressed_for_clients_that_accept_it() -> None:
+    client = TestClient(_app())
+
+    large = client.post(
+        "/echo", content=b"a" * 500, headers={"Accept-Encoding": "gzip"}
+    )
+    small = client.post("/echo", content=b"a" * 50, headers={"Accept-Encoding": "gzip"})
+    refused = client.post(
+        "/echo", content=b"a" * 500, headers={"Accept-Encoding": "gzip;q=0"}
+    )
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert int(large.headers["content-length"]) < 100
+    assert large.text == "a" * 500
+    assert "accept-encoding" in large.headers["vary"].lower()
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in refused.headers
+
+
+def test_streamed_responses_are_flushed_chunk_by_chunk() -> None:
+    async def stream(scope, receive, send) -> None:
+        await StreamingResponse(
+            iter([b'{"item": 1}\n', b'{"item": 2}\n']),
+            media_type=scope["query_string"].decode() or "application/x-ndjson",
+        )(scope, receive, send)
+
+    async def request(query: bytes = b"") -> list[Message]:
+        sent: list[Message] = []
+
+        async def receive() -> Message:
+            # Waits for a disconnect that never comes.
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": query,
+            "headers": [(b"accept-encoding", b"gzip")],
+        }
+        await ResponseCompressionMiddleware(stream, minimum_size=100)(
+            scope, receive, send
+        )
+        return sent
+
+    sent = asyncio.run(request())
+    events = asyncio.run(request(b"text/event-stream"))
+
+    assert (b"content-encoding", b"gzip") in sent[0]["headers"]
+    # Each item can be inflated as soon as its chunk arrives.
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decompressor.decompress(sent[1]["body"]) == b'{"item": 1}\n'
+    assert decompressor.decompress(sent[2]["body"]) == b'{"item": 2}\n'
+    assert all(name != b"content-encoding" for name, _ in events[0]["headers"])
+
+
+def test_zstd_request_bodies_and_responses() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    client = TestClient(_app())
+    zstd = {"Content-Encoding": "zstd"}
+
+    echoed = client.post(
+        "/echo",
+        content=zstandard.ZstdCompressor().compress(b"hello " * 100),
+        headers={**zstd, "Accept-Encoding": "zstd, gzip"},
+    )
+    bomb = client.post(
+        "/echo",
+        content=zstandard.ZstdCompressor().compress(b"0" * 10_000_000),
+        headers=zstd,
+    )
+    corrupt = client.post("/echo", content=b"not zstd", headers=zstd)
+    truncated = client.post(
+        "/echo",
+        content=zstandard.ZstdCompressor().compress(b"hello " * 100)[:-4],
+        headers=zstd,
+    )
+
+    assert echoed.status_code == 200
+    assert echoed.headers["content-encoding"] == "zstd"
+    assert echoed.text == "hello " * 100
+    assert bomb.status_code == 413
+    assert corrupt.status_code == 400
+    assert truncated.status_code == 400
+
+
+def test_zstd_is_refused_without_the_zstandard_package(monkeypatch) -> None:
+    monkeypatch.setattr(compression, "zstandard", None)
+    client = TestClient(_app())
+
+    refused = client.post("/echo", content=b"x", headers={"Content-Encoding": "zstd"})
+    gzipped = client.post(
+        "/echo", content=b"a" * 500, headers={"Accept-Encoding": "zstd, gzip"}
+    )
+
+    assert refused.status_code == 415
+    assert refused.headers["accept-encoding"] == "gzip"
+    assert gzipped.headers["content-encoding"] == "gzip"
@@ -0,0 +1,160 @@
+import asyncio
+import io
+import json
+from pathlib import Path
+
+from app.ingest import Checkpoint, ingest
+from app.repositories.in_memory import InMemorySummaryRepository
+from app.services.summarizer import TranscriptSummarizer
+from tests.fakes import FakeLLm
+
+
+def _write_input(path: Path, transcripts: list[str]) -> None:
+    with path.open("a") as stream:
+        for transcript in transcripts:
+            stream.write(json.dumps({"transcript": transcript}) + "\n")
+
+
+def _run(tmp_path: Path, fake: FakeLLm, repository=None):
+    return asyncio.run(
+        ingest(
+            tmp_path / "in.jsonl",
+            tmp_path / "out.jsonl",
+            tmp_path / "out.jsonl.checkpoint",
+            TranscriptSummarizer(fake),
+            repository or InMemorySummaryRepository(),
+            concurrency=3,
+            progress=io.StringIO(),
+        )
+    )
+
+
+def _records(tmp_path: Path) -> list[dict]:
+    return [json.loads(line) for line in (tmp_path / "out.jsonl").open()]
+
+
+def test_checkpoint_watermark_follows_out_of_order_completion() -> None:
+    checkpoint = Checkpoint(input="in.jsonl")
+
+    checkpoint.mark(1, end_offset=20)
+    checkpoint.mark(2, end_offset=30)
+    assert checkpoint.watermark == 0 and checkpoint.completed == {1, 2}
+    assert checkpoint.is_done(2) and not checkpoint.is_done(0)
+
+    checkpoint.mark(0, end_offset=10)
+    assert checkpoint.watermark == 3 and checkpoint.completed == set()
+    assert (checkpoint.resume_line, checkpoint.resume_offset) == (3, 30)
+
+
+def test_checkpoint_resumes_at_the_first_failed_line_until_it_succeeds() -> None:
+    checkpoint = Checkpoint(input="in.jsonl")
+
+    checkpoint.mark(0, end_offset=10)
+    checkpoint.mark(1, end_offset=20, failed=True, start_offset=10)
+    checkpoint.mark(2, end_offset=30)
+    assert (checkpoint.resume_line, checkpoint.resume_offset) == (1, 10)
+
+    checkpoint.mark_read(1, 10, 20)
+    checkpoint.mark(1, end_offset=20)
+    assert checkpoint.failed == {}
+    assert (checkpoint.resume_line, checkpoint.resume_offset) == (3, 30)
+
+
+def test_every_line_is_summarized_saved_and_written(tmp_path: Path) -> None:
+    _write_input(tmp_path / "in.jsonl", [f"transcript {i}" for i in range(5)])
+    with (tmp_path / "in.jsonl").open("a") as stream:
+        stream.write("\n" + json.dumps({"other": "field"}) + "\n")
+    repository = InMemorySummaryRepository()
+
+    stats = _run(tmp_path, FakeLLm(), repository)
+
+    records = _records(tmp_path)
+    assert (stats.succeeded, stats.failed) == (5, 1)
+    assert sorted(record["line"] for record in records) == [0, 1, 2, 3, 4, 6]
+    assert "KeyError" in next(r for r in records if r["line"] == 6)["error"]
+    stored = asyncio.run(repository.list_ids()).ids
+    assert sorted(stored) == sorted(
+        record["summary"]["id"] for record in records if "summary" in record
+    )
+
+
+def test_rerun_skips_records_written_after_the_last_checkpoint(
+    tmp_path: Path,
+) -> None:
+    _write_input(tmp_path / "in.jsonl", [f"transcript {i}" for i in range(5)])
+    # A run that died before its first checkpoint, in the middle of a write.
+    with (tmp_path / "out.jsonl").open("w") as output:
+        for line in (0, 1, 3):
+            output.write(json.dumps({"line": line, "summary": {}}) + "\n")
+        output.write('{"line": 4, "summ')
+    fake = FakeLLm()
+
+    stats = _run(tmp_path, fake)
+
+    assert fake.async_calls == 2
+    assert stats.succeeded == 2
+    assert sorted(record["line"] for record in _records(tmp_path)) == [0, 1, 2, 3, 4]
+
+
+def test_rerun_resumes_after_the_finished_prefix(tmp_path: Path) -> None:
+    _write_input(tmp_path / "in.jsonl", [f"transcript {i}" for i in range(4)])
+    _run(tmp_path, FakeLLm())
+    _write_input(tmp_path / "in.jsonl", ["transcript 4", "transcript 5"])
+    fake = FakeLLm()
+
+    stats = _run(tmp_path, fake)
+
+    assert fake.async_calls == 2
+    # The finished prefix is seeked over rather than read and skipped.
+    assert stats.skipped == 0
+    assert sorted(record["line"] for record in _records(tmp_path)) == list(range(6))
+
+
+def test_rerun_retries_only_the_failed_lines(tmp_path: Path) -> None:
+    _write_input(tmp_path / "in.jsonl", [f"transcript {i}" for i in range(5)])
+    first = _run(tmp_path, FakeLLm(errors=[RuntimeError("down")]))
+    failed_line = next(r["line"] for r in _records(tmp_path) if "error" in r)
+    fake = FakeLLm()
+
+    second = _run(tmp_path, fake)
+
+    assert (first.succeeded, first.failed) == (4, 1)
+    assert (fake.async_calls, second.succeeded, second.failed) == (1, 1, 0)
+    records = _records(tmp_path)
+    assert "summary" in records[-1] and records[-1]["line"] == failed_line
+    assert sorted({record["line"] for record in records}) == list(range(5))
+
+    # Nothing is left to retry.
+    third = _run(tmp_path, FakeLLm())
+    assert third.processed == 0
+
+
+def test_rerun_after_a_successful_retry_seeks_past_the_input(tmp_path: Path) -> None:
+    _write_input(tmp_path / "in.jsonl", [f"transcript {i}" for i in range(5)])
+    _run(tmp_path, FakeLLm(errors=[RuntimeError("down")]))
+    _run(tmp_path, FakeLLm())
+    _write_input(tmp_path / "in.jsonl", ["transcript 5"])
+    fake = FakeLLm()
+
+    third = _run(tmp_path, fake)
+
+    assert (fake.async_calls, third.succeeded, third.skipped) == (1, 1, 0)
+
+
+def test_failures_found_after_the_checkpoint_are_retried_then_seeked_past(
+    tmp_path: Path,
+) -> None:
+    _write_input(tmp_path / "in.jsonl", [f"transcript {i}" for i in range(5)])
+    # A run that died before its first checkpoint, after a failed line.
+    with (tmp_path / "out.jsonl").open("w") as output:
+        for line in (0, 1, 3, 4):
+            output.write(json.dumps({"line": line, "summary": {}}) + "\n")
+        output.write(json.dumps({"line": 2, "error": "RuntimeError: down"}) + "\n")
+    fake = FakeLLm()
+
+    second = _run(tmp_path, fake)
+    third = _run(tmp_path, FakeLLm())
+
+    assert (fake.async_calls, second.succeeded) == (1, 1)
+    assert "transcript 2" in fake.user_prompts[0]
+    assert (third.processed, third.skipped) == (0, 0)
@@ -0,0 +1,21 @@
+import importlib
+import os
+from unittest import mock
+
+# The benchmark points the app's settings at the fake backend on import; keep
+# that from leaking into the environment of the other tests.
+with mock.patch.dict(os.environ):
+    load = importlib.import_module("benchmarks.load")
+
+
+def test_every_endpoint_has_a_load_scenario() -> None:
+    scenarios = load.build_scenarios(["id"], "job", batch_size=1)
+
+    assert load.uncovered_endpoints(scenarios) == set()
+
+
+def test_an_endpoint_without_a_scenario_is_reported() -> None:
+    scenarios = load.build_scenarios(["id"], "job", batch_size=1)
+    del scenarios["search_summaries"]
+
+    assert load.uncovered_endpoints(scenarios) == {("GET", "/extras/search_summaries")}
@@ -0,0 +1,57 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from tests.fakes import FakeLLm
+
+
+class WarmingLLm(FakeLLm):
+    def __init__(self) -> None:
+        super().__init__()
+        self.warmed = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def warm_up(self, connections: int = 1) -> None:
+        self.warmed.set()
+        await self.release.wait()
+
+
+def test_ready_waits_for_the_warm_up(monkeypatch) -> None:
+    llm = WarmingLLm()
+    monkeypatch.setattr(main.settings, "STARTUP_WARMUP_ENABLED", True)
+    monkeypatch.setattr(main, "build_llm_service", lambda scheduler: llm)
+
+    with TestClient(app) as client:
+        assert client.portal is not None
+        client.portal.call(llm.warmed.wait)
+        live = client.get("/")
+        warming = client.get("/ready")
+        client.portal.call(llm.release.set)
+        client.portal.call(asyncio.sleep, 0)
+        ready = client.get("/ready")
+
+    assert live.status_code == 200
+    assert warming.status_code == 503
+    assert ready.status_code == 200
+    assert app.state.ready is False
+
+
+def test_failed_warm_up_still_turns_ready(monkeypatch) -> None:
+    class FailingLLm(FakeLLm):
+        async def warm_up(self, connections: int = 1) -> None:
+            raise ConnectionError("backend unreachable")
+
+    monkeypatch.setattr(main.settings, "STARTUP_WARMUP_ENABLED", True)
+    monkeypatch.setattr(main, "build_llm_service", lambda scheduler: FailingLLm())
+
+    with TestClient(app) as client:
+        assert client.portal is not None
+        for _ in range(100):
+            if client.get("/ready").status_code == 200:
+                break
+            client.portal.call(asyncio.sleep, 0.01)
+        ready = client.get("/ready")
+
+    assert ready.status_code == 200
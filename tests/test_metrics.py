@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import json
+
+import openai
+import pytest
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.adapters.fake import server_error
+from app.adapters.instrumented import InstrumentedLLm
+from app.main import app
+from app.metrics import REGISTRY, Counter, Gauge, Histogram, Registry
+from app.schemas.llm_responses import SummaryLLMOutput
+from tests.fakes import FakeLLm
+
+TRANSCRIPT = "Coach: How did the sprint go? Client: Better than expected."
+
+
+def _sample(text: str, series: str, default: float | None = None) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    if default is None:
+        raise AssertionError(f"{series} not exported")
+    return default
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    histogram = Histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0), registry=registry
+    )
+    child = histogram.labels("/a")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert _sample(text, 'latency_seconds_bucket{route="/a",le="0.1"}') == 2
+    assert _sample(text, 'latency_seconds_bucket{route="/a",le="1.0"}') == 3
+    assert _sample(text, 'latency_seconds_bucket{route="/a",le="+Inf"}') == 4
+    assert _sample(text, 'latency_seconds_count{route="/a"}') == 4
+    assert _sample(text, 'latency_seconds_sum{route="/a"}') == pytest.approx(3.65)
+
+
+def test_counter_and_gauge_render_and_escape_labels() -> None:
+    registry = Registry()
+    counter = Counter("errors_total", "Errors.", ("exception",), registry=registry)
+    gauge = Gauge("in_flight", "In flight.", registry=registry)
+    counter.labels('Quoted"Error').inc(2)
+    gauge.labels().inc()
+
+    text = registry.render()
+
+    assert _sample(text, 'errors_total{exception="Quoted\\"Error"}') == 2
+    assert _sample(text, "in_flight") == 1
+    with pytest.raises(ValueError):
+        counter.labels()
+
+
+def test_help_text_escapes_backslashes_and_line_feeds() -> None:
+    registry = Registry()
+    Gauge("paths", 'Paths like C:\\tmp,\nquoted "as is".', registry=registry)
+
+    text = registry.render()
+
+    assert '# HELP paths Paths like C:\\\\tmp,\\nquoted "as is".\n' in text
+
+
+def test_instrumented_llm_counts_errors_by_exception_class() -> None:
+    llm = InstrumentedLLm(FakeLLm(errors=[server_error()]))
+
+    async def call() -> None:
+        with pytest.raises(openai.InternalServerError):
+            await llm.run_completion_async("system", "user", SummaryLLMOutput)
+        await llm.run_completion_async("system", "user", SummaryLLMOutput)
+
+    before = REGISTRY.render()
+    asyncio.run(call())
+    after = REGISTRY.render()
+
+    errors = 'llm_errors_total{exception="InternalServerError"}'
+    failed = 'llm_request_duration_seconds_count{outcome="error"}'
+    succeeded = 'llm_request_duration_seconds_count{outcome="ok"}'
+    assert _sample(after, errors) == _sample(before, errors, default=0) + 1
+    assert _sample(after, failed) == _sample(before, failed, default=0) + 1
+    assert _sample(after, succeeded) >= 1
+    assert _sample(after, "llm_requests_in_flight") == 0
+
+
+def test_metrics_endpoint_reports_routes_batches_and_stages() -> None:
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: FakeLLm()
+    try:
+        with TestClient(app) as client:
+            client.post(
+                "/summary_maker/async_get_summary_and_ctas",
+                json=[TRANSCRIPT, TRANSCRIPT + " Again."],
+            )
+            client.get("/summary_maker/get_summary_and_ctas_by_id", params={"id": "x"})
+            client.get("/no/such/path")
+            response = client.get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+
+    text = response.text
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    batch_route = (
+        'http_request_duration_seconds_count{method="POST",'
+        'route="/summary_maker/async_get_summary_and_ctas",status="200"}'
+    )
+    by_id_route = (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/summary_maker/get_summary_and_ctas_by_id",status="404"}'
+    )
+    assert _sample(text, batch_route) >= 1
+    assert _sample(text, by_id_route) >= 1
+    assert 'route="unmatched",status="404"' in text
+    assert "/no/such/path" not in text
+    assert (
+        _sample(text, 'batch_size_bucket{endpoint="async_get_summary_and_ctas",le="2"}')
+        >= 1
+    )
+    assert (
+        _sample(
+            text,
+            'stage_duration_seconds_count{stage="summary_response_from_entity"}',
+        )
+        >= 2
+    )
+    assert (
+        _sample(
+            text, 'repository_operation_duration_seconds_count{operation="save_many"}'
+        )
+        >= 1
+    )
+    assert (
+        _sample(
+            text, 'repository_operation_duration_seconds_count{operation="get_by_id"}'
+        )
+        >= 1
+    )
+
+
+def test_compressed_requests_are_labelled_with_their_route() -> None:
+    series = (
+        'http_request_duration_seconds_count{method="POST",'
+        'route="/summary_maker/async_get_summary_and_ctas",status="200"}'
+    )
+    app.dependency_overrides[dependencies.get_llm_service] = lambda: FakeLLm()
+    try:
+        with TestClient(app) as client:
+            before = _sample(client.get("/metrics").text, series, default=0)
+            response = client.post(
+                "/summary_maker/async_get_summary_and_ctas",
+                content=gzip.compress(json.dumps([TRANSCRIPT]).encode()),
+                headers={
+                    "Content-Type": "application/json",
+                    "Content-Encoding": "gzip",
+                },
+            )
+            after = _sample(client.get("/metrics").text, series)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert after == before + 1